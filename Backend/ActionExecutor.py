@@ -0,0 +1,171 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+# --- Settings ---
+MAX_WORKERS = int(os.getenv("ACTION_WORKERS", 4))
+PARALLEL_HANDLERS = ("open", "close", "play", "google", "youtube")  # no speech, no shared state
+DEFAULT_TIMEOUT = 15.0
+TIMEOUTS = {                     # seconds per action, by handler; answers include the time to speak them
+    "open": 10.0, "close": 10.0, "play": 10.0, "google": 10.0, "youtube": 10.0,
+    "general": 300.0, "realtime": 300.0, "fallback": 300.0,
+}
+
+
+# --- Cancellation of inline actions ---
+_current = threading.local()
+
+
+class ActionCancelled(Exception):
+    """Raised by check_cancelled() inside an action that has overrun its timeout."""
+
+
+def action_cancelled():
+    """True once the inline action running on this thread has overrun its timeout."""
+    event = getattr(_current, "cancel", None)
+    return event is not None and event.is_set()
+
+
+def check_cancelled():
+    """Raise ActionCancelled if the action running on this thread should stop (call between steps)."""
+    if action_cancelled():
+        raise ActionCancelled("action timed out")
+
+
+class ActionExecutor:
+    """Run the plans of one utterance, independent ones concurrently, and return results in order.
+
+    Consecutive parallel-safe plans (opening, closing, playing, searching)
+    form a group that runs at once on the worker pool, so "open chrome,
+    spotify and notepad" takes as long as the slowest app. Every other plan
+    (answers that speak, system commands, reminders) runs alone on a thread
+    of its own, after what came before it, and "exit" is a barrier: nothing
+    after it runs. A plan that exceeds its timeout yields None and the next
+    one starts: a pooled plan that has not started is cancelled, and an
+    inline plan has its cancel flag set (see check_cancelled), which the
+    answer stream and speech check so the overrunning action stops itself.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, timeouts=None, default_timeout=DEFAULT_TIMEOUT):
+        self.max_workers = max_workers
+        self.timeouts = dict(TIMEOUTS, **(timeouts or {}))
+        self.default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="action")
+        self._lock = threading.Lock()
+        self._stats = {"actions": 0, "parallel_groups": 0, "timeouts": 0, "errors": 0, "saved_seconds": 0.0}
+
+    def _groups(self, plans):
+        """[index, ...] lists in execution order"""
+        groups, current = [], []
+        for index, (handler, _) in enumerate(plans):
+            if handler in PARALLEL_HANDLERS:
+                current.append(index)
+                continue
+            if current:
+                groups.append(current)
+                current = []
+            groups.append([index])
+        if current:
+            groups.append(current)
+        return groups
+
+    def _timed(self, execute, plan):
+        start = time.perf_counter()
+        return execute(plan), time.perf_counter() - start
+
+    def _collect(self, plan, future, give_up_at):
+        try:
+            return future.result(timeout=max(0.0, give_up_at - time.monotonic()))
+        except FutureTimeout:
+            future.cancel()
+            self._count("timeouts")
+            print(f"⚠️ Action '{plan[0]} {plan[1]}' timed out")
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ Action '{plan[0]} {plan[1]}' failed: {e}")
+        return None, 0.0
+
+    def _inline(self, plan, execute):
+        """Run one plan on its own thread and wait at most its timeout."""
+        cancel = threading.Event()
+        outcome = {}
+
+        def target():
+            _current.cancel = cancel
+            try:
+                outcome["result"] = execute(plan)
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, name="action-inline", daemon=True)
+        thread.start()
+        thread.join(self.timeouts.get(plan[0], self.default_timeout))
+        if thread.is_alive():
+            cancel.set()
+            self._count("timeouts")
+            print(f"⚠️ Action '{plan[0]} {plan[1]}' timed out")
+            return None
+        if "error" in outcome:
+            self._count("errors")
+            print(f"⚠️ Action '{plan[0]} {plan[1]}' failed: {outcome['error']}")
+        return outcome.get("result")
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._stats[key] += n
+
+    def run(self, plans, execute, cancelled=None):
+        """execute(plan) for every (handler, argument) plan; returns their results in the same order.
+
+        cancelled: optional callable checked before each group; when it returns True the rest is skipped.
+        """
+        results = [None] * len(plans)
+        for group in self._groups(plans):
+            if cancelled is not None and cancelled():
+                break
+            if plans[group[0]][0] not in PARALLEL_HANDLERS:
+                results[group[0]] = self._inline(plans[group[0]], execute)
+                self._count("actions")
+                if results[group[0]] == "EXIT":
+                    break
+                continue
+            # a group larger than the pool runs in waves; each wave gets the full timeout
+            waves = math.ceil(len(group) / self.max_workers)
+            started = time.monotonic()
+            futures = [(i, self._pool.submit(self._timed, execute, plans[i])) for i in group]
+            busy = 0.0
+            for i, future in futures:
+                give_up_at = started + waves * self.timeouts.get(plans[i][0], self.default_timeout)
+                results[i], elapsed = self._collect(plans[i], future, give_up_at)
+                busy += elapsed
+            with self._lock:
+                self._stats["actions"] += len(group)
+                if len(group) > 1:
+                    self._stats["parallel_groups"] += 1
+                    self._stats["saved_seconds"] += max(0.0, busy - (time.monotonic() - started))
+            if "EXIT" in (results[i] for i in group):
+                break
+        return results
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+# --- Shared executor ---
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_action_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ActionExecutor()
+        return _executor
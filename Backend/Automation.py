@@ -1,23 +1,30 @@
 # automation.py
 import os
 import sys
-sys.stderr = open(os.devnull, 'w')
-import time
+if "importtime" not in sys._xoptions:  # keep stderr when profiling imports
+    sys.stderr = open(os.devnull, 'w')
 import shlex
 import platform
 import subprocess
 import webbrowser
 from pathlib import Path
-import pytz
 from datetime import datetime
 
 # Import your modules (assumes same directory)
 from Model import FirstLayerDMM
-from Chatbot import ChatBot, Assistantname
-from RealtimeSearchEngine import RealtimeSearchEngine
+from Chatbot import ChatBotStream, Assistantname
+from RealtimeSearchEngine import RealtimeSearchEngineStream
+from ChatLog import get_conversation_store, shutdown_conversation_store
+from Summarizer import get_summarizer
+from SingleFlight import COALESCED_ACTIONS, action_key, get_single_flight
+from ActionExecutor import action_cancelled, check_cancelled, get_action_executor
+from DecisionCache import WARM_FROM_HISTORY, describe as describe_decision_cache, get_decision_cache
+from Prefetcher import note_activity, record_query, start_prefetcher, stop_prefetcher
+from LocalAnswers import answer_locally, cancel_timers, set_timer_callback
 
 from SpeechToText import SpeechToTextSystem
 from TextToSpeech import TextToSpeech
+from SpeechPipeline import SpeechPipeline
 
 os.environ["ELECTRON_ENABLE_LOGGING"] = "true"
 os.environ["ANGLE_DEFAULT_PLATFORM"] = "swiftshader"
@@ -33,6 +40,7 @@ def safe_print(tag, *args):
     print(f"[{tag}] ", *args)
 
 def get_realtime_info():
+    import pytz
     tz = pytz.timezone("Asia/Kolkata")
     current_date_time = datetime.now(tz)
     return f"{current_date_time.strftime('%d %B %Y')}\n{current_date_time.strftime('%H:%M:%S IST')}"
@@ -111,149 +119,245 @@ def shutil_which(cmd):
     from shutil import which
     return which(cmd) is not None
 
+# Drain a streaming answer, forwarding each delta to every listener, and return the full text
+def consume_stream(deltas, *listeners):
+    listeners = [fn for fn in listeners if fn]
+    parts = []
+    for delta in deltas:
+        check_cancelled()  # the action overran its timeout: stop reading the answer
+        parts.append(delta)
+        for fn in listeners:
+            fn(delta)
+    return "".join(parts)
+
+# Flush the last sentence to the speech pipeline and wait until it has been spoken (or the action timed out)
+def finish_speech(speech):
+    speech.finish()
+    while not speech.wait(0.1):
+        if action_cancelled():
+            speech.cancel()
+    for e in speech.errors:
+        safe_print("TTS", f"Error speaking response: {e}")
+
+# Show and speak an answer produced without the LLM, and keep it in the conversation
+def speak_local_answer(query, answer, on_delta=None):
+    if on_delta:
+        on_delta(answer)
+    safe_print(Assistantname, answer)
+    get_conversation_store().append_turn({"role": "user", "content": query}, {"role": "assistant", "content": answer})
+    speech = SpeechPipeline()
+    speech.feed(answer)
+    finish_speech(speech)
+    return answer
+
+def announce_timer(message):
+    safe_print("TIMER", message)
+    speech = SpeechPipeline()
+    speech.feed(message)
+    finish_speech(speech)
+
+# Action plans --------------------------------------------------------------
+# An action string from FirstLayerDMM ("open chrome") is parsed once into a
+# plan, (handler, argument), and run through ACTION_HANDLERS. Whole
+# utterances map to their plans through the decision cache.
+
+ACTION_ALIASES = {
+    "googlesearch": "google", "google_search": "google",
+    "youtubesearch": "youtube", "youtube_search": "youtube",
+}
+
+def plan_action(action, user_raw_query=""):
+    """(handler, argument) for one action string like 'general tell me a joke' or 'open youtube'"""
+    action = (action or "").strip()
+    parts = action.split()
+    if not parts:
+        return None
+    keyword = ACTION_ALIASES.get(parts[0].lower(), parts[0].lower())
+    tail = action[len(parts[0]):].strip()
+    if keyword == "exit":
+        return ("exit", "")
+    if keyword not in ACTION_HANDLERS:
+        return ("fallback", user_raw_query or action)
+    if keyword in ("google", "youtube"):
+        tail = tail[len("search"):].strip() if tail.lower().split(" ", 1)[0] == "search" else tail  # "google search x"
+    return (keyword, tail or user_raw_query)
+
+def _build_plans(utterance):
+    return [plan for plan in (plan_action(act, utterance) for act in FirstLayerDMM(utterance)) if plan]
+
+def plan_utterance(utterance):
+    """Plans for everything the user asked in one utterance, from the decision cache when possible"""
+    cache = get_decision_cache()
+    return cache.get(utterance, _build_plans) if cache is not None else _build_plans(utterance)
+
+def warm_decision_cache():
+    """Pre-plan the most recent user messages so repeated commands hit the cache from the start"""
+    cache = get_decision_cache()
+    if cache is None:
+        return 0
+    history = [m["content"] for m in get_conversation_store().snapshot() if m["role"] == "user"]
+    return cache.warm(history[-WARM_FROM_HISTORY:], _build_plans)
+
+def execute_plan(plan, user_raw_query="", on_delta=None):
+    """
+    Run one (handler, argument) plan.
+    on_delta: optional callback receiving streamed answer text as it arrives
+
+    Identical general/realtime actions already in flight (a double send, a
+    command recognized twice) wait for that call and share its answer
+    instead of querying and speaking again.
+    """
+    if not plan:
+        return None
+    note_activity()
+    handler, argument = plan
+    run = ACTION_HANDLERS[handler]
+    if handler in COALESCED_ACTIONS:
+        key = action_key(f"{handler} {argument}")
+        flight = get_single_flight()
+        if key in flight.in_flight():
+            safe_print("ROUTER", f"Joining in-flight request: {key}")
+        return flight.do(key, run, argument, on_delta)
+    return run(argument, on_delta)
+
 # Parse a single action string like "general tell me a joke" or "open youtube"
-def handle_action(action: str, user_raw_query: str = ""):
+def handle_action(action: str, user_raw_query: str = "", on_delta=None):
     """
     action: one action item returned from FirstLayerDMM, e.g. 'general what is python?'
     user_raw_query: original user input (for context if needed)
+    on_delta: optional callback receiving streamed answer text as it arrives
     """
-    if not action:
+    return execute_plan(plan_action(action, user_raw_query), user_raw_query, on_delta)
+
+# Action handlers: each takes (argument, on_delta) ------------------------------
+def _answered_locally(query, on_delta):
+    # Questions the local engine can answer (clock, arithmetic, units, timers) skip the LLM
+    answer = answer_locally(query)
+    if answer is None:
+        return None
+    safe_print("ROUTER", f"Answered locally: {query}")
+    return speak_local_answer(query, answer, on_delta)
+
+def run_exit(_, on_delta=None):
+    safe_print("SYSTEM", "Exit command received. Shutting down.")
+    return "EXIT"
+
+# GENERAL -> Chatbot
+def run_general(query, on_delta=None):
+    local = _answered_locally(query, on_delta)
+    if local is not None:
+        return local
+    safe_print("ROUTER", f"Routing to ChatBot: {query}")
+    speech = SpeechPipeline()
+    try:
+        # speak each sentence while the rest is still being generated
+        response = consume_stream(ChatBotStream(query), on_delta, speech.feed)
+        safe_print(Assistantname, response)
+        finish_speech(speech)
+        get_summarizer().schedule()
+        return response
+    except Exception as e:
+        speech.cancel()
+        safe_print("ERROR", f"ChatBot failed: {e}")
         return None
 
-    action = action.strip()
-    # sometimes model returns "generate ..." or "generate image ..." or "google search ..."
-    # Normalize: lower-case for action type detection, but keep original tail
-    parts = action.split()
-    if len(parts) == 0:
+# REALTIME -> RealtimeSearchEngine
+def run_realtime(query, on_delta=None):
+    local = _answered_locally(query, on_delta)
+    if local is not None:
+        return local
+    safe_print("ROUTER", f"Routing to RealtimeSearchEngine: {query}")
+    record_query(query)
+    speech = SpeechPipeline()
+    try:
+        response = consume_stream(RealtimeSearchEngineStream(query), on_delta, speech.feed)
+        safe_print(Assistantname, response)
+        finish_speech(speech)
+        get_summarizer().schedule()
+        return response
+    except Exception as e:
+        speech.cancel()
+        safe_print("ERROR", f"RealtimeSearchEngine failed: {e}")
         return None
-    keyword = parts[0].lower()
-    tail = action[len(parts[0]):].strip() if len(action) > len(parts[0]) else ""
-    # EXIT
-    if keyword == "exit":
-        safe_print("SYSTEM", "Exit command received. Shutting down.")
-        return "EXIT"
 
-    # GENERAL -> Chatbot
-    if keyword == "general":
-        query = tail or user_raw_query
-        safe_print("ROUTER", f"Routing to ChatBot: {query}")
-        try:
-            response = ChatBot(query)
-            safe_print(Assistantname, response)
-            # speak
-            try:
-                TextToSpeech(response)
-            except Exception as e:
-                safe_print("TTS", f"Error speaking response: {e}")
-            return response
-        except Exception as e:
-            safe_print("ERROR", f"ChatBot failed: {e}")
-            return None
-    
-    
-    # REALTIME -> RealtimeSearchEngine
-    if keyword == "realtime":
-        query = tail or user_raw_query
-        safe_print("ROUTER", f"Routing to RealtimeSearchEngine: {query}")
+# GOOGLE SEARCH -> open browser search
+def run_google(query, on_delta=None):
+    safe_print("ROUTER", f"Opening Google search for: {query}")
+    try:
+        webbrowser.open(f"https://www.google.com/search?q={webbrowser.quote(query) if hasattr(webbrowser, 'quote') else query}")
+        return f"Opened Google search for: {query}"
+    except Exception:
         try:
-            response = RealtimeSearchEngine(query)
-            safe_print(Assistantname, response)
-            try:
-                TextToSpeech(response)
-            except Exception as e:
-                safe_print("TTS", f"Error speaking realtime response: {e}")
-            return response
+            webbrowser.open(f"https://www.google.com/search?q={query}")
+            return f"Opened Google search for: {query}"
         except Exception as e:
-            safe_print("ERROR", f"RealtimeSearchEngine failed: {e}")
+            safe_print("ERROR", f"google search open failed: {e}")
             return None
 
+# YOUTUBE SEARCH or open youtube
+def run_youtube(query, on_delta=None):
+    if query:
+        safe_print("ROUTER", f"Searching YouTube for: {query}")
+        webbrowser.open(f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}")
+        return f"Searched YouTube: {query}"
+    webbrowser.open("https://www.youtube.com")
+    return "Opened YouTube"
+
+# OPEN -> open app or website
+def run_open(target, on_delta=None):
+    if not target:
+        return None
+    success = open_target(target)
+    return f"Opened {target}" if success else None
 
-    # GOOGLE SEARCH -> open browser search or call RealtimeSearchEngine as well
-    if keyword in ("google", "googlesearch", "google_search", "googlesearch"):
-        query = tail or user_raw_query
-        safe_print("ROUTER", f"Opening Google search for: {query}")
-        try:
-            webbrowser.open(f"https://www.google.com/search?q={webbrowser.quote(query) if hasattr(webbrowser, 'quote') else query}")
-            return f"Opened Google search for: {query}"
-        except Exception:
-            try:
-                webbrowser.open(f"https://www.google.com/search?q={query}")
-                return f"Opened Google search for: {query}"
-            except Exception as e:
-                safe_print("ERROR", f"google search open failed: {e}")
-                return None
-
-    # YOUTUBE SEARCH or open youtube
-    if keyword in ("youtube", "youtubesearch", "youtube_search", "youtube"):
-        query = tail or user_raw_query
-        if query:
-            safe_print("ROUTER", f"Searching YouTube for: {query}")
-            webbrowser.open(f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}")
-            return f"Searched YouTube: {query}"
-        else:
-            webbrowser.open("https://www.youtube.com")
-            return "Opened YouTube"
-
-    # OPEN -> open app or website
-    if keyword == "open":
-        target = tail or user_raw_query
-        if not target:
-            return None
-        success = open_target(target)
-        return f"Opened {target}" if success else None
-
-    # CLOSE -> close app
-    if keyword == "close":
-        target = tail or user_raw_query
-        if not target:
-            return None
-        success = close_target(target)
-        return f"Closed {target}" if success else None
+# CLOSE -> close app
+def run_close(target, on_delta=None):
+    if not target:
+        return None
+    success = close_target(target)
+    return f"Closed {target}" if success else None
 
-    # PLAY -> open youtube or media; try to open YouTube search or use webbrowser
-    if keyword == "play":
-        target = tail or user_raw_query
-        if not target:
-            return None
-        safe_print("ROUTER", f"Play requested: {target}")
-        # If user wants a song -> open youtube search
-        try:
-            webbrowser.open(f"https://www.youtube.com/results?search_query={target.replace(' ', '+')}")
-            return f"Playing {target} on YouTube"
-        except Exception as e:
-            safe_print("ERROR", f"Play failed: {e}")
-            return None
+# PLAY -> open a YouTube search for the song or video
+def run_play(target, on_delta=None):
+    if not target:
+        return None
+    safe_print("ROUTER", f"Play requested: {target}")
+    try:
+        webbrowser.open(f"https://www.youtube.com/results?search_query={target.replace(' ', '+')}")
+        return f"Playing {target} on YouTube"
+    except Exception as e:
+        safe_print("ERROR", f"Play failed: {e}")
+        return None
 
-    # SYSTEM commands (volume, mute, etc.) -> best-effort placeholders
-    if keyword == "system":
-        cmd = tail or user_raw_query
-        safe_print("SYSTEM", f"System command requested: {cmd}")
-        # We won't change system volume here; return acknowledgment
-        try:
-            TextToSpeech(f"Executing system command: {cmd}")
-        except Exception:
-            pass
-        return f"Executed system command: {cmd}"
+# SYSTEM commands (volume, mute, etc.) -> best-effort placeholders
+def run_system(cmd, on_delta=None):
+    safe_print("SYSTEM", f"System command requested: {cmd}")
+    # We won't change system volume here; return acknowledgment
+    try:
+        TextToSpeech(f"Executing system command: {cmd}")
+    except Exception:
+        pass
+    return f"Executed system command: {cmd}"
 
-    # REMINDER -> Placeholder (store in file or integrate with OS scheduler)
-    if keyword == "reminder":
-        reminder_text = tail or user_raw_query
-        # For now, write reminder to a simple file (append)
-        try:
-            os.makedirs("Data", exist_ok=True)
-            with open("Data/reminders.txt", "a", encoding="utf-8") as f:
-                f.write(reminder_text + "\n")
-            import threading
-            threading.Thread(target=TextToSpeech, args=("Reminder saved.",), daemon=True).start()
-            return f"Reminder saved: {reminder_text}"
-        except Exception as e:
-            safe_print("ERROR", f"Reminder save failed: {e}")
-            return None
+# REMINDER -> Placeholder (store in file or integrate with OS scheduler)
+def run_reminder(reminder_text, on_delta=None):
+    # For now, write reminder to a simple file (append)
+    try:
+        os.makedirs("Data", exist_ok=True)
+        with open("Data/reminders.txt", "a", encoding="utf-8") as f:
+            f.write(reminder_text + "\n")
+        import threading
+        threading.Thread(target=TextToSpeech, args=("Reminder saved.",), daemon=True).start()
+        return f"Reminder saved: {reminder_text}"
+    except Exception as e:
+        safe_print("ERROR", f"Reminder save failed: {e}")
+        return None
 
-    # DEFAULT fallback -> treat as general query
-    safe_print("ROUTER", f"Unknown action '{keyword}', defaulting to general.")
+# DEFAULT fallback -> treat as general query
+def run_fallback(query, on_delta=None):
+    safe_print("ROUTER", f"Unknown action, defaulting to general: {query}")
     try:
-        response = ChatBot(user_raw_query or action)
+        response = consume_stream(ChatBotStream(query), on_delta)
         safe_print(Assistantname, response)
         try:
             import threading
@@ -265,6 +369,20 @@ def handle_action(action: str, user_raw_query: str = ""):
         safe_print("ERROR", f"Fallback ChatBot failed: {e}")
         return None
 
+ACTION_HANDLERS = {
+    "exit": run_exit,
+    "general": run_general,
+    "realtime": run_realtime,
+    "google": run_google,
+    "youtube": run_youtube,
+    "open": run_open,
+    "close": run_close,
+    "play": run_play,
+    "system": run_system,
+    "reminder": run_reminder,
+    "fallback": run_fallback,
+}
+
 # Main loop ---------------------------------------------------------------
 def main():
     safe_print("SYSTEM", "Starting automation (Jarvis) ...")
@@ -276,6 +394,14 @@ def main():
         safe_print("SPEECH", f"Speech system initialization failed (voice disabled): {e}")
         speech_system = None
 
+    start_prefetcher()
+    set_timer_callback(announce_timer)
+    try:
+        warmed = warm_decision_cache()
+        if warmed:
+            safe_print("SYSTEM", f"Decision cache warmed with {warmed} utterance(s) from history")
+    except Exception as e:
+        safe_print("SYSTEM", f"Decision cache not warmed: {e}")
     mode = "text"  # default
     safe_print("SYSTEM", "Available modes: text, voice, both")
     safe_print("SYSTEM", "Type 'mode voice' or 'mode text' to switch. Type 'exit' to quit.\n")
@@ -333,20 +459,14 @@ def main():
                 # Let typed input be used
                 user_query = user_raw
 
-            # Get decisions from model
-            decisions = FirstLayerDMM(user_query)
-            safe_print("MODEL", f"Decisions: {decisions}")
+            # Get the action plans (decision cache, else model + parser)
+            plans = plan_utterance(user_query)
+            safe_print("MODEL", f"Plans: {plans}")
 
-            # Process each action sequentially
-            for act in decisions:
-                act = act.strip()
-                if not act:
-                    continue
-                result = handle_action(act, user_query)
-                if result == "EXIT":
-                    raise KeyboardInterrupt
-                # small delay between actions
-                time.sleep(0.3)
+            # Independent actions (opening apps, searches) run concurrently, the rest in order
+            results = get_action_executor().run(plans, lambda plan: execute_plan(plan, user_query))
+            if "EXIT" in results:
+                raise KeyboardInterrupt
 
         except KeyboardInterrupt:
             safe_print("SYSTEM", "Shutting down Jarvis. Goodbye!")
@@ -356,11 +476,28 @@ def main():
             # continue main loop
 
     # cleanup
+    stop_prefetcher()
+    cancel_timers()
+    stats = get_single_flight().stats()
+    if stats["coalesced"]:
+        safe_print("SYSTEM", f"Coalesced {stats['coalesced']} duplicate request(s), saved ~{stats['saved_seconds']:.1f}s")
+    stats = get_action_executor().stats()
+    if stats["parallel_groups"]:
+        safe_print("SYSTEM", f"Ran {stats['parallel_groups']} group(s) of actions in parallel, saved ~{stats['saved_seconds']:.1f}s")
+    get_action_executor().shutdown()
+    cache = get_decision_cache()
+    if cache is not None:
+        safe_print("SYSTEM", describe_decision_cache(cache.stats()))
+        try:
+            cache.save()
+        except OSError as e:
+            safe_print("ERROR", f"Could not save decision cache: {e}")
     try:
         if speech_system:
             speech_system.cleanup()
     except Exception:
         pass
+    shutdown_conversation_store()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,375 @@
+import atexit
+import json
+import os
+import threading
+
+
+# --- Settings ---
+DATA_DIR = "Data"
+JOURNAL_PATH = os.path.join(DATA_DIR, "ChatLog.jsonl")
+LEGACY_PATH = os.path.join(DATA_DIR, "ChatLog.json")
+COMPACT_EVERY = 500  # appends between background compaction checks
+MAX_RECORDS = int(os.getenv("CHAT_LOG_MAX_RECORDS", 20000))  # live journal size that triggers rotation
+MAX_BYTES = int(os.getenv("CHAT_LOG_MAX_BYTES", 16 * 1024 * 1024))
+FLUSH_INTERVAL = 0.5  # seconds the write-behind writer waits to batch turns
+
+
+def _encode(message, seq):
+    """Serialize one message as a single journal line (JSON never contains raw newlines)."""
+    record = {"seq": seq, "role": message["role"], "content": message["content"]}
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class ChatJournal:
+    """Append-only JSON Lines chat log.
+
+    Every turn costs one small append + fsync regardless of history length.
+    A torn last line left by a crash is truncated on open; damaged records are
+    skipped on read and dropped by the next (background) compaction. Once the
+    journal outgrows max_records or max_bytes, compaction also moves its older
+    half to the archive file, so startup and compaction stay bounded.
+
+    Every record carries its sequence number, its position in the whole log
+    (archive included); base is the number of the first live record, so
+    positions stay comparable across rotations.
+    """
+
+    def __init__(self, path=JOURNAL_PATH, legacy_path=LEGACY_PATH, compact_every=COMPACT_EVERY,
+                 archive_path=None, max_records=MAX_RECORDS, max_bytes=MAX_BYTES):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.archive_path = archive_path or os.path.splitext(path)[0] + ".archive.jsonl"
+        self.compact_every = compact_every
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._messages = None
+        self.base = 0
+        self._file = None
+        self._bytes = 0
+        self._damaged = 0
+        self._appends_since_compact = 0
+        self._compactor = None
+
+    # --- Reading ---
+    def load(self):
+        """Return a copy of the full history (parsed once, then served from memory)."""
+        return self.load_numbered()[1]
+
+    def load_numbered(self):
+        """Return (sequence number of the first message, copy of the history), read together."""
+        with self._lock:
+            if self._messages is None:
+                self._messages = self._read()
+            return self.base, list(self._messages)
+
+    def __len__(self):
+        with self._lock:
+            if self._messages is None:
+                self._messages = self._read()
+            return len(self._messages)
+
+    def _read(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.path):
+            self._migrate_legacy()
+        if not os.path.exists(self.path):
+            open(self.path, "wb").close()
+            return []
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        # Recover from a crash mid-append: drop the unterminated tail.
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+            data = data[:end]
+            print("⚠️ Chat log had a torn record; truncated to last complete entry")
+        self._bytes = len(data)
+
+        messages = []
+        first_seq = None
+        self._damaged = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                messages.append({"role": record["role"], "content": record["content"]})
+                if first_seq is None:
+                    first_seq = record.get("seq")
+            except (ValueError, KeyError, TypeError):
+                self._damaged += 1
+        if self._damaged:
+            print(f"⚠️ Skipped {self._damaged} damaged chat log record(s)")
+        # Journals written before sequence numbers start after whatever was archived
+        self.base = first_seq if isinstance(first_seq, int) else self._archived_records()
+        if messages and first_seq is None:
+            self._damaged = max(self._damaged, 1)  # renumber on the next compaction
+        if self._damaged or self._oversized(len(messages)):
+            self.start_compaction()
+        return messages
+
+    def _archived_records(self):
+        if not os.path.exists(self.archive_path):
+            return 0
+        with open(self.archive_path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _oversized(self, records):
+        return records > self.max_records or self._bytes > self.max_bytes
+
+    def _migrate_legacy(self):
+        """One-time conversion of the old ChatLog.json array into the journal."""
+        if not os.path.exists(self.legacy_path) or os.path.getsize(self.legacy_path) == 0:
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not migrate legacy chat log: {e}")
+            return
+
+        self._write_atomic([m for m in legacy if isinstance(m, dict) and "role" in m and "content" in m], 0)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+        print(f"✅ Migrated {len(legacy)} messages from {self.legacy_path} to {self.path}")
+
+    # --- Writing ---
+    def append(self, *messages):
+        """Durably append messages in a single write."""
+        if not messages:
+            return
+        with self._lock:
+            if self._messages is None:
+                self._messages = self._read()
+            first = self.base + len(self._messages)
+            payload = b"".join(_encode(m, first + i) for i, m in enumerate(messages))
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            self._file.write(payload)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._bytes += len(payload)
+            self._messages.extend({"role": m["role"], "content": m["content"]} for m in messages)
+
+            self._appends_since_compact += len(messages)
+            if self._appends_since_compact >= self.compact_every:
+                self._appends_since_compact = 0
+                if self._damaged or self._oversized(len(self._messages)):
+                    self.start_compaction()
+
+    def _write_atomic(self, messages, base):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for i, m in enumerate(messages):
+                f.write(_encode(m, base + i))
+            f.flush()
+            os.fsync(f.fileno())
+            self._bytes = f.tell()
+        os.replace(tmp_path, self.path)
+
+    # --- Compaction ---
+    def compact(self):
+        """Rewrite the journal with only valid records (atomic replace).
+
+        An oversized journal keeps its newest half (by records and bytes);
+        the older records are appended to the archive first.
+        """
+        with self._lock:
+            if self._messages is None:
+                self._messages = self._read()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            cut = self._rotation_cut() if self._oversized(len(self._messages)) else 0
+            if cut:
+                # A crash before the rewrite below only duplicates records in the archive.
+                with open(self.archive_path, "ab") as f:
+                    f.write(b"".join(_encode(m, self.base + i) for i, m in enumerate(self._messages[:cut])))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._messages = self._messages[cut:]
+                self.base += cut
+                print(f"✂️ Archived {cut} chat log record(s) to {self.archive_path}")
+            self._write_atomic(self._messages, self.base)
+            self._damaged = 0
+
+    def _rotation_cut(self):
+        """Number of oldest records to archive so the rest fits half of both limits."""
+        keep = kept_bytes = 0
+        for m in reversed(self._messages):
+            size = len(_encode(m, self.base + len(self._messages)))
+            if keep >= self.max_records // 2 or (keep and kept_bytes + size > self.max_bytes // 2):
+                break
+            keep += 1
+            kept_bytes += size
+        return len(self._messages) - keep
+
+    def start_compaction(self):
+        """Run compact() on a daemon thread unless one is already running."""
+        if self._compactor and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact_safely, daemon=True)
+        self._compactor.start()
+
+    def _compact_safely(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"⚠️ Chat log compaction failed: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# --- Shared journal ---
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_chat_journal():
+    """Return the process-wide chat journal."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = ChatJournal()
+        return _journal
+
+
+def _read_records(path):
+    messages = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                messages.append({"role": record["role"], "content": record["content"]})
+            except (ValueError, KeyError, TypeError):
+                continue
+    return messages
+
+
+def read_chat_log(path=JOURNAL_PATH, legacy_path=LEGACY_PATH):
+    """Every message on disk (archive first), read-only: nothing is migrated, truncated or compacted.
+
+    For offline tools; falls back to the legacy ChatLog.json before its migration.
+    """
+    parts = [p for p in (os.path.splitext(path)[0] + ".archive.jsonl", path) if os.path.exists(p)]
+    if parts:
+        return [m for p in parts for m in _read_records(p)]
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return [{"role": m["role"], "content": m["content"]}
+            for m in legacy if isinstance(m, dict) and "role" in m and "content" in m]
+
+
+class ConversationStore:
+    """Thread-safe in-memory conversation shared by every engine.
+
+    Readers are served from memory; appended turns are queued and written to
+    the journal in batches by a background writer. Call flush() to force the
+    queue to disk (close() does this at shutdown). base is the journal
+    sequence number of snapshot()[0]; it does not change while the store
+    is open, since the store keeps everything it loaded.
+    """
+
+    def __init__(self, journal=None, flush_interval=FLUSH_INTERVAL):
+        self.journal = journal if journal is not None else get_chat_journal()  # an empty journal is falsy
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self.base, self._messages = self.journal.load_numbered()
+        self._pending = []
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="ConversationWriter", daemon=True)
+        self._writer.start()
+
+    def snapshot(self):
+        """Return a copy of the conversation so far."""
+        with self._lock:
+            return list(self._messages)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._messages)
+
+    def append_turn(self, *messages):
+        """Atomically add messages (e.g. a user/assistant pair) and queue them for disk."""
+        messages = [{"role": m["role"], "content": m["content"]} for m in messages]
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("conversation store is closed")
+            self._messages.extend(messages)
+            self._pending.extend(messages)
+            self._wakeup.notify()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write every queued message to the journal now."""
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                self.journal.append(*batch)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._writer.join(timeout=5)
+        self.flush()
+        self.journal.close()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                # Give concurrent turns a moment to join this batch.
+                self._wakeup.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Error writing chat history: {e}")
+
+
+# --- Shared store ---
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store():
+    """Return the process-wide conversation store, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConversationStore()
+        return _store
+
+
+def shutdown_conversation_store():
+    """Flush and close the shared store if it was ever created."""
+    with _store_lock:
+        store = _store
+    if store is not None:
+        store.close()
+
+
+atexit.register(shutdown_conversation_store)
@@ -1,37 +1,24 @@
-from groq import Groq
-from groq.types.chat import (
-    ChatCompletionSystemMessageParam,
-    ChatCompletionUserMessageParam,
-    ChatCompletionAssistantMessageParam
-)
-from json import load, dump
 from dotenv import dotenv_values
+from ChatLog import get_conversation_store
+from ContextWindow import build_context, describe
+from Summarizer import get_summarizer
+from Streaming import INTERRUPTED_NOTICE, StreamCleaner, completion_deltas, async_completion_deltas
+from ResponseCache import get_response_cache
+from LLMClient import chat_completion, async_chat_completion, MODEL
 import os
 
 
 # Load environment variables with multiple fallback options
 def load_environment():
-    """Load API key and names from multiple sources"""
+    """Load user and assistant names (the API key is handled by LLMClient)"""
     # Try .env file first
     env_path = os.path.join(os.path.dirname(__file__), ".env")
     env_vars = dotenv_values(env_path)
-    # Check for API key in .env with different possible variable names
-    GroqAPIKey = (
-        env_vars.get("GroqAPIKey") or
-        env_vars.get("GROQ_API_KEY") or
-        env_vars.get("API_KEY") or
-        os.getenv("GROQ_API_KEY") or
-        os.getenv("GroqAPIKey")
-    )
 
     Username = env_vars.get("Username") or os.getenv("USERNAME", "User")
     Assistantname = env_vars.get("Assistantname") or os.getenv("ASSISTANTNAME", "Jarvis")
 
-    if not GroqAPIKey:
-        print("❌ GROQ_API_KEY not found! Please set it in your .env file.")
-        exit(1)
-
-    return GroqAPIKey, Username, Assistantname
+    return Username, Assistantname
 
 
 def create_env_template():
@@ -50,25 +37,10 @@ Assistantname=Jarvis
 
 
 # Load environment variables
-try:
-    GroqAPIKey, Username, Assistantname = load_environment()
-    print("✅ Environment variables loaded successfully")
-except Exception as e:
-    print(f"❌ Error loading environment: {e}")
-    exit(1)
-
-
-# Initialize Groq client
-try:
-    client = Groq(api_key=GroqAPIKey)
-    print("✅ Groq client initialized successfully")
-except Exception as e:
-    print(f"❌ Error initializing Groq client: {e}")
-    exit(1)
+Username, Assistantname = load_environment()
 
 
-# Model and system prompt
-MODEL = "llama-3.1-8b-instant"
+# System prompt (MODEL comes from the shared LLM client)
 SystemChatBot = [{
     "role": "system",
     "content": f"""Hello, I am {Username}. You are {Assistantname}, an accurate AI assistant with real-time information.
@@ -78,34 +50,19 @@ SystemChatBot = [{
 }]
 
 
-# Initialize chat history
-messages = []
-
-
 def load_chat_history():
-    """Load chat history from JSON file"""
+    """Return the shared in-memory conversation"""
     try:
-        os.makedirs("Data", exist_ok=True)
-        file_path = "Data/ChatLog.json"
-
-        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-            with open(file_path, "w", encoding='utf-8') as f:
-                dump([], f, indent=4)
-            return []
-
-        with open(file_path, "r", encoding='utf-8') as f:
-            return load(f)
-
+        return get_conversation_store().snapshot()
     except Exception as e:
         print(f"⚠️ Error loading chat history: {e}")
         return []
 
 
-def save_chat_history(messages):
-    """Save chat history to JSON file"""
+def append_chat_history(*new_messages):
+    """Queue this turn's messages for write-behind persistence"""
     try:
-        with open("Data/ChatLog.json", "w", encoding='utf-8') as f:
-            dump(messages, f, indent=4)
+        get_conversation_store().append_turn(*new_messages)
     except Exception as e:
         print(f"⚠️ Error saving chat history: {e}")
 
@@ -118,6 +75,12 @@ def clean_response(answer):
 
 def create_message_objects(messages_list):
     """Convert message dictionaries to Groq message objects"""
+    from groq.types.chat import (
+        ChatCompletionSystemMessageParam,
+        ChatCompletionUserMessageParam,
+        ChatCompletionAssistantMessageParam
+    )
+
     message_objects = []
     for msg in messages_list:
         if msg["role"] == "system":
@@ -129,58 +92,146 @@ def create_message_objects(messages_list):
     return message_objects
 
 
-def ChatBot(query):
-    """Process user query and return AI response"""
-    global messages
+# Sampling parameters for every ChatBot request
+COMPLETION_PARAMS = dict(max_tokens=1024, temperature=0.7, top_p=1, stream=True, stop=None)
+
+
+class ChatTurn:
+    """State of one ChatBot turn, shared by the sync and async streaming APIs"""
+
+    def __init__(self, query):
+        self.query = query
+        self.user_message = {"role": "user", "content": query}
+        self.answer = ""
+        self._cleaner = StreamCleaner()
+        self._started = False
+
+        self.context = self._build_context()
+
+        # Serve repeated questions from the (opt-in) response cache; the key covers everything
+        # the model would see, so "tell me more" never replays an answer from another conversation
+        self.cache = get_response_cache()
+        self.cache_context = [*self.context[:-1], {"model": MODEL, "temperature": COMPLETION_PARAMS["temperature"]}]
+        self.cached = self.cache.get(query, self.cache_context) if self.cache is not None else None
+
+    def _build_context(self):
+        """System prompt, summary, recent turns within budget, query"""
+        history = load_chat_history()
+        summary_messages, history = get_summarizer().context_for(history)
+        all_messages, report = build_context(SystemChatBot + summary_messages, history, self.user_message)
+        if report["dropped_messages"]:
+            print(f"✂️ {describe(report)}")
+        return all_messages
+
+    def messages(self):
+        """Groq messages for this turn's context window"""
+        return create_message_objects(self.context)
+
+    def feed(self, delta):
+        """Return the cleaned text to show for a delta, dropping leading whitespace like strip() did"""
+        self.answer += delta
+        visible = self._cleaner.feed(delta.replace("</s>", ""))
+        if not self._started:
+            visible = visible.lstrip()
+            self._started = bool(visible)
+        return visible
+
+    def close(self):
+        tail = self._cleaner.close()
+        return tail.lstrip() if not self._started else tail
+
+    def finish(self, interrupted=False):
+        """Store the turn once the stream has ended; returns text still to show (fallback or notice)
+
+        interrupted: the stream failed part-way; the partial answer is stored with a notice and not cached.
+        """
+        answer = self.answer.replace("</s>", "").strip()
+        extra = ""
+        if not answer:
+            answer = extra = "Sorry, I couldn't generate a response. Please try again."
+        elif interrupted:
+            answer += INTERRUPTED_NOTICE
+            extra = INTERRUPTED_NOTICE
+        elif self.cache is not None:
+            self.cache.put(self.query, self.cache_context, clean_response(answer))
+        append_chat_history(self.user_message, {"role": "assistant", "content": answer})
+        return extra
+
+    def record_cached(self):
+        append_chat_history(self.user_message, {"role": "assistant", "content": self.cached})
+        return self.cached
+
+
+def ChatBotStream(query):
+    """Process user query and yield the AI response as cleaned text deltas"""
+    turn = ChatTurn(query)
+    if turn.cached is not None:
+        yield turn.record_cached()
+        return
 
-    # Load current chat history
-    messages = load_chat_history()
+    try:
+        # Get AI response
+        completion = chat_completion(messages=turn.messages(), **COMPLETION_PARAMS)
+        for delta in completion_deltas(completion):
+            visible = turn.feed(delta)
+            if visible:
+                yield visible
+        tail = turn.close()
+        if tail:
+            yield tail
 
-    # Add user message
-    messages.append({"role": "user", "content": query})
+    except Exception as e:
+        error_msg = f"Error: {str(e)}"
+        print(error_msg)
+        if not turn.answer:
+            yield "I'm experiencing technical difficulties. Please try again."
+        else:
+            yield turn.close() + turn.finish(interrupted=True)
+        return
 
-    # Prepare all messages for AI
-    all_messages = SystemChatBot + messages
+    fallback = turn.finish()
+    if fallback:
+        yield fallback
 
-    # Convert to Groq format
-    groq_messages = create_message_objects(all_messages)
 
-    try:
-        # Get AI response
-        completion = client.chat.completions.create(
-            model=MODEL,
-            messages=groq_messages,
-            max_tokens=1024,
-            temperature=0.7,
-            top_p=1,
-            stream=True,
-            stop=None
-        )
-
-        # Stream response
-        answer = ""
-        for chunk in completion:
-            if chunk.choices[0].delta.content:
-                answer += chunk.choices[0].delta.content
-
-        # Clean and store response
-        answer = answer.replace("</s>", "").strip()
-        if not answer:
-            answer = "Sorry, I couldn't generate a response. Please try again."
+def ChatBot(query):
+    """Process user query and return AI response"""
+    return "".join(ChatBotStream(query))
 
-        messages.append({"role": "assistant", "content": answer})
-        save_chat_history(messages)
 
-        return clean_response(answer)
+async def ChatBotStreamAsync(query):
+    """Async version of ChatBotStream; cancelling the consuming task aborts the request unsaved"""
+    turn = ChatTurn(query)
+    if turn.cached is not None:
+        yield turn.record_cached()
+        return
+
+    try:
+        completion = await async_chat_completion(messages=turn.messages(), **COMPLETION_PARAMS)
+        async for delta in async_completion_deltas(completion):
+            visible = turn.feed(delta)
+            if visible:
+                yield visible
+        tail = turn.close()
+        if tail:
+            yield tail
 
     except Exception as e:
-        error_msg = f"Error: {str(e)}"
-        print(error_msg)
-        return "I'm experiencing technical difficulties. Please try again."
+        print(f"Error: {str(e)}")
+        if not turn.answer:
+            yield "I'm experiencing technical difficulties. Please try again."
+        else:
+            yield turn.close() + turn.finish(interrupted=True)
+        return
+
+    fallback = turn.finish()
+    if fallback:
+        yield fallback
 
 
-# Initialize chat history
-messages = load_chat_history()
+async def ChatBotAsync(query):
+    """Async version of ChatBot, for running many queries on one event loop"""
+    return "".join([delta async for delta in ChatBotStreamAsync(query)])
 
 
 if __name__ == "__main__":
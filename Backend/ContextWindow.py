@@ -0,0 +1,91 @@
+import os
+import re
+import threading
+from functools import lru_cache
+
+
+# --- Settings ---
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))  # prompt tokens per request
+MESSAGE_OVERHEAD = 4  # role/separator tokens the chat template adds per message
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text):
+    """Fast local approximation of a BPE token count (roughly one token per 4 word characters)."""
+    return sum(1 + (len(tok) - 1) // 4 for tok in _TOKEN_RE.findall(text))
+
+
+def message_tokens(message):
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD
+
+
+class _DroppedTokens:
+    """Token total of the dropped history prefix, moved with the window boundary instead of re-summed.
+
+    The history is re-sent on every request and only grows at the end, so the
+    boundary usually advances by a turn or two. A different history (or a
+    summary fold that shifts its start) is detected by identity and recounted once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._first = self._last = None
+        self._end = 0
+        self._tokens = 0
+
+    def total(self, history, end):
+        with self._lock:
+            if not (0 < self._end <= len(history) and history[0] is self._first
+                    and history[self._end - 1] is self._last):
+                self._end = self._tokens = 0
+            if end >= self._end:
+                self._tokens += sum(message_tokens(m) for m in history[self._end:end])
+            else:
+                self._tokens -= sum(message_tokens(m) for m in history[end:self._end])
+            self._end = end
+            self._first = history[0] if history else None
+            self._last = history[end - 1] if end else None
+            return self._tokens
+
+
+_dropped_tokens = _DroppedTokens()
+
+
+def build_context(system_messages, history, query_message, budget=None):
+    """Assemble system prompts + the most recent turns that fit + the current query.
+
+    System prompts and the query are always kept, even if they alone exceed the
+    budget. Returns (messages, report) where report counts what was dropped.
+    """
+    budget = CONTEXT_TOKEN_BUDGET if budget is None else budget
+    used = sum(message_tokens(m) for m in system_messages) + message_tokens(query_message)
+
+    kept = 0
+    for message in reversed(history):
+        cost = message_tokens(message)
+        if used + cost > budget:
+            break
+        used += cost
+        kept += 1
+
+    start = len(history) - kept
+    # Don't open the window on an orphaned assistant reply.
+    while start < len(history) and history[start]["role"] == "assistant":
+        used -= message_tokens(history[start])
+        start += 1
+
+    report = {
+        "budget": budget,
+        "used_tokens": used,
+        "kept_messages": len(history) - start,
+        "dropped_messages": start,
+        "dropped_tokens": _dropped_tokens.total(history, start),
+    }
+    return [*system_messages, *history[start:], query_message], report
+
+
+def describe(report):
+    return (f"context {report['used_tokens']}/{report['budget']} tokens, "
+            f"dropped {report['dropped_messages']} messages (~{report['dropped_tokens']} tokens)")
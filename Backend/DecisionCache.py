@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# --- Settings ---
+MAX_ENTRIES = 1024               # utterances kept (LRU)
+DISK_PATH = os.path.join("Data", "DecisionCache.json")
+WARM_FROM_HISTORY = 300          # most recent user messages replayed at startup
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# Everything a routing decision depends on: the rules, the intent model and the action parser
+ROUTING_SOURCES = ("Model.py", "IntentClassifier.py", "Automation.py", "DecisionCache.py")
+ROUTING_ENV = ("INTENT_MODEL", "INTENT_CONFIDENCE")
+
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.]+$")
+
+
+def _collapse(utterance):
+    return " ".join(utterance.split())
+
+
+def normalize_utterance(utterance):
+    """Lower-case with collapsed whitespace and no trailing ?!. ('Open  Chrome!' -> 'open chrome').
+
+    Other punctuation is kept: '2+2' and '2*2' must not share a plan.
+    """
+    return _TRAILING_PUNCT_RE.sub("", _collapse(utterance).lower())
+
+
+def _offsets_stable(text):
+    """Lower-casing keeps every character offset (false for a few letters like 'İ')"""
+    return len(text.lower()) == len(text)
+
+
+def plan_template(utterance, plans):
+    """Plans with each argument replaced by its [start, end] span in the utterance where it occurs.
+
+    Utterances that share a key differ only in case, spacing and trailing
+    punctuation, so a span re-reads the argument, with its casing, from the
+    utterance being planned. end is None for spans that run to the end.
+    Arguments not found in the utterance are kept as they are.
+    """
+    text = _collapse(utterance)
+    lower = text.lower()
+    templates = []
+    for handler, argument in plans:
+        start = lower.find(argument.lower()) if argument and _offsets_stable(text) else -1
+        if start < 0:
+            templates.append((handler, argument))
+            continue
+        end = start + len(argument)
+        templates.append((handler, [start, None if end == len(text) else end]))
+    return templates
+
+
+def fill_template(utterance, templates):
+    """The plans of templates for this utterance"""
+    text = _collapse(utterance)
+    return [(handler, text[arg[0]:arg[1]] if isinstance(arg, list) else arg) for handler, arg in templates]
+
+
+def routing_fingerprint(sources=ROUTING_SOURCES, model_path=None):
+    """Hash of the routing code, the trained intent model and the settings that change decisions"""
+    if model_path is None:
+        from IntentClassifier import MODEL_PATH as model_path
+    digest = hashlib.sha1()
+    for path in [os.path.join(BACKEND_DIR, name) for name in sources] + [model_path]:
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"-")
+    for name in ROUTING_ENV:
+        digest.update(f"{name}={os.getenv(name, '')}".encode())
+    return digest.hexdigest()
+
+
+class DecisionCache:
+    """Bounded LRU from normalized utterance to its parsed action plans.
+
+    A plan is a list of (handler, argument) pairs; entries keep arguments as
+    spans of the utterance (see plan_template), so a hit for 'Open CHROME'
+    opens 'CHROME' even if 'open chrome' was planned first. Entries are
+    persisted with the routing fingerprint and dropped on load if any rule,
+    parser or model change made them stale. Each entry remembers what
+    building it cost, so hits report the time they saved.
+    """
+
+    def __init__(self, fingerprint, path=DISK_PATH, max_entries=MAX_ENTRIES):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._plans = OrderedDict()  # key -> (plans, build seconds)
+        self._stats = {"hits": 0, "misses": 0, "saved_seconds": 0.0, "loaded": 0, "warmed": 0, "invalidated": 0}
+
+    def get(self, utterance, build):
+        """Plans for utterance, built with build(utterance) on a miss"""
+        key = normalize_utterance(utterance)
+        with self._lock:
+            entry = self._plans.get(key) if _offsets_stable(utterance) else None
+            if entry is not None:
+                self._plans.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["saved_seconds"] += entry[1]
+                return fill_template(utterance, entry[0])
+        start = time.perf_counter()
+        plans = build(utterance)
+        cost = time.perf_counter() - start
+        with self._lock:
+            self._stats["misses"] += 1
+            self._put(key, plan_template(utterance, plans), cost)
+        return list(plans)
+
+    def _put(self, key, templates, cost):
+        self._plans[key] = ([tuple(t) for t in templates], cost)
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+
+    def warm(self, utterances, build):
+        """Build plans for utterances not cached yet (oldest first, so the newest end up most recent)"""
+        added = 0
+        for utterance in utterances:
+            key = normalize_utterance(utterance)
+            with self._lock:
+                if not key or key in self._plans:
+                    continue
+            start = time.perf_counter()
+            plans = build(utterance)
+            with self._lock:
+                self._put(key, plan_template(utterance, plans), time.perf_counter() - start)
+            added += 1
+        with self._lock:
+            self._stats["warmed"] += added
+        return added
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+    # --- persistence ---
+    def load(self):
+        """Read the saved plans unless the routing fingerprint changed since they were saved"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if data.get("fingerprint") != self.fingerprint:
+            with self._lock:
+                self._stats["invalidated"] += len(data.get("entries", []))
+            return 0
+        with self._lock:
+            for key, templates, cost in data.get("entries", [])[-self.max_entries:]:
+                self._put(key, templates, cost)
+            self._stats["loaded"] = len(self._plans)
+            return len(self._plans)
+
+    def save(self):
+        with self._lock:
+            entries = [[key, [list(t) for t in templates], round(cost, 6)]
+                       for key, (templates, cost) in self._plans.items()]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def stats(self):
+        """Hit rate and the classification/parsing time saved by hits."""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._plans))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def describe(stats):
+    return (f"Decision cache: {stats['hits']}/{stats['hits'] + stats['misses']} hits ({stats['hit_rate']:.0%}), "
+            f"saved {stats['saved_seconds'] * 1000:.1f} ms")
+
+
+# --- Shared cache ---
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_decision_cache():
+    """The shared cache, loaded from disk; None when disabled with DECISION_CACHE=0."""
+    global _cache
+    if os.getenv("DECISION_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DecisionCache(routing_fingerprint())
+            _cache.load()
+        return _cache
@@ -0,0 +1,311 @@
+"""Offline intent classifier: hashed n-gram multinomial naive Bayes, pure Python.
+
+Usage:
+    python Backend/IntentClassifier.py train [--labels PATH] [--chat-log] [--out PATH]
+    python Backend/IntentClassifier.py eval [--folds 5] [--confidence 0.9]
+    python Backend/IntentClassifier.py bench [--repeat 200]
+
+Explicit commands (exit, google/youtube, open/close/play/system, reminders)
+always go to the rules in Model.py. For everything else the model decides
+between "general" and "realtime" when it is at least CONFIDENCE sure, and
+Model.classify_decisions decides when it is not.
+
+train cross-validates each confidence in CONFIDENCE_GRID and saves the best
+with its scores. The app only routes through a model whose cross-validated
+accuracy beat the rules alone; otherwise the rules keep deciding.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import statistics
+import threading
+import time
+import zlib
+
+from Model import classify_decisions, command_decisions
+
+
+# --- Settings ---
+MODEL_PATH = os.path.join("Data", "IntentModel.json")
+LABELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Benchmarks", "Fixtures", "LabeledQueries.jsonl")
+INTENTS = ("general", "realtime")
+HASH_BITS = 18                   # feature buckets = 2 ** HASH_BITS
+ALPHA = 0.5                      # additive smoothing
+CONFIDENCE = float(os.getenv("INTENT_CONFIDENCE", 0.9))
+CONFIDENCE_GRID = (0.9, 0.95, 0.99, 0.999)  # tried by train, best cross-validated one is saved
+FOLDS = 5
+CHAT_LOG_WEIGHT = 0.3            # chat-log queries are labelled by the rules, so they count less than hand labels
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def features(query, hash_bits=HASH_BITS):
+    """Hashed buckets of the words, the word bigrams and the opening word of query"""
+    words = _WORD_RE.findall(query.lower())
+    grams = words + [f"{a} {b}" for a, b in zip(["<s>"] + words, words)]
+    mask = (1 << hash_bits) - 1
+    return [zlib.crc32(g.encode("utf-8")) & mask for g in grams]
+
+
+class IntentClassifier:
+    """Multinomial naive Bayes over hashed n-grams; only buckets seen in training are stored."""
+
+    def __init__(self, priors, log_probs, unseen, hash_bits=HASH_BITS, confidence=CONFIDENCE, validation=None):
+        self.priors = priors          # intent -> log P(intent)
+        self.log_probs = log_probs    # intent -> {bucket: log P(bucket | intent)}
+        self.unseen = unseen          # intent -> log P(bucket | intent) for buckets not in log_probs
+        self.hash_bits = hash_bits
+        self.confidence = confidence
+        self.validation = validation  # cross-validated {"confidence", "folds", "rules", "hybrid"} from train
+        self._lock = threading.Lock()
+        self._stats = {"commands": 0, "model": 0, "rules": 0}
+
+    @classmethod
+    def train(cls, examples, hash_bits=HASH_BITS, alpha=ALPHA, confidence=CONFIDENCE):
+        """examples: iterable of (query, intent, weight)"""
+        counts = {intent: {} for intent in INTENTS}
+        totals = dict.fromkeys(INTENTS, 0.0)
+        docs = dict.fromkeys(INTENTS, 0.0)
+        for query, intent, weight in examples:
+            docs[intent] += weight
+            for bucket in features(query, hash_bits):
+                counts[intent][bucket] = counts[intent].get(bucket, 0.0) + weight
+                totals[intent] += weight
+        vocabulary = len(set().union(*counts.values())) or 1
+        all_docs = sum(docs.values())
+        priors, log_probs, unseen = {}, {}, {}
+        for intent in INTENTS:
+            denominator = totals[intent] + alpha * vocabulary
+            priors[intent] = math.log((docs[intent] + 1) / (all_docs + len(INTENTS)))
+            unseen[intent] = math.log(alpha / denominator)
+            log_probs[intent] = {b: math.log((c + alpha) / denominator) for b, c in counts[intent].items()}
+        return cls(priors, log_probs, unseen, hash_bits, confidence)
+
+    def predict(self, query):
+        """(intent, probability) of the most likely intent"""
+        buckets = features(query, self.hash_bits)
+        scores = {}
+        for intent in INTENTS:
+            table, default = self.log_probs[intent], self.unseen[intent]
+            scores[intent] = self.priors[intent] + sum(table.get(b, default) for b in buckets)
+        best = max(scores, key=scores.get)
+        norm = sum(math.exp(s - scores[best]) for s in scores.values())
+        return best, 1.0 / norm
+
+    def decide(self, query):
+        """(category, argument) decisions: commands by the rules, then the model if confident, else the rules"""
+        decisions = command_decisions(query)
+        if decisions is not None:
+            self._count("commands")
+            return decisions
+        intent, probability = self.predict(query)
+        if probability >= self.confidence:
+            self._count("model")
+            return [(intent, query)]
+        self._count("rules")
+        return classify_decisions(query)
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def beats_rules(self):
+        """True if cross-validation showed the model with rule fallback beating the rules alone"""
+        return bool(self.validation) and self.validation["hybrid"] > self.validation["rules"]
+
+    # --- persistence ---
+    def save(self, path=MODEL_PATH):
+        data = {
+            "version": 1,
+            "hash_bits": self.hash_bits,
+            "validation": self.validation,
+            "intents": list(INTENTS),
+            "priors": self.priors,
+            "unseen": self.unseen,
+            "log_probs": {i: {str(b): round(p, 5) for b, p in t.items()} for i, t in self.log_probs.items()},
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH, confidence=None):
+        """Load a trained model; confidence defaults to INTENT_CONFIDENCE, else the one train validated."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if tuple(data["intents"]) != INTENTS:
+            raise ValueError(f"model was trained for intents {data['intents']}")
+        validation = data.get("validation")
+        if confidence is None:
+            confidence = CONFIDENCE if "INTENT_CONFIDENCE" in os.environ or not validation else validation["confidence"]
+        log_probs = {i: {int(b): p for b, p in t.items()} for i, t in data["log_probs"].items()}
+        return cls(data["priors"], log_probs, data["unseen"], data["hash_bits"], confidence, validation)
+
+
+# --- Training data ---
+def load_labeled(path=LABELS_PATH):
+    """[(query, intent)] of hand-labelled non-command queries"""
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            category = row["decisions"][0][0]
+            if category in INTENTS and command_decisions(row["query"]) is None:
+                examples.append((row["query"], category))
+    return examples
+
+
+def load_chat_log_queries():
+    """[(query, intent)] of past user messages, labelled by the rules.
+
+    Opt-in (--chat-log): these labels are the rules' own answers, so they can
+    only teach the model to imitate the rules. The log is read without
+    migrating or compacting it.
+    """
+    from ChatLog import read_chat_log
+
+    examples = []
+    for message in read_chat_log():
+        query = message.get("content", "").strip()
+        if message.get("role") != "user" or not query or command_decisions(query) is not None:
+            continue
+        category = classify_decisions(query)[0][0]
+        if category in INTENTS:
+            examples.append((query, category))
+    return examples
+
+
+def training_examples(labeled, chat_log=()):
+    labeled_queries = {q.lower() for q, _ in labeled}
+    yield from ((q, intent, 1.0) for q, intent in labeled)
+    yield from ((q, intent, CHAT_LOG_WEIGHT) for q, intent in chat_log if q.lower() not in labeled_queries)
+
+
+def cross_validate(labeled, chat_log=(), folds=FOLDS, confidences=(CONFIDENCE,)):
+    """k-fold accuracies per confidence: {confidence: {"rules", "model", "hybrid", "decided", "decided_correct"}}
+
+    rules, model and hybrid are shares of the labelled queries; decided counts
+    the queries the model was sure enough to decide, decided_correct the right ones.
+    """
+    results = {c: dict.fromkeys(("rules", "model", "hybrid", "decided", "decided_correct"), 0) for c in confidences}
+    for fold in range(folds):
+        train = [e for i, e in enumerate(labeled) if i % folds != fold]
+        test = [e for i, e in enumerate(labeled) if i % folds == fold]
+        model = IntentClassifier.train(training_examples(train, chat_log))
+        for query, intent in test:
+            predicted, probability = model.predict(query)
+            rules_right = classify_decisions(query)[0][0] == intent
+            model_right = predicted == intent
+            for confidence, r in results.items():
+                decided = probability >= confidence
+                r["rules"] += rules_right
+                r["model"] += model_right
+                r["hybrid"] += model_right if decided else rules_right
+                r["decided"] += decided
+                r["decided_correct"] += decided and model_right
+    for r in results.values():
+        for key in ("rules", "model", "hybrid"):
+            r[key] /= len(labeled)
+    return results
+
+
+# --- Shared classifier ---
+_classifier = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier():
+    """The trained model from MODEL_PATH; None if there is none, it did not beat the rules, or INTENT_MODEL=0."""
+    global _classifier, _classifier_loaded
+    if _classifier_loaded:
+        return _classifier
+    with _classifier_lock:
+        if not _classifier_loaded:
+            if os.getenv("INTENT_MODEL", "1").lower() not in ("0", "false", "no") and os.path.exists(MODEL_PATH):
+                try:
+                    model = IntentClassifier.load(MODEL_PATH)
+                    if model.beats_rules():
+                        _classifier = model
+                    else:
+                        print("⚠️ Intent model not used: it did not beat the rules in cross-validation")
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Intent model not loaded: {e}")
+            _classifier_loaded = True
+        return _classifier
+
+
+# --- Commands ---
+def cmd_train(args):
+    labeled = load_labeled(args.labels)
+    chat_log = load_chat_log_queries() if args.chat_log else []
+    confidences = [args.confidence] if args.confidence is not None else CONFIDENCE_GRID
+    results = cross_validate(labeled, chat_log, args.folds, confidences)
+    best = max(confidences, key=lambda c: (results[c]["hybrid"], c))
+    model = IntentClassifier.train(training_examples(labeled, chat_log), confidence=best)
+    model.validation = {"confidence": best, "folds": args.folds,
+                        "rules": round(results[best]["rules"], 4), "hybrid": round(results[best]["hybrid"], 4)}
+    model.save(args.out)
+    buckets = sum(len(t) for t in model.log_probs.values())
+    print(f"✅ Trained on {len(labeled)} labelled and {len(chat_log)} chat-log queries: "
+          f"{buckets} buckets, {os.path.getsize(args.out) / 1024:.1f} KiB -> {args.out}")
+    verdict = "will be used" if model.beats_rules() else "stays off (the rules are at least as good)"
+    print(f"   confidence {best}: hybrid {results[best]['hybrid']:.1%} vs rules {results[best]['rules']:.1%}, {verdict}")
+
+
+def cmd_eval(args):
+    """k-fold cross-validation on the labelled queries: rules alone, model alone, model with rule fallback"""
+    labeled = load_labeled(args.labels)
+    chat_log = load_chat_log_queries() if args.chat_log else []
+    confidence = CONFIDENCE if args.confidence is None else args.confidence
+    r = cross_validate(labeled, chat_log, args.folds, [confidence])[confidence]
+    n = len(labeled)
+    print(f"{n} labelled non-command queries, {args.folds}-fold cross-validation, confidence {confidence}\n")
+    for name in ("rules", "model", "hybrid"):
+        print(f"  {name:<8}{r[name]:8.1%}")
+    if r["decided"]:
+        print(f"\n  model decided {r['decided'] / n:.0%} of queries, {r['decided_correct'] / r['decided']:.1%} of them correctly")
+
+
+def cmd_bench(args):
+    model = IntentClassifier.load(args.out) if os.path.exists(args.out) else \
+        IntentClassifier.train(training_examples(load_labeled(args.labels)))
+    queries = [q for q, _ in load_labeled(args.labels)]
+    print(f"{len(queries)} queries, median of {args.repeat} passes\n")
+    print(f"  {'path':<22}{'µs/query':>10}")
+    for name, fn in (("rules", classify_decisions), ("model predict", model.predict), ("model decide", model.decide)):
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for q in queries:
+                fn(q)
+            samples.append((time.perf_counter() - start) / len(queries))
+        print(f"  {name:<22}{statistics.median(samples) * 1e6:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("train", "eval", "bench"))
+    parser.add_argument("--labels", default=LABELS_PATH)
+    parser.add_argument("--out", default=MODEL_PATH)
+    parser.add_argument("--chat-log", action="store_true", help="also train on past queries labelled by the rules")
+    parser.add_argument("--folds", type=int, default=FOLDS)
+    parser.add_argument("--confidence", type=float, help=f"default: train tries {CONFIDENCE_GRID}, eval uses {CONFIDENCE}")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    {"train": cmd_train, "eval": cmd_eval, "bench": cmd_bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+
+# --- Settings ---
+MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+BASE_URL = os.getenv("GROQ_BASE_URL") or None  # e.g. the offline server in Benchmarks/FakeGroq.py
+DEADLINE = 30.0              # seconds per call, retries included
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5           # first retry waits ~0.5s, then 1s, 2s ... (with jitter)
+BACKOFF_MAX = 8.0
+REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", 30))  # shared across every engine in the process
+BURST = int(os.getenv("GROQ_BURST", 5))
+MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", 10))
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def load_api_key():
+    """Find the Groq key in Backend/.env or the environment (same names Chatbot always accepted)."""
+    from dotenv import dotenv_values
+
+    env_vars = dotenv_values(os.path.join(os.path.dirname(__file__), ".env"))
+    return (
+        env_vars.get("GroqAPIKey") or
+        env_vars.get("GROQ_API_KEY") or
+        env_vars.get("API_KEY") or
+        os.getenv("GROQ_API_KEY") or
+        os.getenv("GroqAPIKey")
+    )
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class TokenBucket:
+    """Thread-safe request rate limiter; a 429 pauses it for every caller."""
+
+    def __init__(self, rate_per_sec, capacity):
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, deadline=None):
+        """Take a token and return how long the caller must wait before using it.
+
+        If that wait would pass deadline, raise DeadlineExceeded without taking
+        the token, so rejected callers never delay the ones that fit.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max((1 - self._tokens) / self.rate if self._tokens < 1 else 0.0, self._paused_until - now)
+            if deadline is not None and now + wait > deadline:
+                raise DeadlineExceeded("rate limit wait would exceed the deadline")
+            self._tokens -= 1
+            return wait
+
+    def refund(self):
+        """Give back a reserved token that was not used (e.g. the wait was cancelled)."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def try_acquire(self):
+        """Take a token only if one is available right now."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1 or now < self._paused_until:
+                return False
+            self._tokens -= 1
+            return True
+
+    def acquire(self, deadline=None):
+        wait = self.reserve(deadline)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def is_retryable(error):
+    """Connection problems, timeouts, 429 and 5xx are worth retrying; 4xx request errors are not."""
+    import groq
+
+    if isinstance(error, (groq.APIConnectionError, groq.APITimeoutError)):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+def retry_after(error):
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+# --- Shared client ---
+_client = None
+_async_clients = {}          # event loop -> AsyncGroq (httpx async pools are bound to their loop)
+_client_lock = threading.Lock()
+rate_limiter = TokenBucket(REQUESTS_PER_MINUTE / 60.0, BURST)
+
+
+def _api_key():
+    api_key = load_api_key() or ("offline" if BASE_URL else None)
+    if not api_key:
+        raise RuntimeError("GROQ_API_KEY not found! Please set it in your .env file.")
+    return api_key
+
+
+def _pool_limits():
+    import httpx
+
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS, keepalive_expiry=60)
+
+
+def get_llm_client():
+    """Return the process-wide Groq client (pooled keep-alive connections, our own retries)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            api_key = _api_key()
+            import httpx
+            from groq import Groq
+
+            http_client = httpx.Client(limits=_pool_limits())
+            _client = Groq(api_key=api_key, base_url=BASE_URL, http_client=http_client, max_retries=0)
+            print("✅ Groq client initialized successfully")
+        return _client
+
+
+def chat_completion(messages, deadline=DEADLINE, **params):
+    """chat.completions.create with rate limiting, a per-call deadline and retries.
+
+    For stream=True only establishing the stream is retried; once chunks
+    flow, errors propagate to the caller.
+    """
+    client = get_llm_client()
+    params.setdefault("model", MODEL)
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        rate_limiter.acquire(give_up_at)
+        remaining = give_up_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"no time left for LLM call after {attempt} attempt(s)")
+        try:
+            return client.chat.completions.create(messages=messages, timeout=remaining, **params)
+        except Exception as e:
+            if attempt >= MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = retry_after(e) or backoff_delay(attempt)
+            if time.monotonic() + delay >= give_up_at:
+                raise
+            attempt += 1
+            print(f"⚠️ LLM call failed ({type(e).__name__}), retry {attempt}/{MAX_RETRIES} in {delay:.1f}s")
+            if getattr(e, "status_code", None) == 429:
+                rate_limiter.pause(delay)  # every engine backs off; acquire() does the waiting
+            else:
+                time.sleep(delay)
+
+
+def get_async_llm_client():
+    """Return the AsyncGroq client for the running event loop (one pooled client per loop)."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            api_key = _api_key()
+            import httpx
+            from groq import AsyncGroq
+
+            for old_loop in [l for l in _async_clients if l.is_closed()]:
+                del _async_clients[old_loop]
+            http_client = httpx.AsyncClient(limits=_pool_limits())
+            client = _async_clients[loop] = AsyncGroq(
+                api_key=api_key, base_url=BASE_URL, http_client=http_client, max_retries=0
+            )
+        return client
+
+
+async def async_chat_completion(messages, deadline=DEADLINE, **params):
+    """Async chat_completion: same rate limiter, deadline and retry policy, without blocking the loop.
+
+    Cancelling the awaiting task cancels the request (and any pending wait).
+    """
+    client = get_async_llm_client()
+    params.setdefault("model", MODEL)
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        wait = rate_limiter.reserve(give_up_at)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                rate_limiter.refund()
+                raise
+        remaining = give_up_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"no time left for LLM call after {attempt} attempt(s)")
+        try:
+            return await client.chat.completions.create(messages=messages, timeout=remaining, **params)
+        except Exception as e:
+            if attempt >= MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = retry_after(e) or backoff_delay(attempt)
+            if time.monotonic() + delay >= give_up_at:
+                raise
+            attempt += 1
+            print(f"⚠️ LLM call failed ({type(e).__name__}), retry {attempt}/{MAX_RETRIES} in {delay:.1f}s")
+            if getattr(e, "status_code", None) == 429:
+                rate_limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
@@ -0,0 +1,320 @@
+import ast
+import operator
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+
+# --- Settings ---
+TIMEZONE = os.getenv("TIMEZONE", "Asia/Kolkata")
+MAX_TIMER_SECONDS = 24 * 3600
+MAX_EXPONENT = 100               # bigger powers are left to the LLM
+MAX_RESULT = 1e15
+
+# Questions are answered here only when they match a pattern completely;
+# anything else (returns None) goes to the LLM as before.
+
+_LEAD_IN_RE = re.compile(
+    r"^(?:(?:hey|hi|ok|okay)\s+)?(?:please\s+)?(?:(?:can|could|would)\s+you\s+(?:please\s+)?)?"
+    r"(?:(?:tell|give|show)\s+me\s+)?")
+_TRAILER_RE = re.compile(r"(?:\s+please)?[\s?!.]*$")
+_WHATS_RE = re.compile(r"\bwhats\b")
+
+
+def normalize(query):
+    q = " ".join(query.lower().replace("’", "'").split())
+    q = _WHATS_RE.sub("what's", q)
+    q = _TRAILER_RE.sub("", q)
+    return _LEAD_IN_RE.sub("", q, count=1).strip()
+
+
+# --- Date and time (configured timezone) ---
+_TIME_RE = re.compile(
+    r"(?:what(?:'s| is) )?(?:the )?(?:current |exact )?time(?: is it)?(?: now| right now)?"
+    r"|what time is it(?: now| right now)?")
+_DATE_RE = re.compile(
+    r"(?:what(?:'s| is) )?(?:the |today's |todays )?(?:current )?date(?: today)?"
+    r"|what(?:'s| is) (?:the date )?today"
+    r"|(?:what|which) (?:day|date) is (?:it|today)(?: today)?"
+    r"|what is day today")
+_DAY_RE = re.compile(r"(?:what|which) day of the week is (?:it|today)")
+_MONTH_RE = re.compile(r"(?:what|which) month is (?:it|this)(?: now)?")
+_YEAR_RE = re.compile(r"(?:what|which) year is (?:it|this)(?: now)?")
+_DATETIME_RE = re.compile(r"(?:what(?:'s| is) )?(?:the )?(?:current )?(?:date and time|time and date)(?: now)?")
+
+
+def now():
+    import pytz
+
+    return datetime.now(pytz.timezone(TIMEZONE))
+
+
+def _date_time_answer(q):
+    if _TIME_RE.fullmatch(q):
+        return f"It's {now().strftime('%I:%M %p').lstrip('0')}."
+    if _DATE_RE.fullmatch(q) or _DAY_RE.fullmatch(q):
+        return f"Today is {now().strftime('%A, %d %B %Y')}."
+    if _DATETIME_RE.fullmatch(q):
+        return f"It's {now().strftime('%I:%M %p').lstrip('0')} on {now().strftime('%A, %d %B %Y')}."
+    if _MONTH_RE.fullmatch(q):
+        return f"It's {now().strftime('%B %Y')}."
+    if _YEAR_RE.fullmatch(q):
+        return f"It's {now().year}."
+    return None
+
+
+# --- Arithmetic (safe AST evaluation, no eval) ---
+_CALC_LEAD_RE = re.compile(r"^(?:what(?:'s| is)|calculate|compute|evaluate|solve|how much is)\s+")
+# base of a power: a number, signed when the minus starts the expression or follows an operator, or a bracket
+_BASE = r"((?:(?:^|(?<=[-+*/%(]))\s*-\s*)?[\d.]+|\([^()]*\))"
+_WORD_OPERATORS = [
+    (re.compile(r"\bsquare root of\s+([\d.]+)"), r"(\1)**0.5"),
+    (re.compile(r"\bpercent of\b|% of\b"), "/100*"),
+    (re.compile(r"\bto the power of\b|\braised to\b|\^"), "**"),
+    (re.compile(r"\bmultiplied by\b|\btimes\b|\bx\b|×"), "*"),
+    (re.compile(r"\bdivided by\b|\bover\b|÷"), "/"),
+    (re.compile(r"\bplus\b"), "+"),
+    (re.compile(r"\bminus\b"), "-"),
+    (re.compile(r"\bmod(?:ulo)?\b"), "%"),
+    # last, so a spoken "minus" is already a sign
+    (re.compile(_BASE + r"\s+squared\b"), r"(\1)**2"),   # "-5 squared" is 25, not -(5**2)
+    (re.compile(_BASE + r"\s+cubed\b"), r"(\1)**3"),
+]
+_EXPRESSION_RE = re.compile(r"[\d.\s+\-*/%()]+")
+_OPERATION_RE = re.compile(r"\d\s*(?:[-+*/%]|\*\*)\s*[\d(.]|\*\*")  # a bare number is not a calculation
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.Mod: operator.mod, ast.Pow: operator.pow, ast.USub: operator.neg, ast.UAdd: operator.pos,
+}
+
+
+def _evaluate(node):
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPERATORS:
+        return _OPERATORS[type(node.op)](_evaluate(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if isinstance(node.op, ast.Pow) and (abs(right) > MAX_EXPONENT or abs(left) > MAX_RESULT):
+            raise ValueError("power too large")
+        result = _OPERATORS[type(node.op)](left, right)
+        if isinstance(result, complex) or abs(result) > MAX_RESULT:
+            raise ValueError("result out of range")
+        return result
+    raise ValueError(f"unsupported expression: {ast.dump(node)}")
+
+
+def format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f"{value:,}" if isinstance(value, int) else f"{value:,.10g}"
+
+
+def _arithmetic_answer(q):
+    phrase = _CALC_LEAD_RE.sub("", q, count=1)
+    expression = _THOUSANDS_RE.sub("", phrase)
+    for pattern, replacement in _WORD_OPERATORS:
+        expression = pattern.sub(replacement, expression)
+    if not _EXPRESSION_RE.fullmatch(expression) or not _OPERATION_RE.search(expression):
+        return None
+    try:
+        result = _evaluate(ast.parse(expression.strip(), mode="eval"))
+    except ZeroDivisionError:
+        return "Dividing by zero is undefined."
+    except (SyntaxError, ValueError, TypeError, OverflowError):
+        return None
+    return f"{phrase} is {format_number(result)}."
+
+
+# --- Unit conversion ---
+# alias -> (dimension, factor to the base unit); temperatures are converted separately
+UNITS = {}
+
+
+def _units(dimension, factor, *aliases):
+    for alias in aliases:
+        UNITS[alias] = (dimension, factor)
+
+
+_units("length", 1e-3, "mm", "millimeter", "millimeters", "millimetre", "millimetres")
+_units("length", 1e-2, "cm", "centimeter", "centimeters", "centimetre", "centimetres")
+_units("length", 1.0, "m", "meter", "meters", "metre", "metres")
+_units("length", 1e3, "km", "kilometer", "kilometers", "kilometre", "kilometres")
+_units("length", 0.0254, "in", "inch", "inches")
+_units("length", 0.3048, "ft", "foot", "feet")
+_units("length", 0.9144, "yd", "yard", "yards")
+_units("length", 1609.344, "mi", "mile", "miles")
+_units("mass", 1e-6, "mg", "milligram", "milligrams")
+_units("mass", 1e-3, "g", "gram", "grams")
+_units("mass", 1.0, "kg", "kilo", "kilos", "kilogram", "kilograms")
+_units("mass", 0.45359237, "lb", "lbs", "pound", "pounds")
+_units("mass", 0.028349523125, "oz", "ounce", "ounces")
+_units("mass", 6.35029318, "stone", "stones")
+_units("volume", 1e-3, "ml", "milliliter", "milliliters", "millilitre", "millilitres")
+_units("volume", 1.0, "l", "liter", "liters", "litre", "litres")
+_units("volume", 3.785411784, "gallon", "gallons")
+_units("volume", 0.2365882365, "cup", "cups")
+_units("time", 1.0, "s", "sec", "secs", "second", "seconds")
+_units("time", 60.0, "min", "mins", "minute", "minutes")
+_units("time", 3600.0, "h", "hr", "hrs", "hour", "hours")
+_units("time", 86400.0, "day", "days")
+_units("time", 604800.0, "week", "weeks")
+_units("speed", 1 / 3.6, "kmh", "kph", "km/h", "kmph")
+_units("speed", 0.44704, "mph")
+_units("speed", 1.0, "m/s", "mps")
+_units("area", 1.0, "sqm", "square meter", "square meters", "square metre", "square metres")
+_units("area", 0.09290304, "sqft", "square foot", "square feet")
+_units("area", 4046.8564224, "acre", "acres")
+_units("area", 1e4, "hectare", "hectares")
+TEMPERATURES = {
+    "c": "celsius", "celsius": "celsius", "centigrade": "celsius", "degrees celsius": "celsius",
+    "f": "fahrenheit", "fahrenheit": "fahrenheit", "degrees fahrenheit": "fahrenheit",
+    "k": "kelvin", "kelvin": "kelvin",
+}
+
+_NUMBER = r"-?\d+(?:\.\d+)?|an?|one"
+_UNIT = "|".join(re.escape(u) for u in sorted({*UNITS, *TEMPERATURES}, key=len, reverse=True))
+_CONVERT_RE = re.compile(
+    rf"(?:convert |what(?:'s| is) )?(?P<n>{_NUMBER}) (?P<src>{_UNIT}) (?:to|in|into) (?P<dst>{_UNIT})")
+_HOW_MANY_RE = re.compile(
+    rf"how many (?P<dst>{_UNIT}) (?:(?:are|is) )?(?:(?:there )?in )?(?P<n>{_NUMBER}) (?P<src>{_UNIT})")
+
+
+def _to_kelvin(value, scale):
+    return {"celsius": value + 273.15, "fahrenheit": (value - 32) * 5 / 9 + 273.15, "kelvin": value}[scale]
+
+
+def _from_kelvin(value, scale):
+    return {"celsius": value - 273.15, "fahrenheit": (value - 273.15) * 9 / 5 + 32, "kelvin": value}[scale]
+
+
+def convert(value, src, dst):
+    """value in unit src expressed in unit dst, or None if they are unknown or incompatible"""
+    if src in TEMPERATURES and dst in TEMPERATURES:
+        return _from_kelvin(_to_kelvin(value, TEMPERATURES[src]), TEMPERATURES[dst])
+    if src in UNITS and dst in UNITS and UNITS[src][0] == UNITS[dst][0]:
+        return value * UNITS[src][1] / UNITS[dst][1]
+    return None
+
+
+def _conversion_answer(q):
+    q = re.sub(r"\bdegrees? (?=celsius|fahrenheit|c\b|f\b)", "", q)
+    m = _CONVERT_RE.fullmatch(q) or _HOW_MANY_RE.fullmatch(q)
+    if not m:
+        return None
+    number = m.group("n")
+    value = 1.0 if number in ("a", "an", "one") else float(number)
+    result = convert(value, m.group("src"), m.group("dst"))
+    if result is None:
+        return None
+    return f"{format_number(value)} {m.group('src')} is {format_number(round(result, 6))} {m.group('dst')}."
+
+
+# --- Timers ---
+_TIMER_RE = re.compile(r"(?:set|start|begin|create)? ?(?:a |an )?(?:timer|countdown)(?: for)? (?P<spec>.+)"
+                       r"|(?:set|start) (?:a |an )?(?P<spec2>.+?) timer")
+_DURATION_RE = re.compile(r"(?P<n>\d+(?:\.\d+)?|an?|one|two|three|four|five|ten|fifteen|twenty|thirty|half an?) "
+                          r"(?P<unit>hours?|hrs?|minutes?|mins?|seconds?|secs?)(?: and)?")
+_SMALL_NUMBERS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "ten": 10,
+                  "fifteen": 15, "twenty": 20, "thirty": 30, "half a": 0.5, "half an": 0.5}
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+_timer_callback = print
+_timers = []
+_timers_lock = threading.Lock()
+
+
+def parse_duration(spec):
+    """Seconds in a spec like '5 minutes', '1 hour and 30 minutes' or 'half an hour'; None if it is not one"""
+    spec = spec.replace("-", " ")
+    total, end = 0.0, 0
+    for m in _DURATION_RE.finditer(spec):
+        if spec[end:m.start()].strip():
+            return None
+        n = m.group("n")
+        total += float(_SMALL_NUMBERS.get(n, n)) * _UNIT_SECONDS[m.group("unit")[0]]
+        end = m.end()
+    if not end or spec[end:].strip():
+        return None
+    return total
+
+
+def describe_duration(seconds):
+    parts = []
+    for name, size in (("hour", 3600), ("minute", 60), ("second", 1)):
+        count, seconds = divmod(seconds, size)
+        if count:
+            parts.append(f"{int(count)} {name}{'s' if count != 1 else ''}")
+    return " and ".join(parts) or "0 seconds"
+
+
+def set_timer_callback(fn):
+    """fn(message) is called from a timer thread when a timer finishes (default: print)."""
+    global _timer_callback
+    _timer_callback = fn
+
+
+def start_timer(seconds, label):
+    def done():
+        with _timers_lock:
+            if timer in _timers:
+                _timers.remove(timer)
+        _timer_callback(f"⏰ Your {label} timer is done.")
+
+    timer = threading.Timer(seconds, done)
+    timer.daemon = True
+    with _timers_lock:
+        _timers.append(timer)
+    timer.start()
+    return timer
+
+
+def cancel_timers():
+    with _timers_lock:
+        timers, _timers[:] = list(_timers), []
+    for timer in timers:
+        timer.cancel()
+
+
+def _timer_answer(q):
+    m = _TIMER_RE.fullmatch(q)
+    if not m:
+        return None
+    seconds = parse_duration(m.group("spec") or m.group("spec2"))
+    if not seconds or seconds > MAX_TIMER_SECONDS:
+        return None
+    label = describe_duration(round(seconds))
+    start_timer(seconds, label)
+    return f"Timer set for {label}."
+
+
+# --- Entry point ---
+HANDLERS = (_date_time_answer, _timer_answer, _conversion_answer, _arithmetic_answer)
+
+
+def answer_locally(query):
+    """Answer without the LLM if query is a date/time, timer, conversion or arithmetic question; else None."""
+    q = normalize(query)
+    if not q or len(q) > 120:
+        return None
+    for handler in HANDLERS:
+        answer = handler(q)
+        if answer is not None:
+            return answer
+    return None
+
+
+if __name__ == "__main__":
+    while True:
+        prompt = input("You: ").strip()
+        if prompt.lower() in ("exit", "quit", "bye"):
+            break
+        start = time.perf_counter()
+        answer = answer_locally(prompt)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"{answer or '(not answered locally)'}  [{elapsed:.0f} µs]")
@@ -18,60 +18,153 @@ REALTIME_KEYWORDS = [
 ]
 DATE_TIME_KEYWORDS = ["date", "time", "day", "month", "year"]
 
-# --- Main rule-based classifier ---
-def classify_query(query: str) -> str:
-    q = query.lower().strip()
-    q_nopunct = re.sub(r"[^\w\s]", "", q)
+# --- Compiled matchers (built once at import) ---
+def _keyword_pattern(keywords):
+    """One alternation matching any word that starts with a keyword.
+
+    Only the start is anchored, so inflections still match ("currently",
+    "updated", "covid19" once the hyphen is stripped) while a keyword inside
+    a word does not ("now" in "know", "game" in "endgame"). A digit before
+    the keyword is not a word start to skip ("2024-results" -> "2024results").
+    Keywords are matched against punctuation-stripped text, so they are
+    stripped the same way; the longest alternatives are tried first.
+    """
+    stripped = {re.sub(r"[^\w\s]", "", k) for k in keywords}
+    alternation = "|".join(re.escape(k) for k in sorted(stripped, key=len, reverse=True))
+    return re.compile(rf"(?<![^\W\d_])(?:{alternation})")
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_REALTIME_RE = _keyword_pattern(REALTIME_KEYWORDS)
+_DATE_TIME_RE = _keyword_pattern(DATE_TIME_KEYWORDS)
+_REMIND_RE = re.compile(r"\bremind")
+_REMINDER_ARG_RE = re.compile(r'remind(?:er)?(?: me)?(?: on| at)?\s*(.*)', re.IGNORECASE)
+_ITEM_SPLIT_RE = re.compile(r"\s*,\s*|\s+and\s+", re.I)
+_ENTITY_RES = [re.compile(r"^(who|what) is ([^?]+)\??$"), re.compile(r"^(tell me about|information about) ([^?]+)\??$")]
+_SEARCH_PREFIXES = [("google ", "google search", 7), ("search google for ", "google search", 17),
+                    ("youtube ", "youtube search", 8), ("search youtube for ", "youtube search", 18)]
+_MULTI_ACTIONS = ["open", "close", "play", "system"]
 
+# --- Main rule-based classifier ---
+def _command_decisions(query, q_nopunct):
     # Exit phrases
-    if any(phrase in q_nopunct.split() for phrase in EXIT_PHRASES):
-        return "exit"
+    if not EXIT_PHRASES.isdisjoint(q_nopunct.split()):
+        return [("exit", "")]
 
     # Google/Youtube searches
-    if q_nopunct.startswith("google "):
-        return f'google search {query[7:].strip()}'
-    if q_nopunct.startswith("search google for "):
-        return f'google search {query[17:].strip()}'
-    if q_nopunct.startswith("youtube "):
-        return f'youtube search {query[8:].strip()}'
-    if q_nopunct.startswith("search youtube for "):
-        return f'youtube search {query[18:].strip()}'
+    for prefix, category, cut in _SEARCH_PREFIXES:
+        if q_nopunct.startswith(prefix):
+            return [(category, query[cut:].strip())]
 
     # Multi-action open, close, play, system
-    for act in ["open", "close", "play", "system"]:
+    for act in _MULTI_ACTIONS:
         if q_nopunct.startswith(act + " "):
-            items = re.split(r"\s*,\s*|\s+and\s+", query[len(act):].strip())
-            actions = [f"{act} {item.strip()}" for item in items if item.strip()]
-            return ", ".join(actions)
+            items = _ITEM_SPLIT_RE.split(query[len(act):].strip())
+            return [(act, item.strip()) for item in items if item.strip()]
 
-    # Reminders
-    if "remind" in q_nopunct or "reminder" in q_nopunct:
-        m = re.search(r'remind(?:er)?(?: me)?(?: on| at)?\s*(.*)', query, re.IGNORECASE)
+    # Reminders ("remind", "reminder", "reminders", ...)
+    if _REMIND_RE.search(q_nopunct):
+        m = _REMINDER_ARG_RE.search(query)
         arg = m.group(1).strip() if m and m.group(1).strip() else query
-        return f'reminder {arg}'
+        return [("reminder", arg)]
+    return None
+
+def command_decisions(query: str):
+    """Decisions for an explicit command (exit, search, open/close/play/system, reminder), else None."""
+    return _command_decisions(query, _PUNCT_RE.sub("", query.lower().strip()))
 
+def classify_decisions(query: str) -> list:
+    """Routing decisions for query as (category, argument) pairs."""
+    q = query.lower().strip()
+    q_nopunct = _PUNCT_RE.sub("", q)
 
-    # Realtime for certain keywords/entities
-    if any(word in q_nopunct for word in REALTIME_KEYWORDS):
-        return f'realtime {query}'
-    entity_patterns = [r"^(who|what) is ([^?]+)\??$", r"^(tell me about|information about) ([^?]+)\??$"]
-    for pat in entity_patterns:
-        m = re.match(pat, q_nopunct)
+    decisions = _command_decisions(query, q_nopunct)
+    if decisions is not None:
+        return decisions
+
+    # Realtime for certain keywords/entities (whole words: "now" does not match "know")
+    if _REALTIME_RE.search(q_nopunct):
+        return [("realtime", query)]
+    for pat in _ENTITY_RES:
+        m = pat.match(q_nopunct)
         if m:
             subject = m.group(2).strip()
             if len(subject.split()) > 1 or any(w[0].isupper() for w in subject.split() if w):
-                return f'realtime {query}'
-            return f'general {query}'
+                return [("realtime", query)]
+            return [("general", query)]
     # Date/Time questions
-    if any(word in q_nopunct for word in DATE_TIME_KEYWORDS):
-        return f'general {query}'
+    if _DATE_TIME_RE.search(q_nopunct):
+        return [("general", query)]
     # Fallback
-    return f'general {query}'
+    return [("general", query)]
+
+def format_decision(decision):
+    """'category argument' action string, as handle_action expects it"""
+    category, argument = decision
+    return category if category == "exit" else f"{category} {argument}"
+
+def classify_query(query: str) -> str:
+    return ", ".join(format_decision(d) for d in classify_decisions(query))
 
 def FirstLayerDMM(query):
-    """Returns a list of decisions for the given query using classify_query."""
-    result = classify_query(query)
-    return [r.strip() for r in result.split(',')] if isinstance(result, str) else list(result)
+    """Returns a list of decisions for the given query using classify_query.
+
+    Built from the structured decisions, so a comma inside a question
+    ("weather in Paris, France") no longer splits it into two actions. When a
+    trained intent model exists (see IntentClassifier.py) it routes the
+    non-command queries it is confident about; the rules handle the rest.
+    """
+    from IntentClassifier import get_intent_classifier
+
+    classifier = get_intent_classifier()
+    decisions = classifier.decide(query) if classifier is not None else classify_decisions(query)
+    return [format_decision(d).strip() for d in decisions]
+
+# --- Batch classification (query-log replay, analytics, regression checks) ---
+BATCH_MEMO = 100_000             # distinct queries remembered per batch (logs repeat a lot)
+BATCH_CHUNK = 2_000              # queries per process-pool task
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _classify_chunk(queries):
+    return list(classify_batch(queries))
+
+def classify_batch(queries, processes=None, chunksize=BATCH_CHUNK, memo=True):
+    """Yield the rule decisions for each query of an iterable or stream, in input order.
+
+    Each item is a tuple of (category, argument) pairs. Lines read from a
+    file lose their newline, and repeated queries are classified once
+    (memo=False classifies every line). With processes > 1 chunks are
+    classified in a process pool, which only pays off for very large logs
+    (call it under `if __name__ == "__main__":`).
+    """
+    queries = (q.rstrip("\r\n") for q in queries)
+    if processes and processes > 1:
+        from multiprocessing import Pool
+
+        with Pool(processes) as pool:
+            for decisions in pool.imap(_classify_chunk, _chunks(queries, chunksize)):
+                yield from decisions
+        return
+    if not memo:
+        for query in queries:
+            yield tuple(classify_decisions(query))
+        return
+    seen = {}
+    for query in queries:
+        decisions = seen.get(query)
+        if decisions is None:
+            if len(seen) >= BATCH_MEMO:
+                seen.clear()
+            decisions = seen[query] = tuple(classify_decisions(query))
+        yield decisions
 
 if __name__ == "__main__":
     print("Type your query. Type 'exit' to quit.")
@@ -79,5 +172,5 @@ if __name__ == "__main__":
         user_input = input(">>> ").strip()
         decisions = FirstLayerDMM(user_input)
         print(decisions)
-        if decisions[0] == "exit":
+        if decisions and decisions[0] == "exit":
             break
@@ -0,0 +1,274 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+
+from ContextWindow import estimate_tokens
+from ResultCompressor import is_near_duplicate, query_terms, shingles, words
+
+
+# --- Settings ---
+TOP_K = 3                        # result pages fetched per query
+DEADLINE = float(os.getenv("ENRICH_DEADLINE", 2.0))    # max latency the stage may add
+PAGE_TIMEOUT = 1.5               # seconds one page may take, connect to last byte
+MAX_PAGE_BYTES = 512 * 1024      # stop reading a page after this much HTML
+TOKEN_BUDGET = int(os.getenv("ENRICH_TOKEN_BUDGET", 600))
+MIN_PASSAGE_CHARS = 60           # shorter blocks are menus, captions and buttons
+MAX_LINK_DENSITY = 0.5           # blocks that are mostly link text are navigation
+MAX_PASSAGE_CHARS = 600
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+# --- Readability-style text extraction ---
+class _MainTextParser(HTMLParser):
+    """Collect text blocks (paragraphs, list items, headings, cells) outside page chrome"""
+
+    SKIP = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "button", "select", "iframe"}
+    BLOCKS = {"p", "li", "h1", "h2", "h3", "h4", "td", "th", "blockquote", "pre", "dd", "article", "section", "div"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._skip = 0
+        self._in_link = 0
+        self._text = []
+        self._link_chars = 0
+
+    def _flush(self):
+        text = " ".join("".join(self._text).split())
+        if len(text) >= MIN_PASSAGE_CHARS and self._link_chars / len(text) <= MAX_LINK_DENSITY:
+            self.blocks.append(text[:MAX_PASSAGE_CHARS])
+        self._text = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skip += 1
+        elif tag == "a":
+            self._in_link += 1
+        elif tag in self.BLOCKS or tag == "br":
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "a":
+            self._in_link = max(0, self._in_link - 1)
+        elif tag in self.BLOCKS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self._text.append(data)
+        if self._in_link:
+            self._link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_main_text(content):
+    """Readable passages of an HTML page, in page order"""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    parser = _MainTextParser()
+    parser.feed(content)
+    parser.close()
+    return parser.blocks
+
+
+def pack_passages(query, pages, budget=TOKEN_BUDGET):
+    """Pick the passages sharing most words with the query until the token budget is used.
+
+    pages: [(title, [passage, ...])]. Ties keep page rank and page order; a
+    passage that nearly repeats one already chosen (syndicated copy) is skipped.
+    """
+    terms = query_terms(query)
+    candidates = []
+    for page_rank, (title, passages) in enumerate(pages):
+        for position, passage in enumerate(passages):
+            overlap = len(terms & set(words(passage)))
+            if overlap or not terms:
+                candidates.append((-overlap, page_rank, position, title, passage))
+    candidates.sort()
+
+    used, chosen, kept_shingles = 0, [], []
+    for _, page_rank, position, title, passage in candidates:
+        cost = estimate_tokens(passage)
+        if used + cost > budget:
+            continue
+        shingle_set = shingles(passage)
+        if is_near_duplicate(shingle_set, kept_shingles):
+            continue
+        kept_shingles.append(shingle_set)
+        used += cost
+        chosen.append((page_rank, position, title, passage))
+    chosen.sort()  # present in reading order
+
+    lines, last_title = [], None
+    for _, _, title, passage in chosen:
+        if title != last_title:
+            lines.append(f"[{title}]")
+            last_title = title
+        lines.append(passage)
+    return "\n".join(lines)
+
+
+class PageEnricher:
+    """Fetch the top result pages concurrently and pack their most relevant passages.
+
+    Every page is capped in bytes and time, and the stage as a whole never
+    waits longer than `deadline`: pages still loading are ignored.
+    """
+
+    def __init__(self, top_k=TOP_K, deadline=DEADLINE, page_timeout=PAGE_TIMEOUT, max_page_bytes=MAX_PAGE_BYTES,
+                 budget=TOKEN_BUDGET):
+        self.top_k = top_k
+        self.deadline = deadline
+        self.page_timeout = min(page_timeout, deadline)
+        self.max_page_bytes = max_page_bytes
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._pool = None
+        self._session = None
+        self._async_clients = {}  # event loop -> httpx.AsyncClient
+        self._stats = {"pages": 0, "failed": 0, "late": 0, "truncated": 0}
+
+    def _targets(self, results):
+        return [r for r in (results or []) if r.get('link', '').startswith(("http://", "https://"))][:self.top_k]
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _extract(self, result, body, truncated):
+        self._count("pages")
+        if truncated:
+            self._count("truncated")
+        return result['title'], extract_main_text(bytes(body))
+
+    # --- blocking ---
+    def _fetch(self, result):
+        give_up_at = time.monotonic() + self.page_timeout
+        with self._session.get(result['link'], timeout=self.page_timeout, stream=True) as resp:
+            resp.raise_for_status()
+            if "html" not in resp.headers.get("Content-Type", "html"):
+                return result['title'], []
+            body = bytearray()
+            for chunk in resp.iter_content(16 * 1024):
+                body += chunk
+                if len(body) >= self.max_page_bytes:
+                    return self._extract(result, body[:self.max_page_bytes], True)
+                if time.monotonic() > give_up_at:
+                    raise TimeoutError("page took longer than the per-page cap")
+        return self._extract(result, body, False)
+
+    def enrich(self, query, results):
+        """Relevant page text for query within the token budget ('' if nothing arrived in time)"""
+        targets = self._targets(results)
+        if not targets:
+            return ""
+        with self._lock:
+            if self._pool is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                self._session.headers["User-Agent"] = USER_AGENT
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.top_k * 4)
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+                self._pool = ThreadPoolExecutor(max_workers=self.top_k * 2, thread_name_prefix="enrich")
+        futures = [self._pool.submit(self._fetch, r) for r in targets]
+        done, late = wait(futures, timeout=self.deadline)
+        self._count("late", len(late))
+        pages = []
+        for future in futures:  # keep result rank order
+            if future in done:
+                try:
+                    pages.append(future.result())
+                except Exception:
+                    self._count("failed")
+        return pack_passages(query, pages, self.budget)
+
+    # --- async ---
+    def _async_client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for old_loop in [l for l in self._async_clients if l.is_closed()]:
+                    del self._async_clients[old_loop]
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    headers={"User-Agent": USER_AGENT}, timeout=self.page_timeout, follow_redirects=True,
+                    limits=httpx.Limits(max_connections=self.top_k * 4))
+            return client
+
+    async def _download_async(self, client, url):
+        """(body, truncated), or (None, False) for a non-HTML response"""
+        async with client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            if "html" not in resp.headers.get("Content-Type", "html"):
+                return None, False
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) >= self.max_page_bytes:
+                    return body[:self.max_page_bytes], True
+        return body, False
+
+    async def _fetch_async(self, client, result):
+        body, truncated = await asyncio.wait_for(self._download_async(client, result['link']), self.page_timeout)
+        if body is None:
+            return result['title'], []
+        return await asyncio.to_thread(self._extract, result, body, truncated)
+
+    async def enrich_async(self, query, results):
+        targets = self._targets(results)
+        if not targets:
+            return ""
+        client = self._async_client()
+        tasks = [asyncio.ensure_future(self._fetch_async(client, r)) for r in targets]
+        done, late = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in late:
+            task.cancel()
+        self._count("late", len(late))
+        pages = []
+        for task in tasks:
+            if task in done:
+                try:
+                    pages.append(task.result())
+                except Exception:
+                    self._count("failed")
+        return pack_passages(query, pages, self.budget)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+# --- Shared enricher (opt-in) ---
+_enricher = None
+_enricher_lock = threading.Lock()
+
+
+def enable_page_enricher(**settings):
+    global _enricher
+    with _enricher_lock:
+        _enricher = PageEnricher(**settings)
+        return _enricher
+
+
+def get_page_enricher():
+    """Return the shared enricher, or None unless SEARCH_ENRICH=1 or enable_page_enricher() was called."""
+    global _enricher
+    with _enricher_lock:
+        if _enricher is None and os.getenv("SEARCH_ENRICH", "").lower() in ("1", "true", "yes"):
+            _enricher = PageEnricher()
+        return _enricher
@@ -0,0 +1,249 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+
+from LLMClient import TokenBucket
+from ResponseCache import normalize_query
+
+
+# --- Settings ---
+QUERY_LOG_PATH = os.path.join("Data", "QueryLog.jsonl")
+QUERY_LOG_MAX = 5000             # entries kept when the log is compacted
+TOP_N = 5                        # queries kept warm
+MIN_COUNT = 3                    # a query must have been asked this often
+WINDOW_MINUTES = 60              # "same time of day" means within this many minutes
+HALF_LIFE_DAYS = 14              # older habits count less
+LEAD_SECONDS = 10 * 60           # refresh when the cached results expire within this time
+CHECK_INTERVAL = 5 * 60          # seconds between planning rounds
+IDLE_BEFORE_PREFETCH = 90        # seconds without user activity before any prefetch runs
+FETCHES_PER_HOUR = 20            # network budget
+CPU_SHARE = 0.05                 # prefetch may use at most this fraction of one core
+
+
+# --- Query log (the chat log has no timestamps) ---
+class QueryLog:
+    """Append-only JSON lines of {"ts", "route", "query"} for realtime questions."""
+
+    def __init__(self, path=QUERY_LOG_PATH, max_entries=QUERY_LOG_MAX):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._lines = None  # counted lazily on the first append
+
+    def record(self, query, route="realtime", ts=None):
+        line = json.dumps({"ts": ts or time.time(), "route": route, "query": query}, ensure_ascii=False)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if self._lines is None:
+                self._lines = len(self._read())
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._lines += 1
+            if self._lines > 2 * self.max_entries:
+                self._compact()
+
+    def _read(self):
+        entries = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn last line after a crash
+        except OSError:
+            pass
+        return entries
+
+    def _compact(self):
+        entries = self._read()[-self.max_entries:]
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+        os.replace(tmp, self.path)
+        self._lines = len(entries)
+
+    def load(self):
+        with self._lock:
+            return self._read()
+
+
+def minute_of_day(ts):
+    t = time.localtime(ts)
+    return t.tm_hour * 60 + t.tm_min
+
+
+def frequent_queries(entries, now=None, top_n=TOP_N, min_count=MIN_COUNT, window=WINDOW_MINUTES,
+                     half_life_days=HALF_LIFE_DAYS, route="realtime"):
+    """[(query, score)] of queries usually asked around this time of day, best first.
+
+    Each past ask within `window` minutes of the current time of day counts
+    for 0.5 ** (age / half-life); queries asked fewer than min_count times
+    overall are ignored.
+    """
+    now = now or time.time()
+    current = minute_of_day(now)
+    scores, counts, latest = defaultdict(float), defaultdict(int), {}
+    for entry in entries:
+        if entry.get("route") != route or not entry.get("query"):
+            continue
+        key = normalize_query(entry["query"])
+        counts[key] += 1
+        latest[key] = entry["query"]
+        gap = abs(minute_of_day(entry["ts"]) - current)
+        if min(gap, 24 * 60 - gap) <= window:
+            age_days = max(0.0, now - entry["ts"]) / 86400
+            scores[key] += math.pow(0.5, age_days / half_life_days)
+    ranked = sorted(((latest[k], s) for k, s in scores.items() if counts[k] >= min_count), key=lambda x: -x[1])
+    return ranked[:top_n]
+
+
+class Prefetcher:
+    """Keeps the search cache warm for the realtime questions the user usually asks now.
+
+    Runs on a daemon thread, only while the user has been idle for
+    IDLE_BEFORE_PREFETCH seconds, within a fetch-rate budget and a CPU share.
+    CPU is measured for the whole process: the search itself runs on the
+    aggregator's worker threads, and the rest of the app is quiet while the
+    user is idle.
+    """
+
+    def __init__(self, fetch, cache, log, top_n=TOP_N, interval=CHECK_INTERVAL, idle_before=IDLE_BEFORE_PREFETCH,
+                 fetches_per_hour=FETCHES_PER_HOUR, cpu_share=CPU_SHARE, lead=LEAD_SECONDS):
+        self.fetch = fetch
+        self.cache = cache
+        self.log = log
+        self.top_n = top_n
+        self.interval = interval
+        self.idle_before = idle_before
+        self.cpu_share = cpu_share
+        self.lead = lead
+        self.budget = TokenBucket(fetches_per_hour / 3600.0, max(1, top_n))
+        self._last_activity = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"rounds": 0, "prefetched": 0, "skipped_fresh": 0, "paused": 0, "over_budget": 0, "failed": 0}
+
+    def note_activity(self):
+        """Call on every user interaction; prefetching pauses until the user is idle again."""
+        self._last_activity = time.monotonic()
+
+    def idle_for(self):
+        return time.monotonic() - self._last_activity
+
+    def _wait_until_idle(self):
+        while not self._stop.is_set():
+            remaining = self.idle_before - self.idle_for()
+            if remaining <= 0:
+                return True
+            self.stats["paused"] += 1
+            self._stop.wait(remaining)
+        return False
+
+    def _throttle_cpu(self, cpu_used, wall_used):
+        """Sleep long enough that cpu_used stays within cpu_share of the elapsed time."""
+        pause = cpu_used / self.cpu_share - wall_used
+        if pause > 0:
+            self._stop.wait(pause)
+
+    def run_once(self, now=None):
+        """One planning round; returns the queries that were refreshed."""
+        self.stats["rounds"] += 1
+        refreshed = []
+        for query, _ in frequent_queries(self.log.load(), now=now, top_n=self.top_n):
+            expires_in = self.cache.expires_in(query)
+            if expires_in is not None and expires_in > self.lead:
+                self.stats["skipped_fresh"] += 1
+                continue
+            if not self._wait_until_idle():
+                break
+            if not self.budget.try_acquire():
+                self.stats["over_budget"] += 1
+                break
+            cpu_start, wall_start = time.process_time(), time.monotonic()
+            try:
+                results = self.fetch(query)
+                if results:
+                    self.cache.store(query, results)
+                    refreshed.append(query)
+                    self.stats["prefetched"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"⚠️ Prefetch of '{query}' failed: {e}")
+            self._throttle_cpu(time.process_time() - cpu_start, time.monotonic() - wall_start)
+            if self.idle_for() < self.idle_before:
+                # The user came back during that fetch: leave the rest of the round for a later one
+                self.stats["paused"] += 1
+                break
+        return refreshed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Prefetch round failed: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="Prefetcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+# --- Shared instances ---
+_query_log = None
+_prefetcher = None
+_lock = threading.Lock()
+
+
+def get_query_log():
+    global _query_log
+    with _lock:
+        if _query_log is None:
+            _query_log = QueryLog()
+        return _query_log
+
+
+def record_query(query, route="realtime"):
+    """Log a routed query for time-of-day mining."""
+    try:
+        get_query_log().record(query, route)
+    except OSError as e:
+        print(f"⚠️ Could not record query: {e}")
+
+
+def note_activity():
+    """Mark the user as active so a running prefetcher backs off."""
+    if _prefetcher is not None:
+        _prefetcher.note_activity()
+
+
+def start_prefetcher():
+    """Start the background prefetcher if PREFETCH=1 (and the search cache is enabled)."""
+    global _prefetcher
+    if os.getenv("PREFETCH", "").lower() not in ("1", "true", "yes"):
+        return None
+    from RealtimeSearchEngine import fetch_search_results
+    from SearchCache import get_search_cache
+
+    cache = get_search_cache()
+    if cache is None:
+        return None
+    log = get_query_log()
+    with _lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(fetch_search_results, cache, log).start()
+            print("✅ Realtime prefetcher started")
+        return _prefetcher
+
+
+def stop_prefetcher():
+    if _prefetcher is not None:
+        _prefetcher.stop()
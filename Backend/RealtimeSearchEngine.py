@@ -1,27 +1,21 @@
-from groq import Groq
-from json import load, dump
+from ChatLog import get_conversation_store
+from ContextWindow import build_context, describe
+from Summarizer import get_summarizer
+from LLMClient import chat_completion, async_chat_completion
+from SearchCache import get_search_cache
+from SearchAggregator import get_search_aggregator
+from PageEnricher import get_page_enricher
+from ResultCompressor import get_result_compressor, describe_savings
+from Streaming import INTERRUPTED_NOTICE, StreamCleaner, completion_deltas, async_completion_deltas
 import os
 import datetime
 from dotenv import dotenv_values
-import requests
-from bs4 import BeautifulSoup
-import urllib.parse
-import pytz
 
 # --- Load .env variables ---
 env_path = os.path.join(os.path.dirname(__file__), ".env")
 env_vars = dotenv_values(env_path)
 Username = env_vars.get("Username", "User")
 Assistantname = env_vars.get("Assistantname", "Assistant")
-GroqAPIKey = env_vars.get("GroqAPIKey")
-
-if not GroqAPIKey:
-    print("Error: GroqAPIKey not found in .env file")
-    exit(1)
-
-# --- Groq client ---
-client = Groq(api_key=GroqAPIKey)
-MODEL = "llama-3.1-8b-instant"
 
 # --- System prompt ---
 System = f"""You are {Assistantname}, an AI assistant with real-time information access.
@@ -32,97 +26,199 @@ System = f"""You are {Assistantname}, an AI assistant with real-time information
 
 # --- Chat history helpers ---
 def load_chat_history():
-    os.makedirs("Data", exist_ok=True)
-    path = "Data/ChatLog.json"
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            dump([], f)
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return load(f)
-
-def save_chat_history(messages):
-    with open("Data/ChatLog.json", "w", encoding="utf-8") as f:
-        dump(messages, f, indent=4)
-
-# --- Google search scraper (top 3 results) ---
-def GoogleSearch(query):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    url = f"https://www.google.com/search?q={urllib.parse.quote_plus(query)}"
+    return get_conversation_store().snapshot()
+
+def append_chat_history(*new_messages):
+    get_conversation_store().append_turn(*new_messages)
+
+# --- Web search (Google, DuckDuckGo and Wikipedia in parallel, top 3 results) ---
+NO_RESULTS = "No recent search results found. Using general knowledge."
+SEARCH_UNAVAILABLE = "No search results are available at this time."
+
+def format_search_results(results):
+    if not results:
+        return NO_RESULTS
+    formatted = "Latest Search Results:\n\n"
+    for idx, r in enumerate(results, 1):
+        formatted += f"{idx}. {r['title']}\n   {r['description']}\n"
+    return formatted
+
+def fetch_search_results(query):
+    return get_search_aggregator().search(query)
+
+def search_results(query):
+    """Result dicts for query, served from the shared search cache when possible; None if search failed"""
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, 'html.parser')
-        results = []
-        for g in soup.find_all('div', class_='g'):
-            title_elem = g.find('h3')
-            link_elem = g.find('a')
-            desc_elem = g.find('div', class_=['VwiC3b', 'yDYNvb'])
-            if title_elem and link_elem:
-                title = title_elem.get_text()
-                link = link_elem.get('href', '')
-                desc = desc_elem.get_text() if desc_elem else ''
-                results.append({'title': title, 'link': link, 'description': desc[:200] + '...' if len(desc) > 200 else desc})
-            if len(results) >= 3:
-                break
-        if results:
-            formatted = "Latest Search Results:\n\n"
-            for idx, r in enumerate(results, 1):
-                formatted += f"{idx}. {r['title']}\n   {r['description']}\n"
-            return formatted
-        return "No recent search results found. Using general knowledge."
+        cache = get_search_cache()
+        if cache is None:
+            return fetch_search_results(query)
+        return cache.get_or_fetch(query, fetch_search_results)
     except Exception:
-        return "No search results are available at this time."
+        return None
+
+async def search_results_async(query):
+    """search_results over async HTTP, so many searches can share one event loop"""
+    try:
+        cache = get_search_cache()
+        if cache is not None:
+            results, stale = cache.lookup(query)
+            if results is not None:
+                if stale:
+                    cache.refresh_in_background(query, fetch_search_results)
+                return results
+        results = await get_search_aggregator().search_async(query)
+        if cache is not None and results:
+            cache.store(query, results)
+        return results
+    except Exception:
+        return None
+
+def describe_search_results(results):
+    return SEARCH_UNAVAILABLE if results is None else format_search_results(results)
+
+def GoogleSearch(query):
+    return describe_search_results(search_results(query))
+
+async def GoogleSearchAsync(query):
+    return describe_search_results(await search_results_async(query))
+
+def search_context(query, results):
+    """Search results message for the prompt: deduplicated, ranked and trimmed unless SEARCH_COMPRESS=0"""
+    compressor = get_result_compressor()
+    if compressor is None or not results:
+        return describe_search_results(results)
+    text, report = compressor.compress(query, results)
+    print(f"✂️ {describe_savings(report)}")
+    return text
 
 # --- Date/time info (IST) ---
 def get_realtime_info():
+    import pytz
     tz = pytz.timezone("Asia/Kolkata")
     now = datetime.datetime.now(tz)
     return f"{now.strftime('%d %B %Y')}\n{now.strftime('%H:%M:%S IST')}"
 
 # --- Remove empty and debug lines from LLM output ---
+DEBUG_PREFIXES = (
+    'err:', '[', 'warning:', 'api request failed', 'image not found',
+    'successfully generated', 'no images', 'failed to generate',
+    'error:'
+)
+
 def clean_response(answer):
     lines = [
         line for line in answer.split('\n')
-        if line.strip() and not any(
-            line.lower().startswith(x) for x in (
-                'err:', '[', 'warning:', 'api request failed', 'image not found',
-                'successfully generated', 'no images', 'failed to generate',
-                'error:'
-            )
-        )
+        if line.strip() and not any(line.lower().startswith(x) for x in DEBUG_PREFIXES)
     ]
     return '\n'.join(lines)
 
 # --- End-to-end real-time answering ---
-def RealtimeSearchEngine(prompt):
-    messages = load_chat_history()
-    messages.append({"role": "user", "content": prompt})
-    search_results = GoogleSearch(prompt)
-    realtime_info = get_realtime_info()
-    all_messages = [
+COMPLETION_PARAMS = dict(temperature=0.7, max_tokens=1024, top_p=1, stream=True)
+EMPTY_ANSWER = "I apologize, but I couldn't generate a response. Please try again."
+FAILED_ANSWER = "I'm experiencing technical difficulties. Please try again later."
+
+def build_messages(user_message, search_text, page_extracts=""):
+    """System prompt, clock, search results, page extracts, conversation summary and recent turns within budget"""
+    history = load_chat_history()
+    system_messages = [
         {"role": "system", "content": System},
-        {"role": "system", "content": realtime_info},
-        {"role": "system", "content": search_results},
-        *messages
+        {"role": "system", "content": get_realtime_info()},
+        {"role": "system", "content": search_text},
     ]
+    if page_extracts:
+        system_messages.append({"role": "system", "content": f"Extracts from the top result pages:\n{page_extracts}"})
+    summary_messages, history = get_summarizer().context_for(history)
+    all_messages, report = build_context(system_messages + summary_messages, history, user_message)
+    if report["dropped_messages"]:
+        print(f"✂️ {describe(report)}")
+    return all_messages
+
+class RealtimeTurn:
+    """State of one realtime answer, shared by the sync and async streaming APIs"""
+
+    def __init__(self, prompt):
+        self.user_message = {"role": "user", "content": prompt}
+        self.answer = ""
+        self._cleaner = StreamCleaner(DEBUG_PREFIXES)
+
+    def feed(self, delta):
+        """Cleaned text to show for a delta: debug lines are dropped as soon as they are recognized"""
+        self.answer += delta
+        return self._cleaner.feed(delta)
+
+    def close(self):
+        return self._cleaner.close()
+
+    def finish(self, interrupted=False):
+        """Store the turn once the stream has ended; returns text still to show (fallback or notice)"""
+        extra = ""
+        if not self.answer:
+            self.answer = extra = EMPTY_ANSWER
+        elif interrupted:
+            self.answer += INTERRUPTED_NOTICE
+            extra = INTERRUPTED_NOTICE
+        append_chat_history(self.user_message, {"role": "assistant", "content": self.answer})
+        return extra
+
+def RealtimeSearchEngineStream(prompt):
+    """Search, then yield the cleaned answer as text deltas (same interface as ChatBotStream)"""
+    turn = RealtimeTurn(prompt)
+    results = search_results(prompt)
+    enricher = get_page_enricher()
+    page_extracts = enricher.enrich(prompt, results) if enricher is not None else ""
+    all_messages = build_messages(turn.user_message, search_context(prompt, results), page_extracts)
     try:
-        completion = client.chat.completions.create(
-            model=MODEL,
-            messages=all_messages,
-            temperature=0.7,
-            max_tokens=1024,
-            top_p=1,
-            stream=False
-        )
-        answer = completion.choices[0].message.content or "I apologize, but I couldn't generate a response. Please try again."
-        messages.append({"role": "assistant", "content": answer})
-        save_chat_history(messages)
-        return clean_response(answer)
+        completion = chat_completion(messages=all_messages, **COMPLETION_PARAMS)
+        for delta in completion_deltas(completion):
+            visible = turn.feed(delta)
+            if visible:
+                yield visible
+        tail = turn.close()
+        if tail:
+            yield tail
     except Exception as e:
-        return "I'm experiencing technical difficulties. Please try again later."
+        if not turn.answer:
+            yield FAILED_ANSWER
+        else:
+            yield turn.close() + turn.finish(interrupted=True)
+        return
+
+    fallback = turn.finish()
+    if fallback:
+        yield fallback
+
+def RealtimeSearchEngine(prompt):
+    return "".join(RealtimeSearchEngineStream(prompt))
+
+async def RealtimeSearchEngineStreamAsync(prompt):
+    """Async RealtimeSearchEngineStream; cancelling the task aborts the search or LLM call unsaved"""
+    turn = RealtimeTurn(prompt)
+    results = await search_results_async(prompt)
+    enricher = get_page_enricher()
+    page_extracts = await enricher.enrich_async(prompt, results) if enricher is not None else ""
+    all_messages = build_messages(turn.user_message, search_context(prompt, results), page_extracts)
+    try:
+        completion = await async_chat_completion(messages=all_messages, **COMPLETION_PARAMS)
+        async for delta in async_completion_deltas(completion):
+            visible = turn.feed(delta)
+            if visible:
+                yield visible
+        tail = turn.close()
+        if tail:
+            yield tail
+    except Exception as e:
+        if not turn.answer:
+            yield FAILED_ANSWER
+        else:
+            yield turn.close() + turn.finish(interrupted=True)
+        return
+
+    fallback = turn.finish()
+    if fallback:
+        yield fallback
+
+async def RealtimeSearchEngineAsync(prompt):
+    return "".join([delta async for delta in RealtimeSearchEngineStreamAsync(prompt)])
 
 if __name__ == "__main__":
     while True:
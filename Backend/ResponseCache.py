@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from Model import DATE_TIME_KEYWORDS, _keyword_pattern
+
+
+# --- Settings ---
+MAX_ENTRIES = 256            # in-memory LRU size
+MAX_DISK_ENTRIES = 5000      # on-disk tier size
+TTL = 6 * 60 * 60            # seconds an answer stays valid
+DISK_PATH = os.path.join("Data", "ResponseCache.sqlite3")
+FRESH_WORDS = ("today", "tonight", "tomorrow", "yesterday", "now", "current", "currently", "latest")
+
+_FRESH_RE = _keyword_pattern([*DATE_TIME_KEYWORDS, *FRESH_WORDS])  # word starts: "know" is not "now"
+
+
+def normalize_query(query):
+    """Lower-case, drop punctuation and collapse whitespace: 'Hello!! ' -> 'hello'."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+def needs_fresh_context(query):
+    """Answers that depend on the clock must never be replayed."""
+    return _FRESH_RE.search(normalize_query(query)) is not None
+
+
+def context_hash(messages):
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LRU + TTL cache of final answers, with an optional SQLite tier on disk.
+
+    Keys combine the normalized query with a hash of the context the answer
+    depends on (the prompt and conversation sent to the model, model
+    settings), so neither a prompt change nor a different conversation ever
+    serves a stale answer.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL, disk_path=None, max_disk_entries=MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (created, response)
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "skipped": 0, "evictions": 0}
+        self._db = None
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL, response TEXT)")
+            self._db.commit()
+
+    def key(self, query, context):
+        return f"{normalize_query(query)}|{context_hash(context)}"
+
+    def get(self, query, context):
+        """Return a cached answer or None (also None for queries that need fresh context)."""
+        if needs_fresh_context(query):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+        key = self.key(query, context)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT created, response FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and now - row[0] < self.ttl:
+                    self._remember(key, row[0], row[1])
+                    self._stats["disk_hits"] += 1
+                    return row[1]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, query, context, response):
+        if needs_fresh_context(query) or not response:
+            return
+        key = self.key(query, context)
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, response)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, created, response))
+                self._db.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY created DESC LIMIT ?) OR created < ?",
+                    (self.max_disk_entries, created - self.ttl)
+                )
+                self._db.commit()
+
+    def _remember(self, key, created, response):
+        self._entries[key] = (created, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        """Counters plus hit rate over cacheable lookups."""
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+# --- Shared cache (opt-in) ---
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def enable_response_cache(max_entries=MAX_ENTRIES, ttl=TTL, disk_path=DISK_PATH):
+    """Turn the ChatBot response cache on; pass disk_path=None for memory only."""
+    global _cache
+    with _cache_lock:
+        _cache = ResponseCache(max_entries=max_entries, ttl=ttl, disk_path=disk_path)
+        return _cache
+
+
+def get_response_cache():
+    """Return the shared cache, or None while caching is disabled."""
+    global _cache
+    with _cache_lock:
+        if _cache is None and os.getenv("RESPONSE_CACHE", "").lower() in ("1", "true", "yes"):
+            _cache = ResponseCache(disk_path=DISK_PATH)
+        return _cache
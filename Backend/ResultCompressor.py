@@ -0,0 +1,207 @@
+import os
+import re
+import threading
+
+from ContextWindow import estimate_tokens
+
+
+# --- Settings ---
+TOKEN_BUDGET = int(os.getenv("SEARCH_TOKEN_BUDGET", 250))   # tokens for the search results message
+SHINGLE_WORDS = 3                # words per shingle
+NEAR_DUPLICATE = 0.5             # Jaccard similarity of shingle sets above which two texts are duplicates
+MIN_DESCRIPTION_CHARS = 20       # a description shorter than this after cleaning carries nothing
+
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+_STOP_WORDS = {"the", "a", "an", "is", "are", "of", "in", "on", "for", "to", "and", "what", "who", "how",
+               "me", "tell", "about", "today", "now", "latest", "current"}
+
+# Search-page furniture that ends up inside snippets (whole phrases at the start or end only)
+_BOILERPLATE_RES = [
+    re.compile(r"^(sponsored|ad)\s*[·:\-]\s*", re.I),
+    re.compile(r"\s*\b(Missing|Must include|Show results with):[^.!?]*$"),
+    re.compile(r"[\s\-–—|·]*\b(read|learn|see|show|view) more\s*(\.{3}|…|»|›|>)?\s*$", re.I),
+    re.compile(r"\s*(\.{3}|…)$"),
+]
+# Sentences that are site chrome, not content: matched as phrases, never on a single keyword
+_BOILERPLATE_SENTENCE_RE = re.compile(
+    r"\b(we use cookies|this (web)?site uses cookies|accept (all )?cookies|cookie (policy|settings|preferences)"
+    r"|subscribe to our|sign up for our|(sign|log) in to (continue|comment|read|view|your account)"
+    r"|all rights reserved|(read|see|view) our (privacy policy|terms)|by (continuing|using this (web)?site), you agree"
+    r"|(please )?enable javascript|javascript is (disabled|required)|click here to)\b"
+    r"|^advertisement\W*$", re.I)
+# A leading publication date ("12 Mar 2025 — ", "3 hours ago · ") tells the model how fresh a
+# result is; it is kept as "(12 Mar 2025) ", without the separator
+_DATE_PREFIX_RE = re.compile(
+    r"^(\d{1,2} \w{3,9} \d{4}|\w{3,9} \d{1,2}, \d{4}|\d+ (?:minutes?|hours?|days?|weeks?) ago)\s*[—·\-]\s*", re.I)
+
+
+def query_terms(query):
+    return {w for w in _WORD_RE.findall(query.lower()) if w not in _STOP_WORDS}
+
+
+def words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+# --- Near-duplicate detection ---
+def shingles(text, size=SHINGLE_WORDS):
+    """Set of overlapping word n-grams; short texts fall back to their word set"""
+    tokens = words(text)
+    if len(tokens) < size:
+        return set(tokens)
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def is_near_duplicate(shingle_set, kept, threshold=NEAR_DUPLICATE):
+    return any(jaccard(shingle_set, other) >= threshold for other in kept)
+
+
+# --- Boilerplate stripping ---
+def strip_boilerplate(text, seen_sentences=None, terms=frozenset()):
+    """Text without snippet furniture, boilerplate sentences and sentences already in seen_sentences.
+
+    seen_sentences (a set of normalized sentences) is updated with what is kept,
+    so a tagline repeated across results survives only once. A boilerplate-looking
+    sentence that mentions one of the query terms is kept: it may be the answer.
+    """
+    text = " ".join(text.split())
+    for pattern in _BOILERPLATE_RES:
+        text = pattern.sub("", text)
+    text = _DATE_PREFIX_RE.sub(r"(\1) ", text)
+    kept = []
+    for sentence in _SENTENCE_RE.split(text):
+        key = " ".join(words(sentence))
+        if not key or (_BOILERPLATE_SENTENCE_RE.search(sentence) and not terms & set(key.split())):
+            continue
+        if seen_sentences is not None:
+            if key in seen_sentences:
+                continue
+            seen_sentences.add(key)
+        kept.append(sentence)
+    return " ".join(kept).strip()
+
+
+def truncate_to_tokens(text, budget):
+    """Longest word-boundary prefix of text within budget tokens"""
+    if estimate_tokens(text) <= budget:
+        return text
+    out = []
+    for word in text.split():
+        if estimate_tokens(" ".join(out + [word])) > budget - 1:  # leave room for the ellipsis
+            break
+        out.append(word)
+    return " ".join(out) + "..." if out else ""
+
+
+def _entry(number, title, description):
+    """One result in the layout of RealtimeSearchEngine.format_search_results"""
+    return f"{number}. {title}\n   {description}\n" if description else f"{number}. {title}\n"
+
+
+class ResultCompressor:
+    """Turn search results into a compact prompt message.
+
+    Cleans every snippet, drops near-duplicates (shingle Jaccard similarity),
+    orders the rest by how many query words they share (ties keep search
+    rank) and stops at the token budget. compress() also reports the tokens
+    saved against the verbatim listing.
+    """
+
+    def __init__(self, budget=TOKEN_BUDGET, threshold=NEAR_DUPLICATE):
+        self.budget = budget
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "tokens_before": 0, "tokens_after": 0, "duplicates": 0, "dropped": 0}
+
+    def _clean(self, results, terms=frozenset()):
+        """[(rank, title, description)] without boilerplate and duplicates, plus the duplicate count"""
+        cleaned, kept_shingles, seen_titles, seen_sentences = [], [], set(), set()
+        duplicates = 0
+        for rank, r in enumerate(results):
+            title = " ".join(r['title'].split())
+            description = strip_boilerplate(r['description'], seen_sentences, terms)
+            if len(description) < MIN_DESCRIPTION_CHARS:
+                description = ""
+            title_key = " ".join(words(title))
+            shingle_set = shingles(description or title)
+            if is_near_duplicate(shingle_set, kept_shingles, self.threshold) or (not description and title_key in seen_titles):
+                duplicates += 1
+                continue
+            seen_titles.add(title_key)
+            kept_shingles.append(shingle_set)
+            cleaned.append((rank, title, description))
+        return cleaned, duplicates
+
+    def compress(self, query, results, header="Latest Search Results:\n\n"):
+        """(text, report) for the results of query; report has tokens_before, tokens_after and saved."""
+        verbatim = header + "".join(_entry(i, r['title'], r['description']) for i, r in enumerate(results, 1))
+        tokens_before = estimate_tokens(verbatim)
+        terms = query_terms(query)
+        cleaned, duplicates = self._clean(results, terms)
+
+        cleaned.sort(key=lambda c: (-len(terms & set(words(f"{c[1]} {c[2]}"))), c[0]))
+
+        used = estimate_tokens(header)
+        lines = []
+        for _, title, description in cleaned:
+            entry = _entry(len(lines) + 1, title, description)
+            cost = estimate_tokens(entry)
+            if used + cost > self.budget:
+                if lines:
+                    continue
+                # the best result is always kept, shortened to fit
+                room = self.budget - used - estimate_tokens(_entry(1, title, ""))
+                entry = _entry(1, title, truncate_to_tokens(description, room))
+                cost = estimate_tokens(entry)
+            used += cost
+            lines.append(entry)
+
+        text = header + "".join(lines)
+        report = {
+            "results_in": len(results),
+            "results_out": len(lines),
+            "duplicates": duplicates,
+            "tokens_before": tokens_before,
+            "tokens_after": estimate_tokens(text),
+        }
+        report["saved"] = report["tokens_before"] - report["tokens_after"]
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["tokens_before"] += report["tokens_before"]
+            self._stats["tokens_after"] += report["tokens_after"]
+            self._stats["duplicates"] += duplicates
+            self._stats["dropped"] += len(cleaned) - len(lines)
+        return text, report
+
+    def stats(self):
+        """Totals over all queries, with the overall saved_rate."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["saved_rate"] = 1 - stats["tokens_after"] / stats["tokens_before"] if stats["tokens_before"] else 0.0
+        return stats
+
+
+def describe_savings(report):
+    return (f"Search results: {report['tokens_before']} → {report['tokens_after']} tokens "
+            f"({report['results_out']}/{report['results_in']} results kept, {report['duplicates']} near-duplicates)")
+
+
+# --- Shared compressor ---
+_compressor = None
+_compressor_lock = threading.Lock()
+
+
+def get_result_compressor():
+    """Return the shared compressor, or None when disabled with SEARCH_COMPRESS=0."""
+    global _compressor
+    if os.getenv("SEARCH_COMPRESS", "1").lower() in ("0", "false", "no"):
+        return None
+    with _compressor_lock:
+        if _compressor is None:
+            _compressor = ResultCompressor()
+        return _compressor
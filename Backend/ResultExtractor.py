@@ -0,0 +1,200 @@
+import os
+from functools import lru_cache
+from html.parser import HTMLParser
+from importlib.util import find_spec
+
+
+# --- Settings ---
+EXTRACTOR = os.getenv("SEARCH_EXTRACTOR", "auto")
+AUTO_ORDER = ("selectolax", "lxml", "streaming")  # fastest first; streaming needs only the stdlib
+CHUNK_SIZE = 16 * 1024                            # streaming parser feed size between early-exit checks
+DESCRIPTION_CLASSES = ("VwiC3b", "yDYNvb")
+
+# Every extractor pulls (title, link, description) for the first `limit`
+# div.g results of a Google page, with the semantics of the original
+# BeautifulSoup code: first h3, first a (href or ''), first description div.
+# The fast ones skip div.g blocks nested in another one (sitelinks), which
+# the BeautifulSoup version reported as extra results.
+
+
+def _as_text(content):
+    return content.decode("utf-8", errors="replace") if isinstance(content, bytes) else content
+
+
+def bs4_extract(content, limit=3):
+    """Reference implementation: full BeautifulSoup tree, then find_all('div', class_='g')"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    results = []
+    for g in soup.find_all('div', class_='g'):
+        title_elem = g.find('h3')
+        link_elem = g.find('a')
+        desc_elem = g.find('div', class_=list(DESCRIPTION_CLASSES))
+        if title_elem and link_elem:
+            desc = desc_elem.get_text() if desc_elem else ''
+            results.append((title_elem.get_text(), link_elem.get('href', ''), desc))
+        if len(results) >= limit:
+            break
+    return results
+
+
+_G_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' g ')"
+_G_XPATH = f"//div[{_G_CLASS}][not(ancestor::div[{_G_CLASS}])]"
+_DESC_XPATH = " | ".join(
+    f".//div[contains(concat(' ', normalize-space(@class), ' '), ' {c} ')]" for c in DESCRIPTION_CLASSES
+)
+
+
+def lxml_extract(content, limit=3):
+    """libxml2 HTML parser; tree building and XPath run in C"""
+    from lxml import html as lxml_html
+
+    results = []
+    for g in lxml_html.fromstring(content).xpath(_G_XPATH):
+        title_elem = g.find('.//h3')
+        link_elem = g.find('.//a')
+        if title_elem is not None and link_elem is not None:
+            desc_elems = g.xpath(_DESC_XPATH)  # union results come back in document order
+            desc = desc_elems[0].text_content() if desc_elems else ''
+            results.append((title_elem.text_content(), link_elem.get('href', ''), desc))
+        if len(results) >= limit:
+            break
+    return results
+
+
+def _inside_result(node):
+    parent = node.parent
+    while parent is not None:
+        if parent.tag == 'div' and 'g' in (parent.attributes.get('class') or '').split():
+            return True
+        parent = parent.parent
+    return False
+
+
+def selectolax_extract(content, limit=3):
+    """lexbor HTML5 parser with CSS selectors"""
+    from selectolax.lexbor import LexborHTMLParser
+
+    results = []
+    for g in LexborHTMLParser(_as_text(content)).css('div.g'):
+        if _inside_result(g):
+            continue
+        title_elem = g.css_first('h3')
+        link_elem = g.css_first('a')
+        if title_elem is not None and link_elem is not None:
+            desc_elem = g.css_first(', '.join(f'div.{c}' for c in DESCRIPTION_CLASSES))
+            desc = desc_elem.text(deep=True) if desc_elem is not None else ''
+            results.append((title_elem.text(deep=True), link_elem.attributes.get('href') or '', desc))
+        if len(results) >= limit:
+            break
+    return results
+
+
+class _GoogleResultParser(HTMLParser):
+    """Event-driven div.g extraction that needs no tree and can stop early"""
+
+    def __init__(self, limit):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.results = []
+        self.done = False
+        self._div_depth = 0
+        self._g_depth = None      # div depth of the open div.g
+        self._desc_depth = None   # div depth of the open description div
+        self._h3_depth = 0
+        self._reset()
+
+    def _reset(self):
+        self._title = None
+        self._link = None
+        self._desc = None
+        self._title_parts = []
+        self._desc_parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'div':
+            self._div_depth += 1
+            classes = (dict(attrs).get('class') or '').split()
+            if self._g_depth is None:
+                if 'g' in classes:
+                    self._g_depth = self._div_depth
+            elif self._desc is None and self._desc_depth is None and any(c in classes for c in DESCRIPTION_CLASSES):
+                self._desc_depth = self._div_depth
+        elif self._g_depth is None:
+            return
+        elif tag == 'h3' and self._title is None:
+            self._h3_depth += 1
+        elif tag == 'a' and self._link is None:
+            self._link = dict(attrs).get('href') or ''
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == 'div' and self._div_depth:
+            if self._desc_depth == self._div_depth:
+                self._desc = ''.join(self._desc_parts)
+                self._desc_depth = None
+            if self._g_depth == self._div_depth:
+                self._close_result()
+            self._div_depth -= 1
+        elif tag == 'h3' and self._h3_depth:
+            self._h3_depth -= 1
+            if not self._h3_depth:
+                self._title = ''.join(self._title_parts)
+
+    def handle_data(self, data):
+        if self._h3_depth:
+            self._title_parts.append(data)
+        if self._desc_depth is not None:
+            self._desc_parts.append(data)
+
+    def _close_result(self):
+        if self._title is not None and self._link is not None:
+            self.results.append((self._title, self._link, self._desc or ''))
+        self._g_depth = None
+        self._desc_depth = None
+        self._h3_depth = 0
+        self._reset()
+        if len(self.results) >= self.limit:
+            self.done = True
+
+
+def streaming_extract(content, limit=3):
+    """Stdlib html.parser fed in chunks; stops reading once `limit` results are complete"""
+    text = _as_text(content)
+    parser = _GoogleResultParser(limit)
+    for start in range(0, len(text), CHUNK_SIZE):
+        parser.feed(text[start:start + CHUNK_SIZE])
+        if parser.done:
+            return parser.results
+    parser.close()
+    return parser.results
+
+
+EXTRACTORS = {
+    "bs4": (bs4_extract, "bs4"),
+    "lxml": (lxml_extract, "lxml"),
+    "selectolax": (selectolax_extract, "selectolax"),
+    "streaming": (streaming_extract, None),
+}
+
+
+def available_extractors():
+    return [name for name, (_, module) in EXTRACTORS.items() if module is None or find_spec(module) is not None]
+
+
+@lru_cache(maxsize=None)
+def get_extractor(name=None):
+    """Extractor function by name; 'auto' picks the fastest one whose parser is installed."""
+    name = name or EXTRACTOR
+    if name == "auto":
+        available = available_extractors()
+        name = next(n for n in AUTO_ORDER if n in available)
+    return EXTRACTORS[name][0]
+
+
+def extract_google_results(content, limit=3):
+    return get_extractor()(content, limit)
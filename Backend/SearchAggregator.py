@@ -0,0 +1,265 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ResultExtractor import extract_google_results
+
+
+# --- Settings ---
+DEADLINE = float(os.getenv("SEARCH_DEADLINE", 3.0))    # seconds for the whole fan-out
+WANT_RESULTS = 3                                        # return as soon as this many good snippets arrived
+MIN_SNIPPET_CHARS = 30                                  # shorter descriptions don't count as good
+MAX_DESCRIPTION = 200
+PROVIDERS = os.getenv("SEARCH_PROVIDERS", "google,duckduckgo,wikipedia")
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def make_result(title, link, description, source):
+    description = " ".join(description.split())
+    if len(description) > MAX_DESCRIPTION:
+        description = description[:MAX_DESCRIPTION] + '...'
+    return {'title': title.strip(), 'link': link, 'description': description, 'source': source}
+
+
+# --- Providers ---
+# A provider only builds the request and parses the response, so the same
+# object works with the blocking and the async fan-out, and base_url can
+# point at a local fixture server (see Benchmarks/FakeGroq.py).
+
+class GoogleProvider:
+    name = "google"
+
+    def __init__(self, base_url=None):
+        self.base_url = (base_url or os.getenv("SEARCH_BASE_URL", "https://www.google.com")).rstrip("/")
+
+    def request(self, query):
+        return f"{self.base_url}/search", {"q": query}
+
+    def parse(self, content, limit):
+        return [make_result(t, l, d, self.name) for t, l, d in extract_google_results(content, limit)]
+
+
+class DuckDuckGoProvider:
+    name = "duckduckgo"
+
+    def __init__(self, base_url=None):
+        self.base_url = (base_url or os.getenv("DDG_BASE_URL", "https://html.duckduckgo.com")).rstrip("/")
+
+    def request(self, query):
+        return f"{self.base_url}/html/", {"q": query}
+
+    def parse(self, content, limit):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+        results = []
+        for item in soup.select('div.result'):
+            title_elem = item.select_one('a.result__a')
+            desc_elem = item.select_one('.result__snippet')
+            if not title_elem:
+                continue
+            link = title_elem.get('href', '')
+            # result links are redirects: //duckduckgo.com/l/?uddg=<target>
+            target = urllib.parse.parse_qs(urllib.parse.urlparse(link).query).get('uddg')
+            results.append(make_result(title_elem.get_text(), target[0] if target else link,
+                                       desc_elem.get_text() if desc_elem else '', self.name))
+            if len(results) >= limit:
+                break
+        return results
+
+
+class WikipediaProvider:
+    name = "wikipedia"
+    _LEAD_RE = re.compile(r"^(who|what|where)\s+(is|are|was|were)\s+(the\s+)?|^(tell me about|information about)\s+", re.I)
+
+    def __init__(self, base_url=None):
+        self.base_url = (base_url or os.getenv("WIKIPEDIA_BASE_URL", "https://en.wikipedia.org")).rstrip("/")
+
+    def request(self, query):
+        subject = self._LEAD_RE.sub("", query.strip()).strip(" ?!.")
+        title = urllib.parse.quote(subject.replace(" ", "_"), safe="")
+        return f"{self.base_url}/api/rest_v1/page/summary/{title}", None
+
+    def parse(self, content, limit):
+        data = json.loads(content)
+        if data.get("type") not in (None, "standard") or not data.get("extract"):
+            return []  # disambiguation pages and misses carry no usable snippet
+        link = data.get("content_urls", {}).get("desktop", {}).get("page", "")
+        return [make_result(data.get("title", ""), link, data["extract"], self.name)]
+
+
+PROVIDER_TYPES = {p.name: p for p in (GoogleProvider, DuckDuckGoProvider, WikipediaProvider)}
+
+
+def result_key(result):
+    """Dedupe key: the link without scheme, www. and trailing slash, else the title"""
+    url = urllib.parse.urlparse(result['link'])
+    host = url.netloc.lower().removeprefix("www.")
+    return f"{host}{url.path.rstrip('/')}" if host else result['title'].lower()
+
+
+class SearchAggregator:
+    """Query several providers at once under one deadline and merge as results arrive.
+
+    Returns once `want` good (long enough) snippets are collected or the
+    deadline passes, whichever comes first, so a slow or broken source never
+    sets the latency. Results are deduplicated by link, in arrival order.
+    """
+
+    def __init__(self, providers=None, deadline=DEADLINE, want=WANT_RESULTS):
+        self.providers = providers if providers is not None else [
+            PROVIDER_TYPES[name.strip()]() for name in PROVIDERS.split(",") if name.strip() in PROVIDER_TYPES
+        ]
+        self.deadline = deadline
+        self.want = want
+        self._lock = threading.Lock()
+        self._pool = None
+        self._session = None
+        self._async_clients = {}  # event loop -> httpx.AsyncClient
+        self._stats = {p.name: {"ok": 0, "empty": 0, "errors": 0, "late": 0} for p in self.providers}
+
+    # --- merging ---
+    def _merge(self, merged, seen, provider, results):
+        with self._lock:
+            self._stats[provider.name]["ok" if results else "empty"] += 1
+        for r in results:
+            key = result_key(r)
+            if key not in seen:
+                seen.add(key)
+                merged.append(r)
+
+    def _good(self, merged):
+        return sum(len(r['description']) >= MIN_SNIPPET_CHARS for r in merged)
+
+    def _finish(self, merged, late, errors):
+        if not merged and errors == len(self.providers):
+            raise RuntimeError("every search provider failed")
+        with self._lock:
+            for provider in late:
+                self._stats[provider.name]["late"] += 1
+        merged.sort(key=lambda r: len(r['description']) < MIN_SNIPPET_CHARS)  # good snippets first, stable
+        return merged[:self.want]
+
+    def _failed(self, provider, error):
+        with self._lock:
+            self._stats[provider.name]["errors"] += 1
+        print(f"⚠️ Search provider {provider.name} failed: {error}")
+
+    # --- blocking fan-out ---
+    def _fetch(self, provider, query, give_up_at):
+        """Blocking request that ends by give_up_at, so an abandoned fetch frees its worker promptly.
+
+        The socket timeout is the time left (a request that waited in the pool
+        gets less), and the body is read in chunks with the deadline checked
+        between them, since a server trickling bytes never trips a read timeout.
+        """
+        url, params = provider.request(query)
+        remaining = give_up_at - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("search deadline passed before the request started")
+        with self._session.get(url, params=params, timeout=remaining, stream=True) as resp:
+            if resp.status_code == 404:
+                return []  # e.g. no Wikipedia page for this subject
+            resp.raise_for_status()
+            chunks = []
+            while chunk := resp.raw.read1(16384, decode_content=True):  # whatever has arrived, not a full block
+                chunks.append(chunk)
+                if time.monotonic() > give_up_at:
+                    raise TimeoutError("search deadline passed while reading the response")
+        return provider.parse(b"".join(chunks), self.want)
+
+    def search(self, query):
+        import requests
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.providers)),
+                                                thread_name_prefix="search")
+                self._session = requests.Session()
+                self._session.headers["User-Agent"] = USER_AGENT
+        give_up_at = time.monotonic() + self.deadline
+        pending = {self._pool.submit(self._fetch, p, query, give_up_at): p for p in self.providers}
+        merged, seen, errors = [], set(), 0
+        while pending and self._good(merged) < self.want:
+            done, _ = wait(pending, timeout=max(0.0, give_up_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    self._merge(merged, seen, provider, future.result())
+                except Exception as e:
+                    errors += 1
+                    self._failed(provider, e)
+        for future in pending:
+            future.cancel()  # still-running requests end at give_up_at; their results are ignored
+        return self._finish(merged, pending.values(), errors)
+
+    # --- async fan-out ---
+    async def _fetch_async(self, client, provider, query):
+        url, params = provider.request(query)
+        resp = await client.get(url, params=params)
+        if resp.status_code == 404:
+            return []
+        resp.raise_for_status()
+        return await asyncio.to_thread(provider.parse, resp.content, self.want)
+
+    def _async_client(self):
+        """One pooled httpx.AsyncClient per event loop (creating one per search costs more than the search)."""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for old_loop in [l for l in self._async_clients if l.is_closed()]:
+                    del self._async_clients[old_loop]
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    headers={"User-Agent": USER_AGENT}, timeout=self.deadline, follow_redirects=True)
+            return client
+
+    async def search_async(self, query):
+        client = self._async_client()
+        give_up_at = time.monotonic() + self.deadline
+        pending = {asyncio.ensure_future(self._fetch_async(client, p, query)): p for p in self.providers}
+        merged, seen, errors = [], set(), 0
+        try:
+            while pending and self._good(merged) < self.want:
+                done, _ = await asyncio.wait(pending, timeout=max(0.0, give_up_at - time.monotonic()),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        self._merge(merged, seen, provider, task.result())
+                    except Exception as e:
+                        errors += 1
+                        self._failed(provider, e)
+        finally:
+            for task in pending:
+                task.cancel()
+        return self._finish(merged, pending.values(), errors)
+
+    def stats(self):
+        """Per-provider counters: ok, empty, errors and late (cut off by the deadline)."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
+
+
+# --- Shared aggregator ---
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def get_search_aggregator():
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None:
+            _aggregator = SearchAggregator()
+        return _aggregator
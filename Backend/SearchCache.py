@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ResponseCache import normalize_query
+
+
+# --- Settings ---
+DISK_PATH = os.path.join("Data", "SearchCache.sqlite3")
+MAX_BYTES = 20 * 1024 * 1024     # total size of stored results before eviction
+STALE_FACTOR = 6                 # a stale entry is still served (and refreshed) up to ttl * STALE_FACTOR old
+REFRESH_LEASE = 30               # seconds one process owns a background refresh
+# freshness class -> (ttl seconds, words that put a query in it); checked in this order
+FRESHNESS_CLASSES = [
+    ("live", 5 * 60, ("weather", "forecast", "temperature", "score", "scores", "match", "live",
+                      "stock", "price", "exchange rate", "traffic")),
+    ("news", 60 * 60, ("news", "headline", "headlines", "breaking", "latest", "trending", "update",
+                       "updates", "today", "current", "recent", "happening")),
+    ("entity", 7 * 24 * 60 * 60, ("who is", "what is", "who was", "what was", "tell me about",
+                                  "information about", "history of", "capital of")),
+]
+DEFAULT_TTL = 60 * 60
+
+
+def freshness_class(query):
+    """('live' | 'news' | 'entity' | 'default', ttl) for a query."""
+    q = f" {normalize_query(query)} "
+    for name, ttl, words in FRESHNESS_CLASSES:
+        if any(f" {word} " in q for word in words):
+            return name, ttl
+    return "default", DEFAULT_TTL
+
+
+class SearchCache:
+    """Search results in SQLite, shared by every process using the same file.
+
+    Fresh entries are returned as is. Stale ones (older than their TTL but
+    younger than ttl * STALE_FACTOR) are returned immediately while one
+    background refresh replaces them. Eviction drops the least recently
+    used entries once the stored results exceed max_bytes.
+    """
+
+    def __init__(self, path=DISK_PATH, max_bytes=MAX_BYTES, stale_factor=STALE_FACTOR):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stale_factor = stale_factor
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")  # readers in other processes never block on writers
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL, ttl REAL, "
+            "accessed REAL, size INTEGER, refreshing_until REAL DEFAULT 0, results TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._db.commit()
+
+    def lookup(self, query):
+        """Return (results or None, stale); stale results should be refreshed."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT created, ttl, results FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[0] >= row[1] * self.stale_factor:
+                self._stats["misses"] += 1
+                return None, False
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            stale = now - row[0] >= row[1]
+            self._stats["stale_hits" if stale else "hits"] += 1
+            return json.loads(row[2]), stale
+
+    def expires_in(self, query):
+        """Seconds until the entry for query goes stale (negative if it already is), None if absent."""
+        with self._lock:
+            row = self._db.execute("SELECT created, ttl FROM results WHERE key = ?",
+                                   (normalize_query(query),)).fetchone()
+        return None if row is None else row[0] + row[1] - time.time()
+
+    def store(self, query, results):
+        key = normalize_query(query)
+        _, ttl = freshness_class(query)
+        payload = json.dumps(results, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, created, ttl, accessed, size, refreshing_until, results) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?)",
+                (key, now, ttl, now, len(payload), payload)
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least recently used rows until we are back under 90% of the budget
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if total - freed <= self.max_bytes * 0.9:
+                break
+            victims.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM results WHERE key = ?", victims)
+        self._stats["evictions"] += len(victims)
+
+    def _claim_refresh(self, key):
+        """Take the refresh lease for key unless this or another process already holds it."""
+        now = time.time()
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            claimed = self._db.execute(
+                "UPDATE results SET refreshing_until = ? WHERE key = ? AND refreshing_until < ?",
+                (now + REFRESH_LEASE, key, now)
+            ).rowcount
+            self._db.commit()
+            if claimed:
+                self._refreshing.add(key)
+            return bool(claimed)
+
+    def refresh_in_background(self, query, fetch):
+        """Run fetch(query) on a daemon thread and store the result (at most one refresh per key)."""
+        key = normalize_query(query)
+        if not self._claim_refresh(key):
+            return None
+
+        def refresh():
+            try:
+                results = fetch(query)
+                if results:
+                    self.store(query, results)
+                    with self._lock:
+                        self._stats["refreshes"] += 1
+            except Exception as e:
+                print(f"⚠️ Background search refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=refresh, daemon=True)
+        thread.start()
+        return thread
+
+    def get_or_fetch(self, query, fetch):
+        """Cached results for query; fetch(query) runs inline on a miss, in the background when stale."""
+        results, stale = self.lookup(query)
+        if results is None:
+            results = fetch(query)
+            if results:  # an empty page is more likely a block or markup change than a real answer
+                self.store(query, results)
+        elif stale:
+            self.refresh_in_background(query, fetch)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"], stats["bytes"] = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+# --- Shared cache ---
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """Return the shared search cache, or None when disabled with SEARCH_CACHE=0."""
+    global _cache
+    if os.getenv("SEARCH_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
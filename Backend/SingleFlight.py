@@ -0,0 +1,99 @@
+import threading
+import time
+
+
+# --- Settings ---
+COALESCED_ACTIONS = ("general", "realtime")  # actions that pay for an LLM call or a search
+
+
+def _fold(text):
+    """Case and whitespace folded only: punctuation is kept, so "2+2" and "2-2" never share a call."""
+    return " ".join(text.casefold().split())
+
+
+def action_key(action, user_raw_query=""):
+    """Folded action string; a bare keyword falls back to the raw query like handle_action does."""
+    key = _fold(action)
+    if " " not in key and user_raw_query:
+        key = f"{key} {_fold(user_raw_query)}"
+    return key
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Concurrent calls with the same key wait for one execution and share its result.
+
+    Only in-flight calls are shared: once the leader returns, the next call
+    with that key runs again. Errors are shared the same way as results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0, "saved_seconds": 0.0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        start = time.perf_counter()
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # every follower would otherwise have paid for the same work again
+                self._stats["saved_seconds"] += (time.perf_counter() - start) * call.followers
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._calls)
+
+    def stats(self):
+        """Counters; 'coalesced' is the number of calls saved."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["saved_rate"] = stats["coalesced"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+
+# --- Shared instance ---
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
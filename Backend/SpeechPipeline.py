@@ -0,0 +1,266 @@
+import os
+import queue
+import re
+import threading
+import time
+
+from TextToSpeech import TTS_BACKEND, create_tts_audio, generate_unique_filepath, get_pygame, speaker_lock
+
+
+# --- Settings ---
+MIN_SENTENCE_CHARS = 20  # merge tiny fragments ("Hi.") into the next sentence
+SYNTH_AHEAD = 2          # sentences synthesized ahead of playback
+SPEECH_CHANNEL = 0       # mixer channel reserved for pipelined speech
+POLL_INTERVAL = 0.01     # seconds between playback state checks
+
+_BOUNDARY_RE = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = ("mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "e.g.", "i.e.", "etc.", "no.")
+_DONE = object()
+
+
+class SentenceSplitter:
+    """Cuts streamed text into speakable sentences as soon as each one ends."""
+
+    def __init__(self, min_chars=MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text):
+        """Add a delta; return the sentences it completed."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for m in _BOUNDARY_RE.finditer(self._buffer):
+            candidate = self._buffer[start:m.start()].strip()
+            if not candidate:
+                start = m.end()
+                continue
+            if candidate.lower().endswith(_ABBREVIATIONS) or len(candidate) < self.min_chars:
+                continue  # keep accumulating up to the next boundary
+            sentences.append(candidate)
+            start = m.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Return whatever is left once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+# --- Default backends (edge_tts + pygame, loaded on first use) ---
+def edge_tts_synthesize(text):
+    import asyncio
+
+    filepath = generate_unique_filepath()
+    asyncio.run(create_tts_audio(text, filepath))
+    return filepath
+
+
+class PygamePlayer:
+    """Gapless playback on a reserved mixer channel.
+
+    Each clip is queued behind the one playing (a channel holds one queued
+    sound), so the next sentence starts the moment the current one ends.
+    Clips are decoded into memory when queued and their files deleted.
+    """
+
+    def __init__(self, channel=SPEECH_CHANNEL):
+        self.channel_id = channel
+        self._channel = None
+        self._sounds = []  # keep queued sounds referenced until they have played
+
+    def enqueue(self, filepath, stop_event):
+        """Queue filepath behind the current clip; waits while another clip is already queued."""
+        channel = self._get_channel()
+        try:
+            sound = get_pygame().mixer.Sound(filepath)
+        finally:
+            self.discard(filepath)
+        while channel.get_busy() and channel.get_queue() is not None:
+            if stop_event.is_set():
+                return
+            time.sleep(POLL_INTERVAL)
+        if channel.get_busy():
+            channel.queue(sound)
+        else:
+            channel.play(sound)
+        self._sounds = self._sounds[-1:] + [sound]
+
+    def drain(self, stop_event):
+        """Block until everything queued has played."""
+        channel = self._get_channel()
+        while channel.get_busy():
+            if stop_event.is_set():
+                return
+            time.sleep(POLL_INTERVAL)
+        self._sounds = []
+
+    def stop(self):
+        if self._channel is not None:
+            self._channel.stop()
+        self._sounds = []
+
+    def discard(self, filepath):
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+
+    def _get_channel(self):
+        if self._channel is None:
+            pygame = get_pygame()
+            pygame.mixer.set_reserved(self.channel_id + 1)
+            self._channel = pygame.mixer.Channel(self.channel_id)
+        return self._channel
+
+
+class BlockingPlayer:
+    """Adapts a blocking play(handle, stop_event) function (stubs, tests) to the player interface."""
+
+    def __init__(self, play):
+        self.play = play
+
+    def enqueue(self, audio, stop_event):
+        self.play(audio, stop_event)
+
+    def drain(self, stop_event):
+        pass
+
+    def stop(self):
+        pass
+
+    def discard(self, audio):
+        pass
+
+
+def null_synthesize(text):
+    return text
+
+
+def null_play(audio, stop_event):
+    pass
+
+
+BACKENDS = {  # name -> (synthesize, player factory)
+    "edge": (edge_tts_synthesize, PygamePlayer),
+    "null": (null_synthesize, lambda: BlockingPlayer(null_play)),
+}
+
+
+class SpeechPipeline:
+    """Speaks a streamed answer sentence by sentence.
+
+    Sentence N+1 is synthesized while sentence N plays, so the first audio
+    starts after one sentence instead of the whole answer. `synthesize(text)`
+    returns an audio handle; a `player` queues handles for gapless playback,
+    or a blocking `play(handle, stop_event)` function plays them one by one.
+    Both are swappable for stubs. A pipeline holds the shared speaker lock
+    from its first sentence to its last, so answers, timer announcements
+    and other speech never interrupt or overlap each other.
+    """
+
+    def __init__(self, synthesize=None, play=None, synth_ahead=SYNTH_AHEAD, min_chars=MIN_SENTENCE_CHARS,
+                 player=None):
+        default_synthesize, default_player = BACKENDS[TTS_BACKEND]
+        self.synthesize = synthesize or default_synthesize
+        self.player = player or (BlockingPlayer(play) if play else default_player())
+        self.splitter = SentenceSplitter(min_chars)
+        self.stop_event = threading.Event()
+        self.errors = []
+        self._sentences = queue.Queue()
+        self._audio = queue.Queue(maxsize=synth_ahead)
+        self._synth_thread = threading.Thread(target=self._synth_loop, name="TTSSynth", daemon=True)
+        self._play_thread = threading.Thread(target=self._play_loop, name="TTSPlayback", daemon=True)
+        self._synth_thread.start()
+        self._play_thread.start()
+
+    def feed(self, delta):
+        for sentence in self.splitter.feed(delta):
+            self._sentences.put(sentence)
+
+    def finish(self):
+        """Signal the end of the text stream."""
+        for sentence in self.splitter.flush():
+            self._sentences.put(sentence)
+        self._sentences.put(_DONE)
+
+    def wait(self, timeout=None):
+        """Block until every sentence has been played (or cancel() was called)."""
+        self._play_thread.join(timeout)
+        return not self._play_thread.is_alive()
+
+    def speak(self, deltas):
+        """Feed a whole delta iterable, then wait for playback to finish."""
+        try:
+            for delta in deltas:
+                self.feed(delta)
+        finally:
+            self.finish()
+        self.wait()
+
+    def cancel(self):
+        self.stop_event.set()
+        self._sentences.put(_DONE)
+
+    def _synth_loop(self):
+        while True:
+            sentence = self._sentences.get()
+            if sentence is _DONE or self.stop_event.is_set():
+                break
+            try:
+                audio = self.synthesize(sentence)
+            except Exception as e:
+                self.errors.append(e)
+                print(f"Error generating speech: {e}")
+                continue
+            self._put_audio(audio)
+        self._put_audio(_DONE)
+
+    def _put_audio(self, item):
+        while True:
+            try:
+                self._audio.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if self.stop_event.is_set():
+                    return
+
+    def _play_loop(self):
+        speaking = False
+        try:
+            while True:
+                try:
+                    audio = self._audio.get(timeout=0.1)
+                except queue.Empty:
+                    if self.stop_event.is_set():
+                        break
+                    continue
+                if audio is _DONE:
+                    break
+                if self.stop_event.is_set() or not (speaking or self._take_speaker()):
+                    self.player.discard(audio)
+                    continue  # keep draining so synthesized files are cleaned up
+                speaking = True
+                try:
+                    self.player.enqueue(audio, self.stop_event)
+                except Exception as e:
+                    self.errors.append(e)
+                    print(f"Playback error: {e}")
+            if speaking:
+                self.player.drain(self.stop_event)
+        except Exception as e:
+            self.errors.append(e)
+            print(f"Playback error: {e}")
+        finally:
+            if speaking:
+                if self.stop_event.is_set():
+                    self.player.stop()
+                speaker_lock.release()
+
+    def _take_speaker(self):
+        """Wait for other speech to finish; False if cancelled meanwhile."""
+        while not speaker_lock.acquire(timeout=0.1):
+            if self.stop_event.is_set():
+                return False
+        return True
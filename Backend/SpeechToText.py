@@ -1,16 +1,11 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import dotenv_values
 import os
 import time
-import mtranslate as mt
 import atexit
 
+# selenium, webdriver_manager and mtranslate are imported where they are used,
+# so importing this module (e.g. from the GUI) does not pay for them up front.
+
 class SpeechToTextSystem:
     def __init__(self):
         self.load_env_config()
@@ -104,6 +99,11 @@ function stopRecognition() {
         self.html_file_url = f"file:///{html_path.replace(os.sep, '/')}"
 
     def setup_browser(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+
         options = Options()
         options.add_argument("user-agent=Mozilla/5.0")
         options.add_argument("--use-fake-ui-for-media-stream")
@@ -133,11 +133,16 @@ function stopRecognition() {
 
     def translate_to_english(self, text):
         try:
+            import mtranslate as mt
             return mt.translate(text, "en", "auto").capitalize()
         except Exception:
             return text.capitalize()
 
     def capture_speech(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         self.driver.get(self.html_file_url)
         wait = WebDriverWait(self.driver, 10)
         try:
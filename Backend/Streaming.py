@@ -0,0 +1,83 @@
+INTERRUPTED_NOTICE = " (response interrupted)"  # appended when a stream fails part-way
+
+
+class StreamCleaner:
+    """Incremental version of the engines' clean_response().
+
+    Drops blank lines and lines starting with any of `drop_prefixes`
+    (case-insensitive) while streaming: a line is released as soon as its
+    start can no longer match a prefix, so ordinary text is not held back
+    until the newline arrives. Joining every fed() result plus close()
+    equals clean_response() on the full text.
+    """
+
+    def __init__(self, drop_prefixes=()):
+        self.drop_prefixes = tuple(p.lower() for p in drop_prefixes)
+        self._line = ""         # undecided start of the current line
+        self._state = None      # None (undecided), "keep" or "drop"
+        self._emitted = False   # a kept line has been released already
+
+    def _decide(self):
+        lowered = self._line.lower()
+        if not self._line.strip():
+            return None
+        if any(lowered.startswith(p) for p in self.drop_prefixes):
+            return "drop"
+        if any(p.startswith(lowered) for p in self.drop_prefixes):
+            return None
+        return "keep"
+
+    def _release(self):
+        out = ("\n" if self._emitted else "") + self._line
+        self._emitted = True
+        self._line = ""
+        return out
+
+    def feed(self, text):
+        """Consume a delta and return the cleaned text that can be shown now."""
+        out = []
+        for part in _split_keep_newlines(text):
+            if part == "\n":
+                if self._state is None and self._line.strip():
+                    out.append(self._release())
+                self._line, self._state = "", None
+                continue
+            if self._state == "keep":
+                out.append(part)
+            elif self._state is None:
+                self._line += part
+                self._state = self._decide()
+                if self._state == "keep":
+                    out.append(self._release())
+        return "".join(out)
+
+    def close(self):
+        """Flush a trailing line that never reached a decision."""
+        out = self.feed("\n")
+        self._line, self._state = "", None
+        return out
+
+
+def _split_keep_newlines(text):
+    """'a\\nb' -> ['a', '\\n', 'b'] (empty pieces removed)."""
+    pieces = []
+    for i, chunk in enumerate(text.split("\n")):
+        if i:
+            pieces.append("\n")
+        if chunk:
+            pieces.append(chunk)
+    return pieces
+
+
+def completion_deltas(completion):
+    """Yield the text deltas of a streamed chat completion."""
+    for chunk in completion:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def async_completion_deltas(completion):
+    """Async counterpart of completion_deltas for AsyncGroq streams."""
+    async for chunk in completion:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
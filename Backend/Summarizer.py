@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import threading
+
+from ChatLog import get_conversation_store
+
+
+# --- Settings ---
+SUMMARY_PATH = os.path.join("Data", "ChatSummary.json")
+KEEP_RECENT = 20     # newest messages always sent raw
+FOLD_BATCH = 20      # fold only once this many extra messages have aged out; also the messages per LLM call
+FOLDS_PER_RUN = 25   # LLM calls per idle run; a longer backlog continues on the next idle timer
+IDLE_DELAY = 30.0    # seconds of quiet after a response before compacting
+SUMMARY_VERSION = 2  # 2: covers is a chat log sequence number, not an index into the live history
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an AI assistant.
+Merge the previous summary with the new messages into one concise summary (at most 200 words).
+Keep names, preferences, facts and open tasks; drop greetings and small talk. Reply with the summary only."""
+
+
+def _fingerprint(messages, covers):
+    """Hash of the last covered message, so a rewritten log invalidates the summary."""
+    if covers == 0:
+        return ""
+    last = messages[covers - 1]
+    return hashlib.sha1(f"{last['role']}:{last['content']}".encode("utf-8")).hexdigest()
+
+
+def _empty_state():
+    return {"version": SUMMARY_VERSION, "covers": 0, "fingerprint": "", "summary": ""}
+
+
+def _transcript(messages):
+    return "\n".join(f"{m['role'].capitalize()}: {m['content']}" for m in messages)
+
+
+# --- Summarizer backends: fn(previous_summary, new_messages) -> str ---
+def llm_summarize(previous, messages):
+    """Fold messages into the summary with the chat model."""
+    from LLMClient import chat_completion
+
+    prompt = f"Previous summary:\n{previous or '(none)'}\n\nNew messages:\n{_transcript(messages)}"
+    completion = chat_completion(
+        messages=[{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": prompt}],
+        max_tokens=300,
+        temperature=0.2,
+        stream=False
+    )
+    return (completion.choices[0].message.content or "").strip()
+
+
+def fake_summarize(previous, messages):
+    """Deterministic offline stand-in: keeps the first sentence of each user message."""
+    notes = [m["content"].split(".")[0].strip()[:80] for m in messages if m["role"] == "user"]
+    return "; ".join(filter(None, [previous, *notes]))
+
+
+class ConversationSummarizer:
+    """Folds turns older than KEEP_RECENT into a cached rolling summary, off the request path."""
+
+    def __init__(self, store=None, summarize_fn=llm_summarize, path=SUMMARY_PATH,
+                 keep_recent=KEEP_RECENT, fold_batch=FOLD_BATCH, idle_delay=IDLE_DELAY,
+                 folds_per_run=FOLDS_PER_RUN):
+        self.store = store if store is not None else get_conversation_store()  # an empty store is falsy
+        self.summarize_fn = summarize_fn
+        self.path = path
+        self.keep_recent = keep_recent
+        self.fold_batch = fold_batch
+        self.idle_delay = idle_delay
+        self.folds_per_run = folds_per_run
+        self._lock = threading.Lock()
+        self._timer = None
+        self._state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == SUMMARY_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return _empty_state()
+
+    def _save(self, state):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def _valid_state(self, history, base):
+        """Return (state, index in history where its summary ends), or (None, 0) if it no longer fits.
+
+        base is the chat log sequence number of history[0] (the journal archives
+        its oldest records when it grows too large), and covers is stored as a
+        sequence number, so the summary's end is found by subtraction.
+        """
+        state = self._state
+        end = state["covers"] - base
+        if not state["summary"]:
+            return state, 0
+        if 0 <= end <= len(history) and (end == 0 or state["fingerprint"] == _fingerprint(history, end)):
+            return state, end
+        self._state = _empty_state()
+        return None, 0
+
+    # --- Request path ---
+    def context_for(self, history, base=None):
+        """Return (summary_messages, remaining_history) for prompt assembly.
+
+        base: sequence number of history[0]; defaults to the store's, which fits its snapshots.
+        """
+        with self._lock:
+            state, end = self._valid_state(history, self.store.base if base is None else base)
+        if not state or not state["summary"]:
+            return [], history
+        summary = {"role": "system", "content": f"Summary of the earlier conversation:\n{state['summary']}"}
+        return [summary], history[end:]
+
+    # --- Background compaction ---
+    def schedule(self):
+        """(Re)start the idle timer; call after a response has been delivered."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.idle_delay, self._run_safely)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run_safely(self):
+        try:
+            self.run_once()
+        except Exception as e:
+            print(f"⚠️ Conversation summarization failed: {e}")
+
+    def run_once(self):
+        """Fold aged-out messages into the summary if enough have accumulated.
+
+        Messages are folded fold_batch at a time, saving after each chunk, and
+        at most folds_per_run chunks per call; a longer backlog reschedules the
+        idle timer. Returns True if a new summary was produced.
+        """
+        base, history = self.store.base, self.store.snapshot()
+        with self._lock:
+            state, covers = self._valid_state(history, base)
+        start = covers
+        summary = state["summary"] if state else ""
+        target = len(history) - self.keep_recent
+        if target - covers < self.fold_batch:
+            return False
+        # Never split a user/assistant pair across the boundary.
+        while target > covers and history[target]["role"] == "assistant":
+            target -= 1
+
+        for _ in range(self.folds_per_run):
+            if covers >= target:
+                break
+            end = min(covers + self.fold_batch, target)
+            while end < target and history[end]["role"] == "assistant":
+                end += 1
+            folded = (self.summarize_fn(summary, history[covers:end]) or "").strip()
+            if not folded:
+                # Keep covers where it is, or messages covers..end would never be summarized
+                print(f"⚠️ Empty summary for messages {covers}-{end}; will retry later")
+                target = covers
+                break
+            summary, covers = folded, end
+            new_state = {
+                "version": SUMMARY_VERSION,
+                "covers": base + covers,
+                "fingerprint": _fingerprint(history, covers),
+                "summary": summary,
+            }
+            self._save(new_state)
+            with self._lock:
+                self._state = new_state
+
+        if covers == start:
+            return False
+        print(f"📝 Summarized messages {start}-{covers} of the conversation")
+        if covers < target:
+            self.schedule()
+        return True
+
+    def cancel(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+
+# --- Shared summarizer ---
+_summarizer = None
+_summarizer_lock = threading.Lock()
+
+
+def get_summarizer():
+    global _summarizer
+    with _summarizer_lock:
+        if _summarizer is None:
+            _summarizer = ConversationSummarizer()
+        return _summarizer
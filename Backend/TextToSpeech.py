@@ -1,30 +1,48 @@
-import pygame
-import asyncio
-import edge_tts
 import os
 import threading
 import time
 import uuid
 
 POST_PLAYBACK_DELAY = 0.05  # 50 ms
+TTS_BACKEND = os.getenv("TTS_BACKEND", "edge")  # "null" = stay silent (offline benchmarks)
 tts_is_playing = threading.Event()
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "Data")
-os.makedirs(DATA_DIR, exist_ok=True)
 
-pygame.mixer.init()
+pygame = None
+_data_dir_ready = False
+_mixer_lock = threading.Lock()
 playback_thread = None
 playback_stop_event = threading.Event()
+speaker_lock = threading.RLock()  # one voice at a time: held for a whole clip or a whole pipelined answer
+
+def get_pygame():
+    """Import pygame and initialise the mixer on first use (both are slow at startup)."""
+    global pygame
+    with _mixer_lock:
+        if pygame is None:
+            import pygame as _pygame
+            _pygame.mixer.init()
+            pygame = _pygame
+    return pygame
 
 def generate_unique_filepath():
+    """Path for a new clip; the audio directory is created on the first synthesis, not at import."""
+    global _data_dir_ready
+    if not _data_dir_ready:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        _data_dir_ready = True
     return os.path.join(DATA_DIR, f"speech_{uuid.uuid4().hex}.mp3")
 
 async def create_tts_audio(text, filepath):
+    import edge_tts
     AssistantVoice = "en-CA-LiamNeural"  # or load from .env as before
     communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+13%')
     await communicate.save(filepath)
 
 def play_audio(filepath, stop_event, on_complete=None):
+    pygame = get_pygame()
+    speaker_lock.acquire()
     try:
         if pygame.mixer.music.get_busy():
             pygame.mixer.music.stop()
@@ -38,6 +56,7 @@ def play_audio(filepath, stop_event, on_complete=None):
     except Exception as e:
         print(f"Playback error: {e}")
     finally:
+        speaker_lock.release()
         time.sleep(POST_PLAYBACK_DELAY)
         try:
             if pygame.mixer.get_init():
@@ -70,11 +89,13 @@ def TTS(text, func=lambda: True, on_complete=None):
         audio_file = generate_unique_filepath()
 
         try:
+            import asyncio
             asyncio.run(create_tts_audio(text, audio_file))
         except Exception as e:
             print(f"Error generating speech: {e}")
             return False
 
+        pygame = get_pygame()
         playback_thread = threading.Thread(target=play_audio, args=(audio_file, playback_stop_event, on_complete))
         playback_thread.start()
 
@@ -90,4 +111,8 @@ def TTS(text, func=lambda: True, on_complete=None):
         tts_is_playing.clear()
 
 def TextToSpeech(text, on_complete=None):
+    if TTS_BACKEND == "null":
+        if on_complete:
+            on_complete()
+        return
     TTS(text, on_complete=on_complete)
@@ -0,0 +1,78 @@
+"""Per-turn chat history overhead: legacy JSON rewrite vs. the conversation store.
+
+Usage: python Benchmarks/ChatStoreBench.py [--turns N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Backend"))
+
+from ChatLog import ChatJournal, ConversationStore
+
+HISTORY_SIZES = [100, 1_000, 10_000, 50_000]
+
+
+def make_history(n):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "lorem ipsum " * 8}
+        for i in range(n)
+    ]
+
+
+def legacy_turn(path):
+    """What every turn cost before: parse the whole file, append, rewrite it."""
+    with open(path, "r", encoding="utf-8") as f:
+        messages = json.load(f)
+    messages.append({"role": "user", "content": "hello"})
+    messages.append({"role": "assistant", "content": "Hello! How can I help?"})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(messages, f, indent=4)
+
+
+def bench_legacy(tmp, history, turns):
+    path = os.path.join(tmp, "legacy.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=4)
+    start = time.perf_counter()
+    for _ in range(turns):
+        legacy_turn(path)
+    return (time.perf_counter() - start) / turns
+
+
+def bench_store(tmp, history, turns):
+    # no rotation: measure the steady-state cost at this history size
+    journal = ChatJournal(path=os.path.join(tmp, "ChatLog.jsonl"), legacy_path=os.path.join(tmp, "none.json"),
+                          max_records=sys.maxsize, max_bytes=sys.maxsize)
+    journal.append(*history)
+    store = ConversationStore(journal=journal)
+    start = time.perf_counter()
+    for _ in range(turns):
+        store.append_turn({"role": "user", "content": "hello"},
+                          {"role": "assistant", "content": "Hello! How can I help?"})
+    store.flush()  # include the cost of getting every turn to disk
+    elapsed = (time.perf_counter() - start) / turns
+    store.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'history':>10} {'legacy ms/turn':>16} {'store ms/turn':>15} {'speedup':>9}")
+    for size in HISTORY_SIZES:
+        history = make_history(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = bench_legacy(tmp, history, args.turns)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = bench_store(tmp, history, args.turns)
+        print(f"{size:>10} {legacy * 1000:>16.3f} {store * 1000:>15.3f} {legacy / store:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
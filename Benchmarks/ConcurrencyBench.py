@@ -0,0 +1,68 @@
+"""Offline throughput benchmark for ChatBotAsync and RealtimeSearchEngineAsync.
+
+Usage: python Benchmarks/ConcurrencyBench.py [--concurrency 16] [--ttft 0.3] [--tps 120]
+
+Runs one query on its own, then N queries concurrently on one event loop,
+against Benchmarks/FakeGroq.py. With the async clients the N queries should
+finish in close to single-query wall time (ratio near 1.0x, not N x). The
+shared rate limiter is lifted for the run so it measures concurrency, not
+the request quota, and the connection pool is sized to N.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.extend([os.path.join(os.path.dirname(BENCH_DIR), "Backend"), BENCH_DIR])
+
+from FakeGroq import FakeGroqServer
+
+
+async def timed(coro_fn, queries):
+    start = time.perf_counter()
+    await asyncio.gather(*(coro_fn(q) for q in queries))
+    return time.perf_counter() - start
+
+
+async def run(name, coro_fn, concurrency):
+    single = await timed(coro_fn, [f"warm up {name}"])  # also opens the connection pool
+    single = await timed(coro_fn, [f"single {name}"])
+    many = await timed(coro_fn, [f"concurrent {name} #{i}" for i in range(concurrency)])
+    print(f"  {name:<28} 1 query {single * 1000:8.1f} ms   {concurrency} queries {many * 1000:8.1f} ms   "
+          f"ratio {many / single:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--ttft", type=float, default=0.3)
+    parser.add_argument("--tps", type=float, default=120.0)
+    parser.add_argument("--search-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with FakeGroqServer(ttft=args.ttft, tokens_per_sec=args.tps, search_latency=args.search_latency) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.environ.update(server.offline_env(), GROQ_REQUESTS_PER_MINUTE="100000",
+                          GROQ_BURST=str(args.concurrency * 4), GROQ_MAX_CONNECTIONS=str(args.concurrency))
+        os.chdir(workdir)
+
+        # Imported only now so they pick up the offline configuration.
+        from Chatbot import ChatBotAsync
+        from RealtimeSearchEngine import RealtimeSearchEngineAsync
+
+        async def bench():
+            await run("ChatBotAsync", ChatBotAsync, args.concurrency)
+            await run("RealtimeSearchEngineAsync", RealtimeSearchEngineAsync, args.concurrency)
+
+        print(f"Fake Groq at {server.url} (ttft {args.ttft}s, {args.tps} tokens/s)\n")
+        asyncio.run(bench())
+
+        from ChatLog import shutdown_conversation_store
+        shutdown_conversation_store()
+
+
+if __name__ == "__main__":
+    main()
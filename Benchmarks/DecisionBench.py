@@ -0,0 +1,95 @@
+"""Routing accuracy on the labelled corpus and batch throughput of Model.classify_batch.
+
+Usage: python Benchmarks/DecisionBench.py [--size 200000] [--processes 4] [--log queries.txt]
+
+Benchmarks/Fixtures/LabeledQueries.jsonl holds hand-labelled queries with
+the decisions the assistant should take, as [category, argument] pairs.
+Accuracy is reported per query, on exact decisions and on categories only.
+Throughput replays a log one FirstLayerDMM call at a time, through
+classify_batch with and without its memo of repeated queries, and through
+classify_batch with a process pool. Without --log two synthetic logs of
+--size queries bound the memo's effect: the corpus cycled (every query
+repeats) and the corpus with a counter appended (no query repeats). A real
+log sits between the two; its distinct share is printed with the results.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(BENCH_DIR, "Fixtures", "LabeledQueries.jsonl")
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "Backend"))
+
+from Model import FirstLayerDMM, classify_batch
+
+
+def load_labels(path=CORPUS_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row["query"], tuple(tuple(d) for d in row["decisions"])) for row in rows]
+
+
+def accuracy(labels, predictions):
+    """(exact decision accuracy, category accuracy, wrong [(query, got, want)])"""
+    exact = categories = 0
+    wrong = []
+    for (query, want), got in zip(labels, predictions):
+        exact += got == want
+        same_categories = [c for c, _ in got] == [c for c, _ in want]
+        categories += same_categories
+        if not same_categories:
+            wrong.append((query, got, want))
+    return exact / len(labels), categories / len(labels), wrong
+
+
+def timed(run, queries):
+    start = time.perf_counter()
+    count = sum(1 for _ in run(queries))
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000, help="replayed queries when no --log is given")
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--log", help="query log to replay, one query per line")
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    labels = load_labels()
+    exact, categories, wrong = accuracy(labels, classify_batch(q for q, _ in labels))
+    print(f"{len(labels)} labelled queries: {exact:.1%} exact decisions, {categories:.1%} categories")
+    if args.show_errors:
+        for query, got, want in wrong:
+            print(f"  ❌ {query!r}: {[c for c, _ in got]} (want {[c for c, _ in want]})")
+
+    if args.log:
+        with open(args.log, "r", encoding="utf-8") as f:
+            logs = [(args.log, [line.rstrip("\r\n") for line in f])]
+    else:
+        cycled = list(itertools.islice(itertools.cycle(q for q, _ in labels), args.size))
+        logs = [("corpus cycled", cycled), ("all distinct", [f"{q} #{i}" for i, q in enumerate(cycled)])]
+
+    rows = [
+        ("FirstLayerDMM loop", lambda qs: (FirstLayerDMM(q) for q in qs)),
+        ("classify_batch, no memo", lambda qs: classify_batch(qs, memo=False)),
+        ("classify_batch", classify_batch),
+    ]
+    if args.processes > 1:
+        rows.append((f"batch, {args.processes} procs", lambda qs: classify_batch(qs, processes=args.processes)))
+    for name, queries in logs:
+        distinct = len(set(queries))
+        print(f"\n{name}: {len(queries):,} queries, {distinct:,} distinct ({distinct / len(queries):.1%})\n")
+        print(f"  {'mode':<26}{'queries/s':>12}")
+        baseline = None
+        for mode, run in rows:
+            qps = timed(run, queries)
+            baseline = baseline or qps
+            print(f"  {mode:<26}{qps:12,.0f}   {qps / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Parse time and accuracy of the Google result extractors on saved pages.
+
+Usage: python Benchmarks/ExtractorBench.py [--repeat 20] [extractor ...]
+
+Pages live in Benchmarks/Fixtures/SearchPages with the hand-labelled top
+results in expected.json. They follow Google's result markup (div.g / h3 /
+VwiC3b), including ads, "people also ask", sitelinks with nested div.g, a
+carousel without a title and a consent page, plus the inline scripts and
+styles that make real pages large. Accuracy counts matching title, link
+and description fields against the labels (whitespace collapsed).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES_DIR = os.path.join(BENCH_DIR, "Fixtures", "SearchPages")
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "Backend"))
+
+from ResultExtractor import EXTRACTORS, available_extractors
+
+FIELDS = ("title", "link", "description")
+
+
+def normalize(result):
+    return {field: " ".join(value.split()) for field, value in zip(FIELDS, result)}
+
+
+def score(results, expected):
+    """(matching fields, expected fields, page fully correct)"""
+    got = [normalize(r) for r in results]
+    matched = sum(
+        got[i][field] == want[field] for i, want in enumerate(expected) if i < len(got) for field in FIELDS
+    )
+    total = len(expected) * len(FIELDS)
+    return matched, total, got == expected
+
+
+def time_parse(extract, content, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(content, 3)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("extractors", nargs="*", default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(os.path.join(PAGES_DIR, "expected.json"), "r", encoding="utf-8") as f:
+        labels = json.load(f)
+    pages = {}
+    for name in sorted(labels):
+        with open(os.path.join(PAGES_DIR, name), "rb") as f:
+            pages[name] = f.read()
+    print(f"{len(pages)} pages, {sum(map(len, pages.values())) / 1024:.0f} KiB, median of {args.repeat} runs\n")
+
+    available = available_extractors()
+    names = args.extractors or list(EXTRACTORS)
+    print(f"  {'extractor':<12}{'ms/page':>10}{'vs bs4':>9}{'fields':>12}{'pages':>9}")
+    baseline = None
+    for name in names:
+        if name not in available:
+            print(f"  {name:<12}  (not installed)")
+            continue
+        extract = EXTRACTORS[name][0]
+        per_page, matched, total, exact = [], 0, 0, 0
+        for page, content in pages.items():
+            m, t, ok = score(extract(content, 3), labels[page]["expected"])
+            matched, total, exact = matched + m, total + t, exact + ok
+            per_page.append(time_parse(extract, content, args.repeat))
+        ms = statistics.mean(per_page) * 1000
+        baseline = baseline or (ms if name == "bs4" else None)
+        speedup = f"{baseline / ms:7.1f}x" if baseline else "      -"
+        print(f"  {name:<12}{ms:10.2f}{speedup:>9}{matched:>7}/{total:<4}{exact:>5}/{len(pages)}")
+
+
+if __name__ == "__main__":
+    main()
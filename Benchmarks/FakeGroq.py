@@ -0,0 +1,290 @@
+"""Offline stand-in for the Groq chat-completions API, the search providers and result pages.
+
+Usage:
+    python Benchmarks/FakeGroq.py [--port 8765] [--ttft 0.3] [--tps 120]
+                                  [--record FILE | --replay FILE]
+
+Then point the assistant at it:
+    GROQ_BASE_URL=http://127.0.0.1:8765  SEARCH_BASE_URL=http://127.0.0.1:8765
+    DDG_BASE_URL=http://127.0.0.1:8765  WIKIPEDIA_BASE_URL=http://127.0.0.1:8765  TTS_BACKEND=null
+
+--record forwards each request once to the real API (GroqAPIKey from the
+environment) and stores the answer; --replay serves stored answers and falls
+back to a generated reply for unknown requests. Both modes pace the output
+with the configured time-to-first-token and tokens/sec.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+UPSTREAM_URL = "https://api.groq.com/openai/v1/chat/completions"
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+WIKIPEDIA_SUMMARY_PATH = "/api/rest_v1/page/summary/"
+ARTICLE_PATH = "/article/"
+_TOKEN_RE = re.compile(r"\S+\s*")
+
+
+def request_key(body):
+    """Recordings are keyed on what determines the answer, not on stream/timeout flags."""
+    relevant = {k: body.get(k) for k in ("model", "messages", "temperature", "max_tokens", "top_p")}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def generated_reply(body):
+    """Deterministic answer derived from the last user message."""
+    last = next((m.get("content", "") for m in reversed(body.get("messages", [])) if m.get("role") == "user"), "")
+    return (f"This is an offline answer to: {last.strip()}. "
+            "The fake server streams it token by token. "
+            "It exists so latency and throughput can be measured without network access.")
+
+
+class RecordReplay:
+    """JSON file of request_key -> answer text."""
+
+    def __init__(self, path, record=False):
+        self.path = path
+        self.record = record
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.answers = json.load(f)
+        except (OSError, ValueError):
+            self.answers = {}
+
+    def answer(self, body):
+        key = request_key(body)
+        with self._lock:
+            if key in self.answers:
+                return self.answers[key]
+        if not self.record:
+            return None
+        text = self._fetch_upstream(body)
+        with self._lock:
+            self.answers[key] = text
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.answers, f, ensure_ascii=False, indent=4)
+        return text
+
+    def _fetch_upstream(self, body):
+        api_key = os.getenv("GroqAPIKey") or os.getenv("GROQ_API_KEY")
+        payload = dict(body, stream=False)
+        req = urllib.request.Request(
+            UPSTREAM_URL, data=json.dumps(payload).encode("utf-8"),
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            return json.load(resp)["choices"][0]["message"]["content"]
+
+
+def search_page(query, results=5, base_url="https://example.com"):
+    """Google-style result markup (div.g / h3 / VwiC3b) for GoogleSearch."""
+    items = "".join(
+        f'<div class="g"><a href="{base_url}{ARTICLE_PATH}g{i}/{urllib.parse.quote(query)}"><h3>'
+        f'{html.escape(query)} result {i}</h3></a><div class="VwiC3b">Offline snippet {i} about '
+        f'{html.escape(query)}. Latest figures and background information.</div></div>'
+        for i in range(1, results + 1)
+    )
+    return f"<html><body><div id=\"search\">{items}</div></body></html>"
+
+
+def ddg_page(query, results=5, base_url="https://example.org"):
+    """DuckDuckGo HTML-endpoint markup (div.result / a.result__a / .result__snippet)."""
+    items = "".join(
+        f'<div class="result"><h2><a class="result__a" href="//duckduckgo.com/l/?uddg='
+        f'{urllib.parse.quote(f"{base_url}{ARTICLE_PATH}d{i}/{query}", safe="")}">{html.escape(query)} '
+        f'page {i}</a></h2><a class="result__snippet">DuckDuckGo fixture snippet {i} for '
+        f'{html.escape(query)}, with enough text to count as a good result.</a></div>'
+        for i in range(1, results + 1)
+    )
+    return f"<html><body><div class=\"results\">{items}</div></body></html>"
+
+
+def article_page(slug):
+    """A result page: navigation and footer chrome around a few paragraphs on the query."""
+    topic = html.escape(urllib.parse.unquote(slug.split("/", 1)[-1]))
+    paragraphs = "".join(
+        f"<p>Paragraph {i} on {topic}: the offline article gives figures, dates and names that a "
+        f"snippet would cut off, so the answer can cite specifics instead of guessing.</p>"
+        for i in range(1, 6)
+    )
+    nav = "".join(f'<a href="/section/{i}">Section {i}</a>' for i in range(12))
+    return (f"<html><head><script>var tracking = {{}};</script><style>p {{ margin: 0 }}</style></head><body>"
+            f"<header><nav>{nav}</nav></header><article><h1>{topic}</h1>{paragraphs}</article>"
+            f"<aside>Related: more about {topic}</aside><footer>Copyright, privacy and terms</footer></body></html>")
+
+
+def wikipedia_summary(title, base_url="https://en.wikipedia.org"):
+    """Wikipedia REST page-summary JSON."""
+    name = urllib.parse.unquote(title).replace("_", " ")
+    return {
+        "type": "standard", "title": name,
+        "extract": f"{name} is described here by the offline Wikipedia fixture, in a single summary paragraph.",
+        "content_urls": {"desktop": {"page": f"{base_url}{ARTICLE_PATH}w/{title}"}},
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default backlog of 5 stalls concurrent benchmarks on SYN retries
+
+
+class FakeGroqServer:
+    """Threaded local server; use as a context manager or start()/stop()."""
+
+    def __init__(self, host="127.0.0.1", port=0, ttft=0.3, tokens_per_sec=120.0, replay=None, search_latency=0.0):
+        self.ttft = ttft
+        self.tokens_per_sec = tokens_per_sec
+        self.replay = replay
+        self.search_latency = search_latency
+        self.requests = 0
+        self._server = _Server((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def offline_env(self):
+        """Environment that points every backend at this server."""
+        return dict(GROQ_BASE_URL=self.url, SEARCH_BASE_URL=self.url, DDG_BASE_URL=self.url,
+                    WIKIPEDIA_BASE_URL=self.url, TTS_BACKEND="null")
+
+    def reply_for(self, body):
+        text = self.replay.answer(body) if self.replay else None
+        return text if text is not None else generated_reply(body)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(url.query).get("q", [""])[0]
+                if url.path == "/search":
+                    page = search_page(query, base_url=server.url)
+                elif url.path.rstrip("/") == "/html":
+                    page = ddg_page(query, base_url=server.url)
+                elif url.path.startswith(ARTICLE_PATH):
+                    page = article_page(url.path[len(ARTICLE_PATH):])
+                elif url.path.startswith(WIKIPEDIA_SUMMARY_PATH):
+                    time.sleep(server.search_latency)
+                    summary = wikipedia_summary(url.path[len(WIKIPEDIA_SUMMARY_PATH):], server.url)
+                    return self._send(200, "application/json", json.dumps(summary).encode("utf-8"))
+                else:
+                    return self._send(404, "text/plain", b"not found")
+                time.sleep(server.search_latency)
+                self._send(200, "text/html; charset=utf-8", page.encode("utf-8"))
+
+            def do_POST(self):
+                if self.path.rstrip("/") != COMPLETIONS_PATH:
+                    return self._send(404, "application/json", b'{"error": "not found"}')
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.requests += 1
+                text = server.reply_for(body)
+                tokens = _TOKEN_RE.findall(text) or [text]
+                time.sleep(server.ttft)
+                if body.get("stream"):
+                    self._stream(body, tokens)
+                else:
+                    time.sleep(max(0, len(tokens) - 1) / server.tokens_per_sec)
+                    self._send(200, "application/json", json.dumps(self._completion(body, text, len(tokens))).encode())
+
+            def _completion(self, body, text, n_tokens):
+                return {
+                    "id": f"chatcmpl-fake-{server.requests}", "object": "chat.completion",
+                    "created": int(time.time()), "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": n_tokens, "total_tokens": n_tokens},
+                }
+
+            def _stream(self, body, tokens):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                base = {"id": f"chatcmpl-fake-{server.requests}", "object": "chat.completion.chunk",
+                        "created": int(time.time()), "model": body.get("model", "fake")}
+                try:
+                    for i, token in enumerate(tokens):
+                        if i:
+                            time.sleep(1.0 / server.tokens_per_sec)
+                        chunk = dict(base, choices=[{"index": 0, "delta": {"content": token}, "finish_reason": None}])
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                    done = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+                    self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client cancelled mid-stream
+                self.close_connection = True
+
+            def _send(self, status, content_type, payload):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up, e.g. a search provider cut off by the deadline
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--tps", type=float, default=120.0, help="tokens per second after the first")
+    parser.add_argument("--search-latency", type=float, default=0.0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="FILE")
+    mode.add_argument("--replay", metavar="FILE")
+    args = parser.parse_args()
+
+    replay = None
+    if args.record or args.replay:
+        replay = RecordReplay(args.record or args.replay, record=bool(args.record))
+    server = FakeGroqServer(args.host, args.port, args.ttft, args.tps, replay, args.search_latency)
+    print(f"Fake Groq listening on {server.url}")
+    print("  " + " ".join(f"{k}={v}" for k, v in server.offline_env().items()))
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Summarized `python -X importtime` report for the assistant's modules.
+
+Usage: python Benchmarks/ImportProfile.py [module ...] [--top N] [--budget-ms MS]
+
+Each module is imported in a fresh interpreter (Backend/ on sys.path, like
+Main.py sets up). The report lists total import time and the slowest
+imports by cumulative and self time. With --budget-ms the script exits with
+status 1 if any module exceeds the budget, so it can gate regressions.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "Backend")
+DEFAULT_MODULES = ["Model", "Chatbot", "RealtimeSearchEngine", "TextToSpeech", "SpeechToText", "Automation"]
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_module(module):
+    """Return ([(name, self_us, cumulative_us, depth)], error_text) for one fresh import."""
+    paths = [BACKEND_DIR, ROOT_DIR, os.environ.get("PYTHONPATH", "")]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in paths if p))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT_DIR, env=env
+    )
+    rows, errors = [], []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+        elif not line.startswith("import time:"):
+            errors.append(line)
+    return rows, ("\n".join(errors) if proc.returncode else "")
+
+
+def summarize(module, rows, top):
+    total = next((cum for name, _, cum, _ in reversed(rows) if name == module), sum(r[1] for r in rows))
+    print(f"\n=== {module}: {total / 1000:.1f} ms, {len(rows)} modules ===")
+    print("  slowest by cumulative time:")
+    for name, _, cum, depth in sorted((r for r in rows if r[3] <= 1 and r[0] != module),
+                                      key=lambda r: -r[2])[:top]:
+        print(f"    {cum / 1000:8.1f} ms  {name}")
+    print("  slowest by self time:")
+    for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"    {self_us / 1000:8.1f} ms  {name}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        rows, error = profile_module(module)
+        if error:
+            print(f"\n=== {module}: import failed ===\n{error}")
+            over_budget.append(module)
+            continue
+        total = summarize(module, rows, args.top)
+        if args.budget_ms is not None and total / 1000 > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"\n❌ Over budget or failed: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Offline latency benchmark for ChatBot, RealtimeSearchEngine and handle_action.
+
+Usage: python Benchmarks/LatencyBench.py [--runs 10] [--ttft 0.3] [--tps 120] [--replay FILE]
+
+Starts Benchmarks/FakeGroq.py in-process, points the backend at it through
+GROQ_BASE_URL, the search provider base URLs and TTS_BACKEND=null, and
+reports p50/p95 of time-to-first-token and total time. Runs inside a
+temporary working directory, so the real Data/ chat log is never touched.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.extend([os.path.join(os.path.dirname(BENCH_DIR), "Backend"), BENCH_DIR])
+
+from FakeGroq import FakeGroqServer, RecordReplay
+
+QUERIES = ["tell me a joke", "explain recursion simply", "what should I cook tonight", "how do planes fly"]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def report(name, samples):
+    for metric in samples[0]:
+        values = [s[metric] * 1000 for s in samples]
+        print(f"  {name:<28} {metric:<6} p50 {percentile(values, 50):8.1f} ms   "
+              f"p95 {percentile(values, 95):8.1f} ms   mean {statistics.mean(values):8.1f} ms")
+
+
+def timed_stream(deltas):
+    start = time.perf_counter()
+    first = None
+    for _ in deltas:
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return {"ttft": first if first is not None else total, "total": total}
+
+
+def timed_call(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return {"total": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--ttft", type=float, default=0.3)
+    parser.add_argument("--tps", type=float, default=120.0)
+    parser.add_argument("--replay", metavar="FILE")
+    args = parser.parse_args()
+
+    replay = RecordReplay(os.path.abspath(args.replay)) if args.replay else None
+    with FakeGroqServer(ttft=args.ttft, tokens_per_sec=args.tps, replay=replay) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.environ.update(server.offline_env())
+        os.chdir(workdir)
+
+        # Imported only now so they pick up the offline configuration.
+        from Chatbot import ChatBotStream
+        from RealtimeSearchEngine import RealtimeSearchEngineStream
+        from PageEnricher import enable_page_enricher
+        from Automation import handle_action
+
+        queries = [QUERIES[i % len(QUERIES)] + f" #{i}" for i in range(args.runs)]
+        print(f"Fake Groq at {server.url} (ttft {args.ttft}s, {args.tps} tokens/s), {args.runs} runs\n")
+        report("ChatBotStream", [timed_stream(ChatBotStream(q)) for q in queries])
+        report("RealtimeSearchEngineStream", [timed_stream(RealtimeSearchEngineStream(q)) for q in queries])
+        enable_page_enricher()
+        report("RealtimeSearchEngine+pages", [timed_stream(RealtimeSearchEngineStream(f"{q} pages")) for q in queries])
+        report("handle_action(general)", [timed_call(handle_action, f"general {q}") for q in queries])
+
+        from ChatLog import shutdown_conversation_store
+        shutdown_conversation_store()
+
+
+if __name__ == "__main__":
+    main()
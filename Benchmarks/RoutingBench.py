@@ -0,0 +1,117 @@
+"""Model.classify_query: legacy substring scans vs. the compiled word-boundary matchers.
+
+Usage: python Benchmarks/RoutingBench.py [--repeat 50]
+
+Both classifiers run over the golden corpus in Benchmarks/Fixtures/RoutingCorpus.jsonl.
+Every query must route to its "expected" decision. Queries marked
+"legacy_differs" are the substring false positives of the old code ("now" in
+"know", "game" in "endgame"); the legacy decision is listed for them.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(BENCH_DIR, "Fixtures", "RoutingCorpus.jsonl")
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "Backend"))
+
+from Model import DATE_TIME_KEYWORDS, EXIT_PHRASES, REALTIME_KEYWORDS, classify_query
+
+
+def legacy_classify_query(query: str) -> str:
+    """classify_query as it was before the compiled matchers (kept verbatim for comparison)."""
+    q = query.lower().strip()
+    q_nopunct = re.sub(r"[^\w\s]", "", q)
+
+    if any(phrase in q_nopunct.split() for phrase in EXIT_PHRASES):
+        return "exit"
+
+    if q_nopunct.startswith("google "):
+        return f'google search {query[7:].strip()}'
+    if q_nopunct.startswith("search google for "):
+        return f'google search {query[17:].strip()}'
+    if q_nopunct.startswith("youtube "):
+        return f'youtube search {query[8:].strip()}'
+    if q_nopunct.startswith("search youtube for "):
+        return f'youtube search {query[18:].strip()}'
+
+    for act in ["open", "close", "play", "system"]:
+        if q_nopunct.startswith(act + " "):
+            items = re.split(r"\s*,\s*|\s+and\s+", query[len(act):].strip())
+            actions = [f"{act} {item.strip()}" for item in items if item.strip()]
+            return ", ".join(actions)
+
+    if "remind" in q_nopunct or "reminder" in q_nopunct:
+        m = re.search(r'remind(?:er)?(?: me)?(?: on| at)?\s*(.*)', query, re.IGNORECASE)
+        arg = m.group(1).strip() if m and m.group(1).strip() else query
+        return f'reminder {arg}'
+
+    if any(word in q_nopunct for word in REALTIME_KEYWORDS):
+        return f'realtime {query}'
+    entity_patterns = [r"^(who|what) is ([^?]+)\??$", r"^(tell me about|information about) ([^?]+)\??$"]
+    for pat in entity_patterns:
+        m = re.match(pat, q_nopunct)
+        if m:
+            subject = m.group(2).strip()
+            if len(subject.split()) > 1 or any(w[0].isupper() for w in subject.split() if w):
+                return f'realtime {query}'
+            return f'general {query}'
+    if any(word in q_nopunct for word in DATE_TIME_KEYWORDS):
+        return f'general {query}'
+    return f'general {query}'
+
+
+def load_corpus():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check(corpus):
+    """Print every mismatch; returns the number of problems."""
+    problems = 0
+    for case in corpus:
+        got = classify_query(case["query"])
+        if got != case["expected"]:
+            problems += 1
+            print(f"  ❌ {case['query']!r}: {got!r} != expected {case['expected']!r}")
+        legacy = legacy_classify_query(case["query"])
+        want_legacy = case.get("legacy", case["expected"]) if case.get("legacy_differs") else case["expected"]
+        if legacy != want_legacy:
+            problems += 1
+            print(f"  ❌ legacy {case['query']!r}: {legacy!r} != {want_legacy!r}")
+    return problems
+
+
+def queries_per_second(classify, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            classify(q)
+    return repeat * len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    differs = sum(bool(c.get("legacy_differs")) for c in corpus)
+    print(f"{len(corpus)} queries, {differs} legacy substring false positives\n")
+    problems = check(corpus)
+    print(f"  golden corpus: {'✅ all match' if not problems else f'{problems} mismatches'}\n")
+
+    queries = [c["query"] for c in corpus]
+    legacy = queries_per_second(legacy_classify_query, queries, args.repeat)
+    compiled = queries_per_second(classify_query, queries, args.repeat)
+    print(f"  {'classifier':<12}{'queries/s':>12}")
+    print(f"  {'legacy':<12}{legacy:12,.0f}")
+    print(f"  {'compiled':<12}{compiled:12,.0f}   {compiled / legacy:.1f}x")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,12 +20,17 @@ sys.path.extend([backend_dir, parent_dir])
 
 # Import backend modules with fallback dummies
 try:
-    from Backend.Automation import FirstLayerDMM, handle_action, TextToSpeech, SpeechToTextSystem
+    from Backend.Automation import plan_utterance, execute_plan, TextToSpeech, SpeechToTextSystem
+    from ActionExecutor import get_action_executor
+
+    def run_plans(plans, execute, cancelled=None):
+        return get_action_executor().run(plans, execute, cancelled)
 except ImportError:
     print("Backend.Automation import failed; loading dummy implementations.")
 
-    def FirstLayerDMM(*args): return ["general Hello! I'm your AI assistant."]
-    def handle_action(*args): return "Automation system ready"
+    def plan_utterance(*args): return [("general", "Hello! I'm your AI assistant.")]
+    def execute_plan(*args, **kwargs): return "Automation system ready"
+    def run_plans(plans, execute, cancelled=None): return [execute(plan) for plan in plans]
     def TextToSpeech(*args):
         if not app_shutting_down:
             print(f"TTS: {args[0] if args else 'No text'}")
@@ -78,6 +83,7 @@ def safe_text_to_speech(text):
 # Worker threads
 class AutomationWorker(QThread):
     response_signal = pyqtSignal(str)
+    delta_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
     finished_signal = pyqtSignal()
 
@@ -89,17 +95,14 @@ class AutomationWorker(QThread):
         if app_shutting_down:
             return
         try:
-            decisions = FirstLayerDMM(self.command_text)
-            responses = []
-            for act in decisions:
-                if app_shutting_down:
-                    return
-                res = handle_action(act, self.command_text)
-                if res == "EXIT":
-                    self.response_signal.emit("EXIT")
-                    break
-                if res:
-                    responses.append(res)
+            plans = plan_utterance(self.command_text)
+            results = run_plans(plans, lambda plan: execute_plan(plan, self.command_text, on_delta=self.delta_signal.emit),
+                                cancelled=lambda: app_shutting_down)
+            if app_shutting_down:
+                return
+            if "EXIT" in results:
+                self.response_signal.emit("EXIT")
+            responses = [res for res in results if res and res != "EXIT"]
             self.response_signal.emit("\n".join(responses) if responses else "Command executed successfully.")
         except Exception as e:
             if not app_shutting_down:
@@ -162,6 +165,7 @@ class ChatSection(QWidget):
         super().__init__()
         self.speech_worker = None
         self.automation_workers = []
+        self.streamed_text = {}  # worker -> answer text already shown while streaming
         self.tts_in_progress = False  # Flag to prevent looping TTS calls
         self._setup_ui()
         self._setup_timers()
@@ -352,14 +356,31 @@ class ChatSection(QWidget):
             return
         worker = AutomationWorker(command_text)
         worker.response_signal.connect(self.handle_automation_response)
+        worker.delta_signal.connect(self.handle_automation_delta)
         worker.error_signal.connect(self.handle_automation_error)
         worker.finished_signal.connect(lambda: self.on_automation_worker_finished(worker))
         self.automation_workers.append(worker)
         worker.start()
         self.update_status("Processing command...")
 
+    def handle_automation_delta(self, delta):
+        if app_shutting_down:
+            return
+        worker = self.sender()
+        if worker not in self.streamed_text:
+            self.streamed_text[worker] = ""
+            self.addMessage("JARVIS: ", color='white', newline=False)
+            self.update_status("Answering...")
+        self.streamed_text[worker] += delta
+        self.addMessage(delta, color='white', newline=False, new_block=False)
+
     def handle_automation_response(self, response):
         print(f"[DEBUG] Response received in GUI: {response!r}")
+        streamed = self.streamed_text.pop(self.sender(), None)
+        if streamed is not None:
+            # Close the streamed line; only show what was not streamed already
+            self.addMessage("", color='white', new_block=False)
+            response_rest = response.replace(streamed, "", 1).strip()
         if app_shutting_down or self.tts_in_progress:
             return
         if response == "EXIT":
@@ -377,7 +398,10 @@ class ChatSection(QWidget):
         except Exception as e:
             print(f"TTS thread error: {e}")
 
-        self.addMessage(f"JARVIS: {response}", color='white')
+        if streamed is None:
+            self.addMessage(f"JARVIS: {response}", color='white')
+        elif response_rest:
+            self.addMessage(f"JARVIS: {response_rest}", color='white')
         self.update_status("Ready")
 
     def initiate_shutdown(self):
@@ -396,6 +420,7 @@ class ChatSection(QWidget):
             self.update_status("Error occurred")
 
     def on_automation_worker_finished(self, worker):
+        self.streamed_text.pop(worker, None)
         if worker in self.automation_workers:
             self.automation_workers.remove(worker)
 
@@ -422,16 +447,18 @@ class ChatSection(QWidget):
             if not (self.speech_worker and self.speech_worker.isRunning()):
                 self.status_label.setText("Ready")
 
-    def addMessage(self, message, color):
+    def addMessage(self, message, color, newline=True, new_block=True):
         cursor = self.chat_text_edit.textCursor()
+        cursor.movePosition(cursor.End)
         fmt = QTextCharFormat()
-        block_fmt = QTextBlockFormat()
-        block_fmt.setTopMargin(10)
-        block_fmt.setLeftMargin(10)
         fmt.setForeground(QColor(color))
         cursor.setCharFormat(fmt)
-        cursor.setBlockFormat(block_fmt)
-        cursor.insertText(message + "\n")
+        if new_block:
+            block_fmt = QTextBlockFormat()
+            block_fmt.setTopMargin(10)
+            block_fmt.setLeftMargin(10)
+            cursor.setBlockFormat(block_fmt)
+        cursor.insertText(message + ("\n" if newline else ""))
         self.chat_text_edit.setTextCursor(cursor)
         self.chat_text_edit.ensureCursorVisible()
 
@@ -754,6 +781,21 @@ class MainWindow(QMainWindow):
 def cleanup_on_shutdown():
     global app_shutting_down
     app_shutting_down = True
+    try:
+        from Prefetcher import stop_prefetcher
+        stop_prefetcher()
+        from LocalAnswers import cancel_timers
+        cancel_timers()
+        from ActionExecutor import get_action_executor
+        get_action_executor().shutdown()
+        from DecisionCache import get_decision_cache
+        cache = get_decision_cache()
+        if cache is not None:
+            cache.save()
+        from ChatLog import shutdown_conversation_store
+        shutdown_conversation_store()
+    except Exception as e:
+        print(f"Chat history flush failed: {e}")
     print("Application shutdown cleanup completed")
 
 atexit.register(cleanup_on_shutdown)
@@ -763,6 +805,21 @@ def GraphicalUserInterface():
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    try:
+        from Prefetcher import start_prefetcher
+        start_prefetcher()
+    except Exception as e:
+        print(f"Prefetcher not started: {e}")
+    try:
+        from Backend.Automation import warm_decision_cache
+        warm_decision_cache()
+    except Exception as e:
+        print(f"Decision cache not warmed: {e}")
+    try:
+        from LocalAnswers import set_timer_callback
+        set_timer_callback(safe_text_to_speech)
+    except Exception as e:
+        print(f"Timers will not be announced: {e}")
     try:
         sys.exit(app.exec_())
     except SystemExit:
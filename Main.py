@@ -1,6 +1,7 @@
 import os
 import sys
 import traceback
+import importlib.util
 
 
 def setup_paths():
@@ -19,30 +20,29 @@ def setup_paths():
 
 
 def check_imports():
-    """Verify all critical Backend and Frontend modules import successfully."""
+    """Verify all critical modules and their dependencies can be found, without importing them."""
     print("Checking required module imports...\n")
 
-    backend_modules = [
-        'Model', 'Chatbot', 'RealtimeSearchEngine',
-        'SpeechToText', 'TextToSpeech', 'Automation'
-    ]
+    modules = {
+        'Backend.Model': ['Model', 'dotenv'],
+        'Backend.LLMClient': ['LLMClient', 'groq', 'httpx'],
+        'Backend.Chatbot': ['Chatbot', 'groq'],
+        'Backend.RealtimeSearchEngine': ['RealtimeSearchEngine', 'requests', 'bs4', 'pytz'],
+        'Backend.SpeechToText': ['SpeechToText', 'selenium', 'webdriver_manager', 'mtranslate'],
+        'Backend.TextToSpeech': ['TextToSpeech', 'pygame', 'edge_tts'],
+        'Backend.Automation': ['Automation'],
+        'Frontend.GUI': ['GUI', 'PyQt5'],
+    }
 
     all_imports_ok = True
 
-    for module in backend_modules:
-        try:
-            __import__(module)
-            print(f"✓ Backend.{module}")
-        except ImportError as e:
-            print(f"✗ Backend.{module}: {e}")
+    for label, names in modules.items():
+        missing = [name for name in names if importlib.util.find_spec(name) is None]
+        if missing:
+            print(f"✗ {label}: missing {', '.join(missing)}")
             all_imports_ok = False
-
-    try:
-        __import__('GUI')
-        print("✓ Frontend.GUI")
-    except ImportError as e:
-        print(f"✗ Frontend.GUI: {e}")
-        all_imports_ok = False
+        else:
+            print(f"✓ {label}")
 
     return all_imports_ok
 
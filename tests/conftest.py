@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# Backend modules import each other by bare name, as they do when Main.py runs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Backend"))
+
+
+@pytest.fixture(autouse=True)
+def scratch_cwd(tmp_path, monkeypatch):
+    """Data/ paths are relative to the working directory: keep what a test writes out of the repo"""
+    monkeypatch.chdir(tmp_path)
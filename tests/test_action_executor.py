@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from ActionExecutor import ActionExecutor, action_cancelled
+
+
+@pytest.fixture
+def executor():
+    created = []
+
+    def make(**kwargs):
+        created.append(ActionExecutor(**kwargs))
+        return created[-1]
+
+    yield make
+    for executor in created:
+        executor.shutdown()
+
+
+def test_hung_inline_action_is_cut_off_and_later_actions_run_in_order(executor):
+    actions = executor(timeouts={"general": 0.2})
+    release = threading.Event()
+    ran = []
+
+    def execute(plan):
+        if plan[1] == "hang":
+            release.wait(5)  # stuck: never checks its cancel flag
+        ran.append(plan[1])
+        return plan[1]
+
+    start = time.monotonic()
+    results = actions.run([("general", "hang"), ("general", "next"), ("system", "last")], execute)
+
+    assert time.monotonic() - start < 1.0
+    assert results == [None, "next", "last"]
+    assert ran == ["next", "last"]
+    assert actions.stats()["timeouts"] == 1
+    release.set()
+
+
+def test_overrunning_inline_action_sees_its_cancel_flag(executor):
+    actions = executor(timeouts={"general": 0.1})
+    stopped = threading.Event()
+
+    def execute(plan):
+        while not action_cancelled():
+            time.sleep(0.01)
+        stopped.set()
+
+    assert actions.run([("general", "long answer")], execute) == [None]
+    assert stopped.wait(1.0)
+    assert not action_cancelled()  # the flag belongs to the action's thread, not the caller's
+
+
+def test_independent_actions_run_together_and_results_keep_plan_order(executor):
+    actions = executor(max_workers=4)
+    delays = {"chrome": 0.3, "spotify": 0.1, "notepad": 0.2}
+
+    def execute(plan):
+        time.sleep(delays.get(plan[1], 0))
+        return f"{plan[0]} {plan[1]}"
+
+    start = time.monotonic()
+    results = actions.run([("open", "chrome"), ("open", "spotify"), ("open", "notepad")], execute)
+
+    assert time.monotonic() - start < 0.5  # the slowest app, not the sum
+    assert results == ["open chrome", "open spotify", "open notepad"]
+    assert actions.stats()["parallel_groups"] == 1
+
+
+def test_serialized_actions_wait_for_what_came_before(executor):
+    actions = executor()
+    log = []
+
+    def execute(plan):
+        log.append(("start", plan[1]))
+        time.sleep(0.05)
+        log.append(("end", plan[1]))
+        return plan[1]
+
+    actions.run([("open", "a"), ("general", "b"), ("open", "c")], execute)
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"), ("start", "c"), ("end", "c")]
+
+
+def test_pooled_timeout_cancels_actions_not_started(executor):
+    actions = executor(max_workers=1, timeouts={"open": 0.1})
+    release = threading.Event()
+    ran = []
+
+    def execute(plan):
+        ran.append(plan[1])
+        release.wait(5)
+        return plan[1]
+
+    results = actions.run([("open", "stuck"), ("open", "queued")], execute)
+    release.set()
+
+    assert results == [None, None]
+    assert ran == ["stuck"]
+    assert actions.stats()["timeouts"] == 2
+
+
+def test_exit_is_a_barrier_and_errors_yield_none(executor):
+    actions = executor()
+    ran = []
+
+    def execute(plan):
+        ran.append(plan)
+        if plan[0] == "exit":
+            return "EXIT"
+        if plan[1] == "boom":
+            raise RuntimeError("boom")
+        return plan[1]
+
+    results = actions.run([("general", "boom"), ("exit", ""), ("general", "after")], execute)
+
+    assert results == [None, "EXIT", None]
+    assert ("general", "after") not in ran
+    assert actions.stats()["errors"] == 1
+
+
+def test_cancelled_callback_skips_the_rest(executor):
+    actions = executor()
+    calls = []
+    results = actions.run([("general", "a"), ("general", "b")], lambda plan: calls.append(plan[1]) or plan[1],
+                          cancelled=lambda: bool(calls))
+    assert results == ["a", None]
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from ChatLog import ChatJournal, ConversationStore, read_chat_log
+
+
+def message(i):
+    return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"}
+
+
+@pytest.fixture
+def make_journal(tmp_path):
+    created = []
+
+    def make(**kwargs):
+        kwargs.setdefault("legacy_path", str(tmp_path / "ChatLog.json"))
+        created.append(ChatJournal(path=str(tmp_path / "ChatLog.jsonl"), **kwargs))
+        return created[-1]
+
+    yield make
+    for journal in created:
+        if journal._compactor:
+            journal._compactor.join()
+        journal.close()
+
+
+def lines(path):
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_appends_survive_reopen(make_journal):
+    journal = make_journal()
+    journal.append(message(0), message(1))
+    journal.append(message(2))
+    journal.close()
+
+    assert make_journal().load() == [message(0), message(1), message(2)]
+    assert [r["seq"] for r in lines(journal.path)] == [0, 1, 2]
+
+
+def test_torn_tail_is_truncated_on_open(make_journal):
+    journal = make_journal()
+    journal.append(message(0), message(1))
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b'{"seq": 2, "role": "user", "cont')  # crash in the middle of an append
+
+    reopened = make_journal()
+    assert reopened.load() == [message(0), message(1)]
+    reopened.append(message(2))
+    reopened.close()
+    assert make_journal().load() == [message(0), message(1), message(2)]
+
+
+def test_damaged_record_is_skipped_and_compacted_away(make_journal):
+    journal = make_journal()
+    journal.append(message(0))
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b"not json\n")
+    journal.append(message(1))
+    journal.close()
+
+    reopened = make_journal()
+    assert reopened.load() == [message(0), message(1)]
+    reopened._compactor.join()  # damage starts a background compaction
+    assert [r["content"] for r in lines(reopened.path)] == ["message 0", "message 1"]
+
+
+def test_oversized_journal_rotates_into_the_archive(make_journal):
+    journal = make_journal(max_records=10, compact_every=1000)
+    journal.append(*[message(i) for i in range(25)])
+    journal.compact()
+
+    kept = journal.load()
+    assert len(kept) == 5
+    assert journal.base == 20
+    assert kept == [message(i) for i in range(20, 25)]
+    assert [r["seq"] for r in lines(journal.archive_path)] == list(range(20))
+    assert read_chat_log(journal.path) == [message(i) for i in range(25)]
+
+    journal.append(message(25))
+    journal.close()
+    assert make_journal(max_records=10).load_numbered() == (20, [message(i) for i in range(20, 26)])
+
+
+def test_legacy_log_is_migrated_once(make_journal, tmp_path):
+    legacy = tmp_path / "ChatLog.json"
+    legacy.write_text(json.dumps([message(0), message(1), {"bogus": True}]), encoding="utf-8")
+
+    assert make_journal().load() == [message(0), message(1)]
+    assert not legacy.exists()
+    assert (tmp_path / "ChatLog.json.migrated").exists()
+
+
+def test_store_writes_turns_behind(make_journal):
+    store = ConversationStore(journal=make_journal(), flush_interval=60)
+    store.append_turn(message(0), message(1))
+    assert store.snapshot() == [message(0), message(1)]
+    assert store.pending() == 2
+
+    store.flush()
+    assert store.pending() == 0
+    store.close()
+    assert make_journal().load() == [message(0), message(1)]
@@ -0,0 +1,65 @@
+from DecisionCache import DecisionCache, fill_template, normalize_utterance, plan_template
+from Model import classify_decisions
+
+
+class CountingBuild:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, utterance):
+        self.calls.append(utterance)
+        return classify_decisions(utterance)
+
+
+def test_hit_rereads_arguments_from_the_current_utterance(tmp_path):
+    cache = DecisionCache("v1", path=str(tmp_path / "DecisionCache.json"))
+    build = CountingBuild()
+
+    assert cache.get("open chrome and spotify", build) == [("open", "chrome"), ("open", "spotify")]
+    for utterance in ("Open Chrome and Spotify", "OPEN chrome AND spotify", "open CHROME and spotify!"):
+        assert cache.get(utterance, build) == classify_decisions(utterance)  # same as planning it fresh
+    assert cache.get("Open Chrome and Spotify", build) == [("open", "Chrome"), ("open", "Spotify")]
+    assert build.calls == ["open chrome and spotify"]
+    assert cache.stats()["hits"] == 4
+
+
+def test_other_punctuation_gets_its_own_plan(tmp_path):
+    cache = DecisionCache("v1", path=str(tmp_path / "DecisionCache.json"))
+    build = CountingBuild()
+    cache.get("what is 2+2", build)
+    cache.get("what is 2*2", build)
+    assert len(build.calls) == 2
+    assert normalize_utterance("What is 2+2 ?!") == "what is 2+2"
+
+
+def test_template_round_trip():
+    plans = [("general", "What is AI??"), ("exit", "")]
+    templates = plan_template("What is AI??", plans)
+    assert templates == [("general", [0, None]), ("exit", "")]
+    assert fill_template("what is ai??", templates) == [("general", "what is ai??"), ("exit", "")]
+
+
+def test_saved_plans_load_only_with_the_same_fingerprint(tmp_path):
+    path = str(tmp_path / "DecisionCache.json")
+    cache = DecisionCache("v1", path=path)
+    cache.get("play despacito", CountingBuild())
+    cache.save()
+
+    build = CountingBuild()
+    reloaded = DecisionCache("v1", path=path)
+    assert reloaded.load() == 1
+    assert reloaded.get("PLAY Despacito", build) == [("play", "Despacito")]
+    assert build.calls == []
+
+    stale = DecisionCache("v2", path=path)
+    assert stale.load() == 0
+    assert stale.stats()["invalidated"] == 1
+
+
+def test_lru_keeps_max_entries(tmp_path):
+    cache = DecisionCache("v1", path=str(tmp_path / "DecisionCache.json"), max_entries=2)
+    build = CountingBuild()
+    for utterance in ("open a", "open b", "open a", "open c"):
+        cache.get(utterance, build)
+    cache.get("open b", build)
+    assert build.calls == ["open a", "open b", "open c", "open b"]
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+
+import LocalAnswers
+from LocalAnswers import answer_locally, convert, parse_duration
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(LocalAnswers, "now", lambda: datetime(2025, 3, 12, 14, 5))
+
+
+@pytest.mark.parametrize("query", ["what time is it", "What's the time?", "whats the time", "time now please",
+                                   "hey can you tell me the current time"])
+def test_time_questions(frozen_clock, query):
+    assert answer_locally(query) == "It's 2:05 PM."
+
+
+@pytest.mark.parametrize("query", ["what's the date today", "whats today's date", "which day is it today"])
+def test_date_questions(frozen_clock, query):
+    assert answer_locally(query) == "Today is Wednesday, 12 March 2025."
+
+
+@pytest.mark.parametrize("query, answer", [
+    ("what is 2 + 2", "2 + 2 is 4."),
+    ("whats 7 times 6", "7 times 6 is 42."),
+    ("calculate 1,000 divided by 8", "1,000 divided by 8 is 125."),
+    ("-5 squared", "-5 squared is 25."),
+    ("minus 5 squared", "minus 5 squared is 25."),
+    ("5 minus 3 squared", "5 minus 3 squared is -4."),
+    ("3-5 squared", "3-5 squared is -22."),
+    ("(2+3) squared", "(2+3) squared is 25."),
+    ("-2 cubed", "-2 cubed is -8."),
+    ("square root of 16", "square root of 16 is 4."),
+    ("what is 10 percent of 50", "10 percent of 50 is 5."),
+    ("2 to the power of 10", "2 to the power of 10 is 1,024."),
+    ("1 / 3", "1 / 3 is 0.3333333333."),
+    ("5 divided by 0", "Dividing by zero is undefined."),
+])
+def test_arithmetic(query, answer):
+    assert answer_locally(query) == answer
+
+
+@pytest.mark.parametrize("query", ["what is 7", "2 ** 1000", "what is python", "tell me a joke", "12 monkeys"])
+def test_not_answered_locally(query):
+    assert answer_locally(query) is None
+
+
+@pytest.mark.parametrize("query, answer", [
+    ("convert 10 km to miles", "10 km is 6.213712 miles."),
+    ("how many feet in a mile", "1 mile is 5,280 feet."),
+    ("100 degrees celsius in fahrenheit", "100 celsius is 212 fahrenheit."),
+    ("what is 2.5 kg in pounds", "2.5 kg is 5.511557 pounds."),
+])
+def test_conversions(query, answer):
+    assert answer_locally(query) == answer
+
+
+def test_incompatible_units_are_not_converted():
+    assert convert(1, "kg", "km") is None
+    assert answer_locally("convert 5 kg to km") is None
+
+
+@pytest.mark.parametrize("spec, seconds", [
+    ("5 minutes", 300), ("1 hour and 30 minutes", 5400), ("half an hour", 1800), ("90 secs", 90),
+    ("ten-minute", 600), ("5 apples", None), ("", None),
+])
+def test_parse_duration(spec, seconds):
+    assert parse_duration(spec) == seconds
+
+
+def test_timer_is_started(monkeypatch):
+    started = []
+    monkeypatch.setattr(LocalAnswers, "start_timer", lambda seconds, label: started.append((seconds, label)))
+
+    assert answer_locally("set a timer for 1 hour and 30 minutes") == "Timer set for 1 hour and 30 minutes."
+    assert started == [(5400.0, "1 hour and 30 minutes")]
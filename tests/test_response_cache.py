@@ -0,0 +1,76 @@
+import types
+
+import pytest
+
+import ResponseCache as response_cache
+from ResponseCache import ResponseCache, needs_fresh_context
+
+CONTEXT = [{"role": "system", "content": "You are Jarvis."}, {"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_hit_after_put_with_normalized_query():
+    cache = ResponseCache()
+    cache.put("Tell me a joke!", CONTEXT, "Why did the chicken cross the road?")
+
+    assert cache.get("tell me   a JOKE", CONTEXT) == "Why did the chicken cross the road?"
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_covers_the_context():
+    cache = ResponseCache()
+    cache.put("tell me more", CONTEXT, "more about greetings")
+
+    other = [CONTEXT[0], {"role": "user", "content": "what is python"}]
+    assert cache.get("tell me more", other) is None
+    assert cache.get("tell me more", [dict(m) for m in CONTEXT]) == "more about greetings"
+    assert cache.key("tell me more", CONTEXT) != cache.key("tell me more", other)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl=60)
+    cache.put("tell me a joke", CONTEXT, "a joke")
+
+    clock[0] += 59
+    assert cache.get("tell me a joke", CONTEXT) == "a joke"
+    clock[0] += 2
+    assert cache.get("tell me a joke", CONTEXT) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_disk_tier_survives_restart_until_ttl(clock, tmp_path):
+    path = str(tmp_path / "ResponseCache.sqlite3")
+    ResponseCache(ttl=60, disk_path=path).put("tell me a joke", CONTEXT, "a joke")
+
+    assert ResponseCache(ttl=60, disk_path=path).get("tell me a joke", CONTEXT) == "a joke"
+    clock[0] += 61
+    assert ResponseCache(ttl=60, disk_path=path).get("tell me a joke", CONTEXT) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("first question", CONTEXT, "1")
+    cache.put("second question", CONTEXT, "2")
+    cache.get("first question", CONTEXT)
+    cache.put("third question", CONTEXT, "3")
+
+    assert cache.get("second question", CONTEXT) is None
+    assert cache.get("first question", CONTEXT) == "1"
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize("query, fresh", [
+    ("what time is it", True), ("latest news", True), ("what's happening today", True),
+    ("currently playing songs", True), ("do you know python", False), ("tell me a joke", False),
+])
+def test_clock_dependent_queries_are_never_cached(query, fresh):
+    assert needs_fresh_context(query) is fresh
+    cache = ResponseCache()
+    cache.put(query, CONTEXT, "answer")
+    assert (cache.get(query, CONTEXT) is None) is fresh
@@ -0,0 +1,34 @@
+import json
+import os
+
+import pytest
+
+from Model import FirstLayerDMM, classify_batch, classify_decisions, classify_query
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Benchmarks", "Fixtures", "RoutingCorpus.jsonl")
+with open(CORPUS_PATH, encoding="utf-8") as f:
+    CORPUS = [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=lambda case: case["query"])
+def test_golden_corpus(case):
+    assert classify_query(case["query"]) == case["expected"]
+
+
+@pytest.mark.parametrize("query, decisions", [
+    ("open chrome, spotify and notepad", ["open chrome", "open spotify", "open notepad"]),
+    ("OPEN chrome AND spotify", ["open chrome", "open spotify"]),
+    ("google python docs", ["google search python docs"]),
+    ("remind me at 5pm to call mom", ["reminder 5pm to call mom"]),
+    ("bye", ["exit"]),
+])
+def test_first_layer_decisions(query, decisions):
+    assert FirstLayerDMM(query) == decisions
+
+
+@pytest.mark.parametrize("memo", [True, False])
+def test_batch_matches_single_queries(memo):
+    queries = [case["query"] + "\n" for case in CORPUS[:40]] * 2  # lines read from a log
+    expected = [tuple(classify_decisions(q.rstrip())) for q in queries]
+    assert list(classify_batch(queries, memo=memo)) == expected
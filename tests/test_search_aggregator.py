@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from SearchAggregator import SearchAggregator, WikipediaProvider
+
+LONG = "a description that is long enough to count as a good snippet"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves server.routes: path -> (delay seconds, status, body).
+
+    Paths in server.trickle send a byte every 50 ms for that many seconds
+    instead, and set server.dropped when the client hangs up first.
+    """
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path in self.server.trickle:
+            return self._trickle(self.server.trickle[path])
+        delay, status, body = self.server.routes.get(path, (0.0, 404, b""))
+        time.sleep(delay)
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # the client gave up on a slow route
+
+    def _trickle(self, seconds):
+        try:
+            self.send_response(200)
+            self.send_header("Content-Length", str(int(seconds / 0.05)))
+            self.end_headers()
+            for _ in range(int(seconds / 0.05)):
+                self.wfile.write(b" ")
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            self.server.dropped.set()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    httpd.daemon_threads = True
+    httpd.routes = {}
+    httpd.trickle = {}
+    httpd.dropped = threading.Event()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class JsonProvider:
+    """Fake provider: GET <base_url>/<name> returns [[title, link, description], ...]."""
+
+    def __init__(self, name, base_url):
+        self.name = name
+        self.base_url = base_url
+
+    def request(self, query):
+        return f"{self.base_url}/{self.name}", {"q": query}
+
+    def parse(self, content, limit):
+        return [{"title": t, "link": l, "description": d, "source": self.name}
+                for t, l, d in json.loads(content)[:limit]]
+
+
+def route(server, name, results, delay=0.0, status=200):
+    server.routes[f"/{name}"] = (delay, status, json.dumps(results).encode())
+
+
+def run(aggregator, query, use_async):
+    return asyncio.run(aggregator.search_async(query)) if use_async else aggregator.search(query)
+
+
+@pytest.fixture(params=[False, True], ids=["blocking", "async"])
+def use_async(request):
+    return request.param
+
+
+def test_merge_dedupes_by_normalized_link(server, use_async):
+    route(server, "first", [["Paris", "https://www.example.org/paris/", LONG],
+                            ["Lyon", "https://example.org/lyon", "short"]])
+    route(server, "second", [["Paris again", "http://example.org/paris", LONG],
+                             ["Nice", "https://example.org/nice", LONG]], delay=0.1)
+    aggregator = SearchAggregator([JsonProvider("first", server.url), JsonProvider("second", server.url)],
+                                  deadline=2.0, want=3)
+
+    results = run(aggregator, "paris", use_async)
+
+    assert [r["title"] for r in results] == ["Paris", "Nice", "Lyon"]  # good snippets first, arrival order kept
+    assert aggregator.stats()["second"]["ok"] == 1
+
+
+def test_real_provider_parses_fixture(server, use_async):
+    page = {"type": "standard", "title": "Paris", "extract": LONG,
+            "content_urls": {"desktop": {"page": "https://en.wikipedia.org/wiki/Paris"}}}
+    server.routes["/api/rest_v1/page/summary/Paris"] = (0.0, 200, json.dumps(page).encode())
+    aggregator = SearchAggregator([WikipediaProvider(server.url)], deadline=2.0)
+
+    results = run(aggregator, "what is Paris?", use_async)
+
+    assert results == [{"title": "Paris", "link": "https://en.wikipedia.org/wiki/Paris",
+                        "description": LONG, "source": "wikipedia"}]
+
+
+def test_deadline_cuts_off_slow_provider(server, use_async):
+    route(server, "fast", [["Fast", "https://example.org/fast", LONG]])
+    route(server, "slow", [["Slow", "https://example.org/slow", LONG]], delay=2.0)
+    aggregator = SearchAggregator([JsonProvider("fast", server.url), JsonProvider("slow", server.url)],
+                                  deadline=0.3, want=3)
+
+    start = time.monotonic()
+    results = run(aggregator, "q", use_async)
+
+    assert time.monotonic() - start < 1.0
+    assert [r["title"] for r in results] == ["Fast"]
+    assert aggregator.stats()["slow"]["late"] == 1
+
+
+def test_abandoned_request_ends_at_the_deadline(server):
+    server.trickle["/trickle"] = 3.0  # never idle long enough for a read timeout
+    route(server, "fast", [["Fast", "https://example.org/fast", LONG]])
+    aggregator = SearchAggregator([JsonProvider("fast", server.url), JsonProvider("trickle", server.url)],
+                                  deadline=0.3)
+
+    assert [r["title"] for r in aggregator.search("q")] == ["Fast"]
+    assert server.dropped.wait(1.5)  # the worker hung up well before the body was complete
+
+
+def test_returns_once_enough_good_results(server, use_async):
+    route(server, "fast", [["A", "https://example.org/a", LONG], ["B", "https://example.org/b", LONG]])
+    route(server, "slow", [["Slow", "https://example.org/slow", LONG]], delay=2.0)
+    aggregator = SearchAggregator([JsonProvider("fast", server.url), JsonProvider("slow", server.url)],
+                                  deadline=3.0, want=2)
+
+    start = time.monotonic()
+    results = run(aggregator, "q", use_async)
+
+    assert time.monotonic() - start < 1.0
+    assert [r["title"] for r in results] == ["A", "B"]
+
+
+def test_failed_and_missing_providers(server, use_async):
+    route(server, "ok", [["Ok", "https://example.org/ok", LONG]])
+    route(server, "broken", [], status=500)
+    aggregator = SearchAggregator([JsonProvider("ok", server.url), JsonProvider("broken", server.url),
+                                   JsonProvider("missing", server.url)], deadline=2.0)
+
+    results = run(aggregator, "q", use_async)
+
+    assert [r["title"] for r in results] == ["Ok"]
+    stats = aggregator.stats()
+    assert stats["broken"]["errors"] == 1
+    assert stats["missing"]["empty"] == 1  # a 404 is a miss, not a failure
+
+
+def test_every_provider_failing_raises(server, use_async):
+    route(server, "one", [], status=500)
+    route(server, "two", [], status=503)
+    aggregator = SearchAggregator([JsonProvider("one", server.url), JsonProvider("two", server.url)],
+                                  deadline=2.0)
+
+    with pytest.raises(RuntimeError):
+        run(aggregator, "q", use_async)
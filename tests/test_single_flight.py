@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from SingleFlight import SingleFlight, action_key
+
+
+def start_calls(flight, key, fn, count):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(5)
+        return "answer"
+
+    threads, results, _ = start_calls(flight, "general what is python", work, 5)
+    while flight.stats()["calls"] < 5:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert runs == [1]
+    assert results == ["answer"] * 5
+    assert flight.stats()["coalesced"] == 4
+    assert flight.in_flight() == []
+
+
+def test_errors_are_shared_and_the_next_call_runs_again():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("down")
+
+    threads, _, errors = start_calls(flight, "key", fail, 3)
+    while flight.stats()["calls"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+@pytest.mark.parametrize("a, b, same", [
+    ("general What is  Python", "general what is python", True),
+    ("general what is 2+2", "general what is 2-2", False),
+    ("general hi!", "general hi", False),
+])
+def test_action_key_folds_case_and_whitespace_only(a, b, same):
+    assert (action_key(a) == action_key(b)) is same
+
+
+def test_bare_keyword_uses_the_raw_query():
+    assert action_key("general", "Tell me a joke") == "general tell me a joke"
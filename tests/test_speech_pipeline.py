@@ -0,0 +1,130 @@
+import threading
+import time
+
+from SpeechPipeline import SentenceSplitter, SpeechPipeline
+
+ANSWER = ("The capital of France is Paris. It has been the capital since the tenth century. "
+          "Dr. Smith lives there with his family. Hi. That is all I know about it!")
+SENTENCES = [
+    "The capital of France is Paris.",
+    "It has been the capital since the tenth century.",
+    "Dr. Smith lives there with his family.",
+    "Hi. That is all I know about it!",
+]
+
+
+def deltas(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class RecordingPlayer:
+    """Stub player: records handles in playback order."""
+
+    def __init__(self, delay=0.0, log=None, name=""):
+        self.delay = delay
+        self.log = [] if log is None else log
+        self.name = name
+        self.discarded = []
+        self.drained = 0
+
+    def enqueue(self, audio, stop_event):
+        self.log.append((self.name, audio))
+        stop_event.wait(self.delay)
+
+    def drain(self, stop_event):
+        self.drained += 1
+
+    def stop(self):
+        pass
+
+    def discard(self, audio):
+        self.discarded.append(audio)
+
+
+def test_splitter_cuts_sentences_as_they_end():
+    splitter = SentenceSplitter()
+    sentences = [s for d in deltas(ANSWER) for s in splitter.feed(d)] + splitter.flush()
+    assert sentences == SENTENCES
+
+
+def test_sentences_play_in_order():
+    player = RecordingPlayer()
+    speech = SpeechPipeline(synthesize=lambda text: text.upper(), player=player)
+    speech.speak(deltas(ANSWER))
+
+    assert [audio for _, audio in player.log] == [s.upper() for s in SENTENCES]
+    assert player.drained == 1
+    assert speech.errors == []
+
+
+def test_blocking_play_function_is_supported():
+    played = []
+    speech = SpeechPipeline(synthesize=lambda text: text, play=lambda audio, stop: played.append(audio))
+    speech.speak(deltas(ANSWER))
+    assert played == SENTENCES
+
+
+def test_next_sentence_is_synthesized_while_one_plays():
+    events = []
+    lock = threading.Lock()
+
+    def synthesize(text):
+        with lock:
+            events.append(("synth", text))
+        return text
+
+    def play(audio, stop_event):
+        with lock:
+            events.append(("start", audio))
+        time.sleep(0.05)
+        with lock:
+            events.append(("end", audio))
+
+    SpeechPipeline(synthesize=synthesize, play=play).speak(deltas(ANSWER))
+
+    assert events.index(("synth", SENTENCES[1])) < events.index(("end", SENTENCES[0]))
+
+
+def test_cancel_stops_playback_and_discards_the_rest():
+    player = RecordingPlayer(delay=10)
+    speech = SpeechPipeline(synthesize=lambda text: text, player=player)
+    for d in deltas(ANSWER):
+        speech.feed(d)
+    speech.finish()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    speech.cancel()
+    assert speech.wait(timeout=2)
+    assert time.monotonic() - start < 1
+    assert [audio for _, audio in player.log] == SENTENCES[:1]
+    assert player.discarded  # synthesized-ahead clips are cleaned up, not played
+
+
+def test_failed_synthesis_skips_only_that_sentence():
+    def synthesize(text):
+        if text.startswith("It has"):
+            raise RuntimeError("voice service down")
+        return text
+
+    player = RecordingPlayer()
+    speech = SpeechPipeline(synthesize=synthesize, player=player)
+    speech.speak(deltas(ANSWER))
+
+    assert [audio for _, audio in player.log] == [SENTENCES[0]] + SENTENCES[2:]
+    assert len(speech.errors) == 1
+
+
+def test_concurrent_pipelines_do_not_interleave():
+    log = []
+    first = SpeechPipeline(synthesize=lambda text: text, player=RecordingPlayer(0.02, log, "first"))
+    second = SpeechPipeline(synthesize=lambda text: text, player=RecordingPlayer(0.02, log, "second"))
+    threads = [threading.Thread(target=p.speak, args=(deltas(ANSWER),)) for p in (first, second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    speakers = [name for name, _ in log]
+    assert len(speakers) == 2 * len(SENTENCES)
+    assert speakers in (["first"] * 4 + ["second"] * 4, ["second"] * 4 + ["first"] * 4)
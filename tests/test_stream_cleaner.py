@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from Streaming import StreamCleaner
+
+PREFIXES = ("err:", "[", "warning:", "api request failed")
+TEXT = ("\n\nHello there!\n[debug] internal\nWarning: low quota\n  \nThe answer is 42.\n"
+        "err: retrying\nErrand list: milk\n[x]\nLast line without newline")
+
+
+def clean_response(answer, prefixes=PREFIXES):
+    """The batch cleaner the streaming one must match"""
+    return "\n".join(line for line in answer.split("\n")
+                     if line.strip() and not any(line.lower().startswith(p) for p in prefixes))
+
+
+def stream(text, sizes, prefixes=PREFIXES):
+    cleaner = StreamCleaner(prefixes)
+    out, i = [], 0
+    for size in sizes:
+        out.append(cleaner.feed(text[i:i + size]))
+        i += size
+    out.append(cleaner.feed(text[i:]))
+    return "".join(out) + cleaner.close()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_any_chunking_matches_the_batch_cleaner(seed):
+    rng = random.Random(seed)
+    sizes = [rng.randint(1, 9) for _ in range(len(TEXT))]
+    assert stream(TEXT, sizes) == clean_response(TEXT)
+
+
+def test_ordinary_text_is_released_before_the_newline():
+    cleaner = StreamCleaner(PREFIXES)
+    assert cleaner.feed("Hello") == "Hello"
+    assert cleaner.feed("\n[deb") == ""  # could still be a debug line
+    assert cleaner.feed("ug]\nok") == "\nok"
+
+
+def test_no_prefixes_only_drops_blank_lines():
+    assert stream("a\n\n  \nb\n", [1] * 6, prefixes=()) == "a\nb"
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from Summarizer import ConversationSummarizer, fake_summarize
+
+
+class FakeStore:
+    def __init__(self, messages, base=0):
+        self.messages = messages
+        self.base = base
+
+    def snapshot(self):
+        return list(self.messages)
+
+
+def conversation(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"} for i in range(n)]
+
+
+class RecordingSummarize:
+    def __init__(self, replies=None):
+        self.calls = []
+        self.replies = replies
+
+    def __call__(self, previous, messages):
+        self.calls.append((previous, list(messages)))
+        if self.replies is not None:
+            return self.replies.pop(0)
+        return fake_summarize(previous, messages)
+
+
+@pytest.fixture
+def make_summarizer(tmp_path):
+    created = []
+
+    def make(history, summarize_fn, base=0, **kwargs):
+        kwargs.setdefault("idle_delay", 3600)
+        summarizer = ConversationSummarizer(store=FakeStore(history, base), summarize_fn=summarize_fn,
+                                            path=str(tmp_path / "ChatSummary.json"), **kwargs)
+        created.append(summarizer)
+        return summarizer
+
+    yield make
+    for summarizer in created:
+        summarizer.cancel()
+
+
+def test_nothing_to_fold_below_threshold(make_summarizer):
+    summarize = RecordingSummarize()
+    summarizer = make_summarizer(conversation(30), summarize, keep_recent=20, fold_batch=20)
+
+    assert summarizer.run_once() is False
+    assert summarize.calls == []
+
+
+def test_folds_in_contiguous_bounded_chunks(make_summarizer):
+    history = conversation(100)
+    summarize = RecordingSummarize()
+    summarizer = make_summarizer(history, summarize, keep_recent=20, fold_batch=20)
+
+    assert summarizer.run_once() is True
+
+    folded = [m for _, chunk in summarize.calls for m in chunk]
+    assert folded == history[:80]
+    for _, chunk in summarize.calls:
+        assert len(chunk) <= 21
+        assert chunk[0]["role"] == "user"
+    summary, rest = summarizer.context_for(history)
+    assert rest == history[80:]
+    assert summary[0]["content"].endswith("; ".join(f"message {i}" for i in range(0, 80, 2)))
+    assert summarize.calls[1][0] == fake_summarize("", history[:20])  # each chunk builds on the last
+
+
+def test_long_backlog_is_folded_across_runs(make_summarizer):
+    history = conversation(1000)
+    summarize = RecordingSummarize()
+    summarizer = make_summarizer(history, summarize, keep_recent=20, fold_batch=20, folds_per_run=3)
+
+    assert summarizer.run_once() is True
+    assert len(summarize.calls) == 3
+    assert summarizer._state["covers"] == 60
+    assert summarizer._timer is not None  # the rest continues on the next idle run
+
+    summarizer.run_once()
+    assert summarize.calls[3][1][0] is history[60]
+    assert summarizer._state["covers"] == 120
+
+
+def test_empty_summary_does_not_advance(make_summarizer, tmp_path):
+    history = conversation(100)
+    summarize = RecordingSummarize(replies=["first chunk", "  ", "never used"])
+    summarizer = make_summarizer(history, summarize, keep_recent=20, fold_batch=20)
+
+    assert summarizer.run_once() is True
+    assert len(summarize.calls) == 2
+    with open(tmp_path / "ChatSummary.json", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["covers"] == 20
+    assert saved["summary"] == "first chunk"
+    assert summarizer.context_for(history)[1] == history[20:]
+
+
+def test_empty_first_summary_keeps_nothing(make_summarizer):
+    history = conversation(100)
+    summarizer = make_summarizer(history, RecordingSummarize(replies=[""]), keep_recent=20, fold_batch=20)
+
+    assert summarizer.run_once() is False
+    assert summarizer.context_for(history) == ([], history)
+
+
+def test_saved_summary_is_reused(make_summarizer):
+    history = conversation(100)
+    make_summarizer(history, RecordingSummarize(), keep_recent=20, fold_batch=20).run_once()
+
+    summarize = RecordingSummarize()
+    reloaded = make_summarizer(history, summarize, keep_recent=20, fold_batch=20)
+    assert reloaded.run_once() is False
+    assert summarize.calls == []
+    assert reloaded.context_for(history)[1] == history[80:]
+
+
+def test_rewritten_log_invalidates_summary(make_summarizer):
+    history = conversation(100)
+    make_summarizer(history, RecordingSummarize(), keep_recent=20, fold_batch=20).run_once()
+
+    other = [{"role": m["role"], "content": m["content"] + "!"} for m in history]
+    reloaded = make_summarizer(other, RecordingSummarize(), keep_recent=20, fold_batch=20)
+    assert reloaded.context_for(other) == ([], other)
+
+
+def test_summary_follows_archived_log(make_summarizer):
+    history = conversation(100)
+    make_summarizer(history, RecordingSummarize(), keep_recent=20, fold_batch=20).run_once()
+
+    rotated = history[50:]
+    reloaded = make_summarizer(rotated, RecordingSummarize(), base=50, keep_recent=20, fold_batch=20)
+    summary, rest = reloaded.context_for(rotated)
+    assert len(summary) == 1
+    assert rest == history[80:]
+
+
+def test_archived_log_with_repeated_messages(make_summarizer):
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": "ok"} for i in range(100)]
+    make_summarizer(history, RecordingSummarize(), keep_recent=20, fold_batch=20).run_once()
+
+    rotated = history[30:] + [{"role": "user", "content": "ok"}, {"role": "assistant", "content": "ok"}]
+    reloaded = make_summarizer(rotated, RecordingSummarize(), base=30, keep_recent=20, fold_batch=20)
+    assert len(reloaded.context_for(rotated)[1]) == 22  # messages 80-101, not a guess by content